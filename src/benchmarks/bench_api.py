@@ -0,0 +1,89 @@
+"""
+API request throughput through an in-process ASGI client.
+
+Requests go straight to the FastAPI app over httpx's ASGITransport, ``concurrency``
+at a time, so the numbers cover routing, the repository and serialization without
+a socket in between. The app runs on the in-memory repository by default.
+
+    python -m benchmarks.bench_api --nodes 10 1000 10000 --storage memory
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Callable, List
+
+import httpx
+
+from benchmarks.bench_repository import open_repository
+from benchmarks.results import BenchResult
+from benchmarks.synthetic import make_nodes, write_data_dir
+from server.api import WaveLabAPI
+
+
+async def bench_requests(client: httpx.AsyncClient, request: Callable[[int], object], requests: int,
+                         concurrency: int, budget: float) -> tuple:
+    """Requests per second over ``requests`` calls, or as many as fit in ``budget`` seconds."""
+    done = 0
+    deadline = time.perf_counter() + budget
+    started = time.perf_counter()
+    while done < requests and (not done or time.perf_counter() < deadline):
+        responses = await asyncio.gather(*(request(done + i) for i in range(min(concurrency, requests - done))))
+        for response in responses:
+            if response.status_code >= 400:
+                raise RuntimeError(f"{response.request.method} {response.request.url}: {response.status_code}")
+        done += len(responses)
+    return done / (time.perf_counter() - started), done
+
+
+async def bench_size(size: int, storage: str, requests: int, concurrency: int, budget: float) -> List[BenchResult]:
+    nodes = make_nodes(size)
+    ids = [node.id for node in nodes]
+
+    with tempfile.TemporaryDirectory(prefix="waveslab-api-") as data_dir:
+        write_data_dir(data_dir, nodes)
+        repository = open_repository(storage, data_dir + "/")
+        api = WaveLabAPI(repository)
+        transport = httpx.ASGITransport(app=api.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://waveslab") as client:
+                etag = (await client.get("/api/wave-nodes")).headers.get("etag", "")
+                cases = {
+                    "get_nodes": lambda i: client.get("/api/wave-nodes"),
+                    "get_nodes_not_modified": lambda i: client.get("/api/wave-nodes",
+                                                                   headers={"If-None-Match": etag}),
+                    "get_node": lambda i: client.get(f"/api/wave-nodes/{ids[i % len(ids)]}"),
+                    "get_active": lambda i: client.get("/api/nodes/active"),
+                    "patch_node": lambda i: client.patch(
+                        f"/api/wave-nodes/{ids[i % len(ids)]}",
+                        json={"endpoint_url": f"http://127.0.0.1:3002/api/internal/measurements?id={i}"}),
+                }
+                results = []
+                for case, request in cases.items():
+                    throughput, samples = await bench_requests(client, request, requests, concurrency, budget)
+                    results.append(BenchResult("api", f"{case}.requests_per_second", size, throughput,
+                                               "requests/s", True, samples))
+        finally:
+            await transport.aclose()
+            repository.close()
+    return results
+
+
+async def run(sizes, storage: str = "memory", requests: int = 1000, concurrency: int = 32,
+              budget: float = 10.0) -> List[BenchResult]:
+    results = []
+    for size in sizes:
+        results.extend(await bench_size(size, storage, requests, concurrency, budget))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--storage", choices=("json", "memory", "journal", "sqlite"), default="memory")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds spent at most on one case")
+    args = parser.parse_args()
+    for result in asyncio.run(run(args.nodes, args.storage, args.requests, args.concurrency, args.budget)):
+        print(result)
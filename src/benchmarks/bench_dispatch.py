@@ -0,0 +1,74 @@
+"""
+Dispatch throughput of HttpDispatcher against a local stub server.
+
+Sends ``requests`` POSTs (fewer if ``budget`` runs out first) for each concurrency limit
+and reports requests per second. Results are keyed by the request count, not by a
+household size.
+
+    python -m benchmarks.bench_dispatch --requests 5000 --max-in-flight 50 200
+"""
+import argparse
+import asyncio
+import time
+from typing import Iterable, Iterator, List
+
+from benchmarks.results import BenchResult
+from benchmarks.stub_server import StubServer
+from simulation.HttpDispatcher import HttpDispatcher
+
+
+async def bench_dispatch(url: str, requests: int, max_in_flight: int, max_per_host: int, budget: float) -> tuple:
+    """Requests per second and the number of requests sent."""
+    dispatcher = HttpDispatcher(max_in_flight=max_in_flight, max_per_host=max_per_host)
+    await dispatcher.start()
+
+    async def send(i: int) -> bool:
+        response = await dispatcher.post(f"{url}{i}", json={"realTimeConsumption": 1.0})
+        return response.status_code == 204
+
+    def items(deadline: float) -> Iterator[int]:
+        # Consumed lazily by dispatch, so running out of budget just stops issuing requests
+        for i in range(requests):
+            if i and time.perf_counter() >= deadline:
+                return
+            yield i
+
+    try:
+        started = time.perf_counter()
+        ok, failed = await dispatcher.dispatch(items(started + budget), send)
+        elapsed = time.perf_counter() - started
+    finally:
+        await dispatcher.close()
+
+    if failed:
+        raise RuntimeError(f"{failed} of {ok + failed} requests failed")
+    return ok / elapsed if elapsed else 0.0, ok
+
+
+async def run(requests: int = 5000, max_in_flight: Iterable[int] = (50, 200), max_per_host: int = 20,
+              delay: float = 0.0, budget: float = 10.0) -> List[BenchResult]:
+    server = StubServer(delay=delay)
+    await server.start()
+    url = f"{server.url}/api/internal/measurements?smart_furniture_hookup_id="
+
+    results = []
+    try:
+        for limit in max_in_flight:
+            throughput, sent = await bench_dispatch(url, requests, limit, max_per_host, budget)
+            results.append(BenchResult("dispatch", f"in_flight_{limit}.requests_per_second", requests, throughput,
+                                       "requests/s", True, sent))
+    finally:
+        await server.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--max-in-flight", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--max-per-host", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.0, help="Stub server latency in seconds")
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds spent at most on one case")
+    args = parser.parse_args()
+    for result in asyncio.run(run(args.requests, args.max_in_flight, args.max_per_host, args.delay, args.budget)):
+        print(result)
@@ -0,0 +1,66 @@
+"""
+Historical generation speed, in simulated seconds per wall-clock second, with a null sink.
+
+Runs the tick-by-tick HistoricalSimulation and the windowed FastForwardSimulation over
+the same span of simulated time, so neither InfluxDB nor disk is part of the number.
+Larger households simulate a shorter span to keep a run bounded.
+
+    python -m benchmarks.bench_historical --nodes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from typing import List
+
+from benchmarks.results import BenchResult
+from benchmarks.synthetic import make_nodes
+from core.storage.MemoryNodeStore import MemoryNodeStore
+from simulation.FastForwardSimulation import FastForwardSimulation
+from simulation.HistoricalSimulation import DEFAULT_START, HistoricalSimulation
+from sinks.ReadingSink import NullSink
+
+STEP = timedelta(seconds=20)
+
+
+def span_for(size: int) -> timedelta:
+    """A simulated day for up to 1k nodes, shrinking with size down to 30 minutes."""
+    seconds = 86400 * 1000 / max(size, 1)
+    return timedelta(seconds=min(86400, max(1800, seconds)))
+
+
+async def bench_stepwise(nodes, span: timedelta) -> float:
+    simulation = HistoricalSimulation(NullSink(), DEFAULT_START, DEFAULT_START + span, STEP, seed=0,
+                                      repository=MemoryNodeStore(nodes))
+    started = time.perf_counter()
+    await simulation.start()
+    return time.perf_counter() - started
+
+
+async def bench_fast_forward(nodes, span: timedelta) -> float:
+    simulation = FastForwardSimulation(MemoryNodeStore(nodes), NullSink(), DEFAULT_START, DEFAULT_START + span,
+                                       STEP, seed=0)
+    started = time.perf_counter()
+    await simulation.run()
+    return time.perf_counter() - started
+
+
+async def run(sizes, active_fraction: float = 0.05) -> List[BenchResult]:
+    results = []
+    for size in sizes:
+        nodes = make_nodes(size, active_fraction)
+        span = span_for(size)
+        for case, bench in (("stepwise", bench_stepwise), ("fast_forward", bench_fast_forward)):
+            elapsed = await bench(nodes, span)
+            results.append(BenchResult("historical", f"{case}.speed", size, span.total_seconds() / elapsed,
+                                       "simulated s/s", True))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--active-fraction", type=float, default=0.05)
+    args = parser.parse_args()
+    for result in asyncio.run(run(args.nodes, args.active_fraction)):
+        print(result)
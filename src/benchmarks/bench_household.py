@@ -0,0 +1,91 @@
+"""
+Per-tick cost of the per-object Household against the NumPy VectorizedHousehold.
+
+Each tick switches a batch of devices and collects the readings of all active nodes,
+which is the work both simulation loops do every tick. The per-object path runs
+Household against an in-memory store, so disk I/O is left out of the comparison.
+Both engines report how many readings they built, to show they did comparable work.
+
+    python -m benchmarks.bench_household --nodes 1000 10000 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import make_nodes
+from core.model.NodeReading import NodeReading
+from core.storage.ActiveNodeIndex import ActiveNodeView
+from core.storage.MemoryNodeStore import MemoryNodeStore
+from envirorment.Household import Household
+from envirorment.VectorizedHousehold import VectorizedHousehold
+
+STEP = timedelta(minutes=1)
+
+
+def _switch_count(nodes: int) -> int:
+    # Keep roughly 1% of the household switching per tick so both engines do comparable work
+    return max(5, nodes // 100)
+
+
+def bench_objects(nodes, ticks: int) -> tuple:
+    """Seconds per tick and the number of readings built."""
+    store = MemoryNodeStore(nodes)
+    household = Household(store, switch_interval_minutes=1)
+    household.day_devices_to_switch = household.night_devices_to_switch = _switch_count(len(nodes))
+    view = ActiveNodeView(store)
+    timestamp = datetime(2025, 10, 1, 12)
+
+    readings = 0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        household.tick(timestamp)
+        readings += len([
+            NodeReading(node.node_type.value, node.endpoint.split('smart_furniture_hookup_id=')[-1],
+                        node.real_time_consumption, timestamp, node.assigned_user)
+            for node in view.refresh() + household.get_nodes_to_shutdown()
+        ])
+        timestamp += STEP
+    return (time.perf_counter() - started) / ticks, readings
+
+
+def bench_vectorized(nodes, ticks: int) -> tuple:
+    """Seconds per tick and the number of readings built."""
+    household = VectorizedHousehold(nodes, switch_interval_minutes=1)
+    household.day_devices_to_switch = household.night_devices_to_switch = _switch_count(len(nodes))
+    timestamp = datetime(2025, 10, 1, 12)
+
+    readings = 0
+    started = time.perf_counter()
+    for _ in range(ticks):
+        household.tick(timestamp)
+        readings += len(household.readings(timestamp, household.active_indices()))
+        readings += len(household.readings(timestamp, household.take_shutdown_indices()))
+        timestamp += STEP
+    return (time.perf_counter() - started) / ticks, readings
+
+
+def run(sizes, ticks: int, active_fraction: float) -> list:
+    results = []
+    for size in sizes:
+        nodes = make_nodes(size, active_fraction)
+        per_object, per_object_readings = bench_objects(nodes, ticks)
+        vectorized, vectorized_readings = bench_vectorized(nodes, ticks)
+        results.append({
+            "nodes": size,
+            "per_object_ms_per_tick": per_object * 1000,
+            "vectorized_ms_per_tick": vectorized * 1000,
+            "per_object_readings": per_object_readings,
+            "vectorized_readings": vectorized_readings,
+            "speedup": per_object / vectorized if vectorized else 0.0,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--active-fraction", type=float, default=0.05)
+    args = parser.parse_args()
+    for result in run(args.nodes, args.ticks, args.active_fraction):
+        print(result)
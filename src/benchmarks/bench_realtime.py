@@ -0,0 +1,80 @@
+"""
+RealTimeSimulation delivery throughput against a local stub server.
+
+Sends the readings of every active node the way a tick does, once per node and
+batched by endpoint base, and reports readings delivered per second. The household
+lives in a MemoryNodeStore, so only the HTTP path is measured.
+
+    python -m benchmarks.bench_realtime --nodes 1000 10000 100000 --batch-size 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import List
+
+from benchmarks.results import BenchResult
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import make_nodes
+from core.storage.MemoryNodeStore import MemoryNodeStore
+from simulation.RealTimeSimulation import RealTimeSimulation
+
+
+async def bench_delivery(nodes, batch_size: int, min_readings: int, budget: float) -> tuple:
+    """Readings per second and the median wall time of one round of active nodes."""
+    store = MemoryNodeStore(nodes)
+    # A 10-node household may have nothing switched on; deliver one node rather than nothing
+    active = store.get_active_nodes() or store.get_all_nodes()[:1]
+    simulation = RealTimeSimulation(batch_size=batch_size, seed=0, repository=store)
+    simulation._now = datetime(2025, 10, 1, 12)
+    await simulation.dispatcher.start()
+
+    rounds, delivered = [], 0
+    try:
+        deadline = time.perf_counter() + budget
+        while delivered < min_readings and (not rounds or time.perf_counter() < deadline):
+            started = time.perf_counter()
+            sent, failed = await simulation._send_requests_for_nodes(active)
+            rounds.append(time.perf_counter() - started)
+            delivered += sent
+            if failed:
+                raise RuntimeError(f"{failed} of {len(active)} readings were not delivered")
+    finally:
+        await simulation.dispatcher.close()
+
+    rounds.sort()
+    return delivered / sum(rounds), rounds[len(rounds) // 2], len(rounds)
+
+
+async def run(sizes, active_fraction: float = 0.05, batch_size: int = 500, min_readings: int = 5000,
+              budget: float = 10.0) -> List[BenchResult]:
+    server = StubServer()
+    await server.start()
+    endpoint = f"{server.url}/api/internal/measurements"
+
+    results = []
+    try:
+        for size in sizes:
+            nodes = make_nodes(size, active_fraction, endpoint=endpoint)
+            for case, batch in (("per_node", 0), ("batched", batch_size)):
+                throughput, round_seconds, samples = await bench_delivery(nodes, batch, min_readings, budget)
+                results.append(BenchResult("realtime", f"{case}.readings_per_second", size, throughput,
+                                           "readings/s", True, samples))
+                results.append(BenchResult("realtime", f"{case}.round", size, round_seconds * 1000,
+                                           "ms", False, samples))
+    finally:
+        await server.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--active-fraction", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--min-readings", type=int, default=5000)
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds spent at most on one case")
+    args = parser.parse_args()
+    for result in asyncio.run(run(args.nodes, args.active_fraction, args.batch_size, args.min_readings,
+                                  args.budget)):
+        print(result)
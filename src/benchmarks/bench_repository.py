@@ -0,0 +1,73 @@
+"""
+Read and write latency of every repository backend on a synthetic household.
+
+Each backend opens its own copy of the household in a temporary directory. Reads are
+get_all_nodes, get_node_by_id and get_active_nodes; writes are switch_node (one node,
+one persist) and switch_nodes on 100 nodes (one persist for the whole batch).
+
+    python -m benchmarks.bench_repository --nodes 10 1000 10000 --backends json sqlite
+"""
+import argparse
+import tempfile
+from typing import List
+
+from benchmarks.results import BenchResult, latency_ms, measure
+from benchmarks.synthetic import make_nodes, write_data_dir
+from core.storage.WavesLabRepository import create_repository
+
+BACKENDS = ("json", "memory", "journal", "sqlite")
+
+BULK_SIZE = 100
+
+
+def open_repository(backend: str, data_dir: str):
+    """A ``backend`` repository over the nodes.json / users.json in ``data_dir``."""
+    if backend == "sqlite":
+        # Not through create_repository, which would follow WAVESLAB_SQLITE_PATH out of the temp dir
+        from core.storage.SqliteWavesLabRepository import SqliteWavesLabRepository
+        return SqliteWavesLabRepository(data_dir)
+    return create_repository(backend, data_dir)
+
+
+def bench_backend(backend: str, size: int, repeat: int, budget: float) -> List[BenchResult]:
+    nodes = make_nodes(size)
+    ids = [node.id for node in nodes]
+    middle = ids[len(ids) // 2]
+
+    cases = {
+        "get_all_nodes": lambda: repository.get_all_nodes(),
+        "get_node_by_id": lambda: repository.get_node_by_id(middle),
+        "get_active_nodes": lambda: repository.get_active_nodes(),
+        "switch_node": lambda: repository.switch_node(ids[0]),
+        f"switch_nodes_{BULK_SIZE}": lambda: repository.switch_nodes(ids[:BULK_SIZE]),
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix=f"waveslab-{backend}-") as data_dir:
+        write_data_dir(data_dir, nodes)
+        repository = open_repository(backend, data_dir + "/")
+        try:
+            for case, fn in cases.items():
+                results.append(latency_ms("repository", f"{backend}.{case}", size, measure(fn, repeat, budget)))
+        finally:
+            repository.close()
+    return results
+
+
+def run(sizes, backends=BACKENDS, repeat: int = 5, budget: float = 10.0) -> List[BenchResult]:
+    results = []
+    for size in sizes:
+        for backend in backends:
+            results.extend(bench_backend(backend, size, repeat, budget))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds spent at most on one case")
+    args = parser.parse_args()
+    for result in run(args.nodes, args.backends, args.repeat, args.budget):
+        print(result)
@@ -0,0 +1,70 @@
+"""
+Compare two benchmark result files, e.g. from the parent commit and from a branch.
+
+Results are matched by benchmark, case and household size. A change worse than
+``--threshold`` (relative, in the direction the metric should not go) is a
+regression, and makes the command exit with 1.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.15
+"""
+import argparse
+import sys
+from typing import List, NamedTuple, Optional
+
+from benchmarks.results import BenchResult, load_results
+
+
+class Comparison(NamedTuple):
+    baseline: Optional[BenchResult]
+    current: Optional[BenchResult]
+
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change from baseline to current; positive means better."""
+        if not self.baseline or not self.current or not self.baseline.value:
+            return None
+        if self.current.higher_is_better:
+            return (self.current.value - self.baseline.value) / self.baseline.value
+        return (self.baseline.value - self.current.value) / self.baseline.value
+
+
+def compare(baseline: List[BenchResult], current: List[BenchResult]) -> List[Comparison]:
+    """Pairs of results with the same key, in the order of ``current``, then those only in ``baseline``."""
+    before = {result.key: result for result in baseline}
+    after = {result.key: result for result in current}
+    comparisons = [Comparison(before.get(key), result) for key, result in after.items()]
+    comparisons += [Comparison(result, None) for key, result in before.items() if key not in after]
+    return comparisons
+
+
+def _format(result: Optional[BenchResult]) -> str:
+    return f"{result.value:.3f}" if result else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    regressions = 0
+    print(f"{'benchmark':<12} {'case':<40} {'nodes':>7} {'baseline':>12} {'current':>12} {'change':>8}  unit")
+    for comparison in compare(load_results(args.baseline), load_results(args.current)):
+        result = comparison.current or comparison.baseline
+        change = comparison.change
+        flag = ""
+        if change is not None and change < -args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        shown = f"{change:+.1%}" if change is not None else "-"
+        print(f"{result.benchmark:<12} {result.case:<40} {result.nodes:>7} {_format(comparison.baseline):>12} "
+              f"{_format(comparison.current):>12} {shown:>8}  {result.unit}{flag}")
+
+    if regressions:
+        print(f"\n{regressions} regressions beyond {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Machine-readable benchmark results, and the timing helpers shared by the benchmarks."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional
+
+
+@dataclass
+class BenchResult:
+    """One measured value, identified by ``(benchmark, case, nodes)`` across runs."""
+    benchmark: str
+    case: str
+    nodes: int
+    value: float
+    unit: str
+    higher_is_better: bool
+    samples: int = 1
+
+    @property
+    def key(self) -> tuple:
+        return self.benchmark, self.case, self.nodes
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, budget: float = 10.0) -> List[float]:
+    """
+    Seconds taken by each call of ``fn``: ``repeat`` calls, or fewer once ``budget``
+    seconds are spent (at least one call), so slow cases at 100k nodes stay bounded.
+    """
+    timings = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < repeat and (not timings or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def measure_async(fn: Callable[[], Awaitable[object]], repeat: int = 5, budget: float = 10.0) -> List[float]:
+    """``measure`` for coroutine functions."""
+    timings = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < repeat and (not timings or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def latency_ms(benchmark: str, case: str, nodes: int, timings: List[float]) -> BenchResult:
+    """Median latency of ``timings``, in milliseconds."""
+    return BenchResult(benchmark, case, nodes, statistics.median(timings) * 1000, "ms", False, len(timings))
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    """Where the results were measured, so runs on different machines are not compared blindly."""
+    return {
+        "commit": _commit(),
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, results: List[BenchResult], meta: Optional[dict] = None):
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump({"environment": meta or environment(), "results": [asdict(result) for result in results]}, fp,
+                  indent=2)
+
+
+def load_results(path: str) -> List[BenchResult]:
+    with open(path, "r", encoding="utf-8") as fp:
+        return [BenchResult(**result) for result in json.load(fp)["results"]]
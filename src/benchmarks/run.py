@@ -0,0 +1,79 @@
+"""
+Run the benchmark suite and write the results as JSON.
+
+Every result is keyed by benchmark, case and household size, so two result files
+(say, from two commits) can be compared with ``benchmarks.compare``:
+
+    python -m benchmarks.run --nodes 10 1000 10000 100000 -o results.json
+    python -m benchmarks.run --only repository api --nodes 1000 -o quick.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import List
+
+from benchmarks import bench_api, bench_dispatch, bench_historical, bench_household, bench_realtime, bench_repository
+from benchmarks.results import BenchResult, environment, write_results
+from logs.LogPipeline import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+
+
+def _household(sizes, args) -> List[BenchResult]:
+    results = []
+    for result in bench_household.run(sizes, args.ticks, args.active_fraction):
+        for engine in ("per_object", "vectorized"):
+            results.append(BenchResult("household", f"{engine}.tick", result["nodes"],
+                                       result[f"{engine}_ms_per_tick"], "ms", False, args.ticks))
+    return results
+
+
+SUITES = {
+    "repository": lambda sizes, args: bench_repository.run(sizes, repeat=args.repeat, budget=args.budget),
+    "household": _household,
+    "realtime": lambda sizes, args: asyncio.run(
+        bench_realtime.run(sizes, args.active_fraction, budget=args.budget)),
+    "historical": lambda sizes, args: asyncio.run(bench_historical.run(sizes, args.active_fraction)),
+    "api": lambda sizes, args: asyncio.run(bench_api.run(sizes, budget=args.budget)),
+    # Independent of the household size
+    "dispatch": lambda sizes, args: asyncio.run(bench_dispatch.run(budget=args.budget)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=DEFAULT_SIZES, help="Household sizes")
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), default=list(SUITES), help="Benchmarks to run")
+    parser.add_argument("-o", "--output", default="benchmark-results.json", help="Where to write the results")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per latency case")
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds spent at most on one case")
+    parser.add_argument("--ticks", type=int, default=20, help="Ticks per household benchmark")
+    parser.add_argument("--active-fraction", type=float, default=0.05)
+    args = parser.parse_args()
+
+    setup_logging()
+    # The simulations log every tick; keep the suite's own progress readable
+    for name in ("simulation", "core", "server", "sinks", "envirorment", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    meta = environment()
+    results: List[BenchResult] = []
+    for name in args.only:
+        started = time.perf_counter()
+        suite = SUITES[name](args.nodes, args)
+        logger.info(f"{name}: {len(suite)} results in {time.perf_counter() - started:.1f}s")
+        for result in suite:
+            logger.info(f"  {result.case:<40} {result.nodes:>7} nodes  {result.value:>12.3f} {result.unit}")
+        results.extend(suite)
+        # Written after every benchmark, so an interrupted run keeps what it measured
+        write_results(args.output, results, meta)
+
+    logger.info(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
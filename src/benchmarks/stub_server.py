@@ -0,0 +1,81 @@
+"""
+Minimal keep-alive HTTP/1.1 server that answers every request with 204 No Content.
+
+Used as a local endpoint when benchmarking the simulation's HTTP delivery path.
+
+    python -m benchmarks.stub_server --port 3002 --delay 0.01
+"""
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StubServer:
+    """Counts requests and replies 204 after an optional delay."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.requests = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+                await self.respond(body, writer)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, body: bytes, writer: asyncio.StreamWriter):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.requests += 1
+        writer.write(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n")
+
+
+async def _serve(args):
+    server = StubServer(args.host, args.port, args.delay)
+    await server.start()
+    logger.info("Stub server listening on %s", server.url)
+    try:
+        while True:
+            await asyncio.sleep(5)
+            logger.info("%d requests served", server.requests)
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3002)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    asyncio.run(_serve(parser.parse_args()))
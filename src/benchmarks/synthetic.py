@@ -0,0 +1,40 @@
+"""Synthetic households for benchmarks."""
+import json
+import random
+from pathlib import Path
+from typing import Iterable, List
+
+from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
+from core.model.WaveNode import WaveNode
+
+_NODE_TYPES = list(NodeType)
+
+
+def make_nodes(count: int, active_fraction: float = 0.05, seed: int = 0,
+               endpoint: str = "http://127.0.0.1:3002/api/internal/measurements") -> List[WaveNode]:
+    """``count`` nodes of mixed types, about ``active_fraction`` of them on."""
+    rng = random.Random(seed)
+    return [
+        WaveNode(
+            id=f"node-{i}",
+            name=f"Node {i}",
+            node_type=_NODE_TYPES[i % len(_NODE_TYPES)],
+            endpoint=f"{endpoint}?smart_furniture_hookup_id={i}",
+            status=NodeStatus.ON if rng.random() < active_fraction else NodeStatus.OFF,
+            real_time_consumption=round(rng.uniform(0.1, 2.0), 2),
+        )
+        for i in range(count)
+    ]
+
+
+def write_data_dir(data_dir: str, nodes: List[WaveNode], users: Iterable[str] = ("alice", "bob")):
+    """Write ``nodes`` and ``users`` as nodes.json / users.json, the layout every repository backend starts from."""
+    from core.storage.WavesLabRepository import WavesLabRepository
+
+    path = Path(data_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    with open(path / "nodes.json", "w", encoding="utf-8") as fp:
+        json.dump(WavesLabRepository._serialize_nodes(nodes), fp)
+    with open(path / "users.json", "w", encoding="utf-8") as fp:
+        json.dump([{"username": username} for username in users], fp)
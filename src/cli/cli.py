@@ -1,12 +1,16 @@
 import click
 import sys
 import logging
+from fnmatch import fnmatchcase
+from typing import List, Optional, Tuple
 
+from core.model.NodeStatus import NodeStatus
 from core.model.NodeType import NodeType
 from core.storage.WavesLabRepository import repository
+from logs.LogPipeline import setup_logging
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -20,30 +24,125 @@ def waveslab():
     """
     pass
 
+def _resolve_node_ids(patterns) -> Tuple[List[str], List[str]]:
+    """
+    Expand node ids, glob patterns and ``-`` (ids read from stdin, one per line).
+
+    Returns the ids in the order given, and the patterns that matched no node. Plain
+    ids are kept as they are; the repository reports those that do not exist.
+    """
+    expanded = []
+    for pattern in patterns:
+        if pattern == "-":
+            expanded.extend(line.strip() for line in sys.stdin if line.strip())
+        else:
+            expanded.append(pattern)
+
+    ids, unmatched = [], []
+    all_ids = None
+    for pattern in expanded:
+        if not any(char in pattern for char in "*?["):
+            ids.append(pattern)
+            continue
+        if all_ids is None:
+            all_ids = [node.id for node in repository.get_all_nodes()]
+        matches = [node_id for node_id in all_ids if fnmatchcase(node_id, pattern)]
+        if matches:
+            ids.extend(matches)
+        else:
+            unmatched.append(pattern)
+    return ids, unmatched
+
+
+def _report_bulk(result, unmatched: List[str], done: str):
+    """Print the outcome of a bulk operation and exit with 1 if anything was not found."""
+    if result.error:
+        click.echo(f"Error: {result.error}", err=True)
+        sys.exit(1)
+
+    if result.nodes:
+        click.echo(f"{done} {len(result.nodes)} nodes")
+    for pattern in unmatched:
+        click.echo(f"Error: No node matches '{pattern}'", err=True)
+    for node_id in result.missing:
+        click.echo(f"Error: Node '{node_id}' not found", err=True)
+    sys.exit(1 if unmatched or result.missing else 0)
+
+
 @waveslab.command()
-@click.argument('node_id')
-def switch(node_id: str):
+@click.argument('node_ids', nargs=-1, required=True)
+@click.option('--on', 'status', flag_value='on', help='Switch the nodes on instead of toggling them')
+@click.option('--off', 'status', flag_value='off', help='Switch the nodes off instead of toggling them')
+def switch(node_ids: Tuple[str, ...], status: Optional[str]):
     """
-    Switch the status of a WaveNode by id.
+    Switch the status of one or more WaveNodes by id.
 
-    id: The id of the WaveNode to switch
+    Ids may be glob patterns, and "-" reads ids from stdin. All nodes are switched
+    in one repository call.
 
     Examples:
         waveslab switch "living-room-light"
-        waveslab switch "kitchen-faucet"
+        waveslab switch "kitchen-*" "bedroom-lamp"
+        waveslab switch --off "*-light"
+        cat ids.txt | waveslab switch -
     """
     try:
-        success, message = repository.switch_node(node_id)
+        ids, unmatched = _resolve_node_ids(node_ids)
+        result = repository.switch_nodes(ids, NodeStatus(status) if status else None)
 
-        if success:
-            click.echo(message)
+        if len(node_ids) == 1 and len(ids) == 1 and result.nodes:
+            click.echo(f"Node '{ids[0]}' status switched successfully")
             sys.exit(0)
-        else:
-            click.echo(f"Error: {message}", err=True)
-            sys.exit(1)
+        _report_bulk(result, unmatched, "Switched")
+
+    except Exception as e:
+        logger.error(f"Unexpected error switching nodes {list(node_ids)}: {e}")
+        click.echo(f"Unexpected error: {e}", err=True)
+        sys.exit(1)
+
+@waveslab.command()
+@click.argument('url')
+@click.argument('node_ids', nargs=-1, required=True)
+def endpoint(url: str, node_ids: Tuple[str, ...]):
+    """
+    Set the endpoint URL of one or more WaveNodes.
+
+    "{id}" in URL is replaced by each node's id. Ids may be glob patterns, and "-"
+    reads ids from stdin.
+
+    Examples:
+        waveslab endpoint "http://localhost:8080/readings/{id}" "*"
+        waveslab endpoint "http://collector:9000/gas" "stove" "boiler"
+    """
+    try:
+        ids, unmatched = _resolve_node_ids(node_ids)
+        result = repository.update_nodes_endpoint({node_id: url.replace("{id}", node_id) for node_id in ids})
+        _report_bulk(result, unmatched, "Updated the endpoint of")
+
+    except Exception as e:
+        logger.error(f"Unexpected error updating endpoints: {e}")
+        click.echo(f"Unexpected error: {e}", err=True)
+        sys.exit(1)
+
+@waveslab.command()
+@click.argument('username')
+@click.argument('node_ids', nargs=-1, required=True)
+def assign(username: str, node_ids: Tuple[str, ...]):
+    """
+    Assign a VirtualUser to one or more WaveNodes.
+
+    Ids may be glob patterns, and "-" reads ids from stdin.
+
+    Examples:
+        waveslab assign alice "kitchen-*"
+    """
+    try:
+        ids, unmatched = _resolve_node_ids(node_ids)
+        result = repository.assign_user_to_nodes(ids, username)
+        _report_bulk(result, unmatched, f"Assigned '{username}' to")
 
     except Exception as e:
-        logger.error(f"Unexpected error switching node '{node_id}': {e}")
+        logger.error(f"Unexpected error assigning nodes to '{username}': {e}")
         click.echo(f"Unexpected error: {e}", err=True)
         sys.exit(1)
 
@@ -90,14 +189,13 @@ def info(active: bool, utility: str):
     Shows the information of all nodes
     """
     try:
-        if active:
+        if utility:
+            nodes = repository.get_nodes_by_type(utility, active_only=active)
+        elif active:
             nodes = repository.get_active_nodes()
         else:
             nodes = repository.get_all_nodes()
 
-        if utility:
-            nodes = [node for node in nodes if node.node_type == utility]
-
         if not nodes:
             click.echo("No WaveNodes found.")
             return
@@ -115,9 +213,7 @@ def info(active: bool, utility: str):
 
 def _info_utility(utility_type: NodeType):
     try:
-        all_nodes = repository.get_active_nodes()
-
-        nodes = [node for node in all_nodes if node.node_type == utility_type]
+        nodes = repository.get_nodes_by_type(utility_type, active_only=True)
         if not nodes:
             click.echo("No WaveNodes found.")
             return
@@ -153,4 +249,96 @@ def users():
     except Exception as e:
         logger.error(f"Error listing users: {e}")
         click.echo(f"Error listing users: {e}", err=True)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+@waveslab.command()
+@click.argument('output', type=click.Path(file_okay=False, allow_dash=True))
+@click.option('--nodes', '-n', type=click.IntRange(min=1), default=None, help='Total number of nodes')
+@click.option('--households', type=click.IntRange(min=1), default=None, help='Number of households')
+@click.option('--seed', type=int, default=0, show_default=True, help='Seed of the generated dataset')
+@click.option('--endpoint', default=None,
+              help='Endpoint template; {id}, {index}, {house} and {type} are substituted')
+@click.option('--active-fraction', type=click.FloatRange(0, 1), default=0.3, show_default=True,
+              help='Fraction of nodes that start switched on')
+@click.option('--assigned-fraction', type=click.FloatRange(0, 1), default=0.5, show_default=True,
+              help='Fraction of nodes assigned to a resident')
+@click.option('--force', is_flag=True,
+              help='Replace an existing dataset, removing its SQLite database and journal')
+def generate(output: str, nodes: Optional[int], households: Optional[int], seed: int, endpoint: Optional[str],
+             active_fraction: float, assigned_fraction: float, force: bool):
+    """
+    Generate a synthetic dataset of households into OUTPUT.
+
+    Writes nodes.json and users.json into the OUTPUT directory, one household at a
+    time, so millions of nodes need little memory. With --force an existing dataset
+    is replaced, and the SQLite database and journal built from it are removed.
+    With "-" as OUTPUT the nodes are written to stdout as JSON Lines (one node per
+    line) and no users are written.
+
+    Examples:
+        waveslab generate /data/big --nodes 1000000
+        waveslab generate /data/town --households 500 --endpoint "http://sink/{type}/{id}"
+        waveslab generate - --nodes 100 > nodes.jsonl
+        WAVESLAB_DATA_DIR=/data/big WAVESLAB_STORAGE=sqlite python runs_sim.py
+    """
+    from envirorment.HouseholdGenerator import (DEFAULT_ENDPOINT, HouseholdGenerator, existing_dataset, write_dataset,
+                                                write_node_lines)
+
+    if (nodes is None) == (households is None):
+        click.echo("Error: Give either --nodes or --households", err=True)
+        sys.exit(2)
+    if output != "-" and not force:
+        existing = existing_dataset(output)
+        if existing:
+            click.echo(f"Error: {output} already holds a dataset ({', '.join(str(path) for path in existing)}), "
+                       f"use --force to replace it", err=True)
+            sys.exit(1)
+
+    try:
+        generator = HouseholdGenerator(seed, endpoint or DEFAULT_ENDPOINT, active_fraction, assigned_fraction)
+    except (KeyError, ValueError, IndexError) as e:
+        click.echo(f"Error: Invalid endpoint template '{endpoint}': {e!r}", err=True)
+        sys.exit(1)
+
+    try:
+        if output == "-":
+            write_node_lines(sys.stdout, generator, nodes, households)
+            return
+        node_count, user_count = write_dataset(output, generator, nodes, households)
+        click.echo(f"Generated {node_count} nodes and {user_count} users in {output}")
+    except Exception as e:
+        logger.error(f"Error generating dataset: {e}")
+        click.echo(f"Error generating dataset: {e}", err=True)
+        sys.exit(1)
+
+@waveslab.command()
+@click.option(
+    '--data-dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Directory holding nodes.json and users.json (defaults to WAVESLAB_DATA_DIR, then core/storage/)'
+)
+@click.option(
+    '--db',
+    type=click.Path(dir_okay=False),
+    default=None,
+    help='SQLite database file (defaults to WAVESLAB_SQLITE_PATH, then waveslab.db in the data directory)'
+)
+def migrate(data_dir: Optional[str], db: Optional[str]):
+    """
+    Copy nodes.json and users.json into the SQLite storage backend.
+
+    Examples:
+        waveslab migrate
+        waveslab migrate --data-dir /data/big
+        WAVESLAB_STORAGE=sqlite waveslab status
+    """
+    from core.storage.SqliteWavesLabRepository import migrate_json_to_sqlite
+
+    try:
+        nodes, users = migrate_json_to_sqlite(data_dir, db_path=db)
+        click.echo(f"Migrated {nodes} nodes and {users} users")
+    except Exception as e:
+        logger.error(f"Error migrating to SQLite: {e}")
+        click.echo(f"Error migrating to SQLite: {e}", err=True)
+        sys.exit(1)
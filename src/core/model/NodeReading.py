@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class NodeReading(NamedTuple):
+    """
+    A single measurement emitted by a WaveNode at a point in (simulated) time.
+
+    A plain tuple rather than a pydantic model: readings are created per node per tick,
+    so they stay cheap to build and are validated by the sink that consumes them.
+    """
+    node_type: str
+    hookup_id: str
+    value: float
+    timestamp: datetime
+    username: Optional[str] = None
\ No newline at end of file
@@ -6,6 +6,12 @@ from pydantic import BaseModel, Field, field_validator
 from core.model.NodeStatus import NodeStatus
 from core.model.NodeType import NodeType
 
+
+def slugify(name: str) -> str:
+    """Node id derived from a name: lowercase, runs of other characters replaced by hyphens."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
 class WaveNode(BaseModel):
     """Model representing a WaveNode - a smart furniture connection."""
     id: str = Field(..., description="Slugified version of the name")
@@ -21,6 +27,5 @@ class WaveNode(BaseModel):
     def generate_id_from_name(cls, v, info):
         """Generate slugified ID from name if not provided."""
         if v is None and 'name' in info.data:
-            # Slugify the name: lowercase, replace spaces/special chars with hyphens
-            return re.sub(r'[^a-z0-9]+', '-', info.data['name'].lower()).strip('-')
+            return slugify(info.data['name'])
         return v
@@ -0,0 +1,112 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
+from core.model.WaveNode import WaveNode
+
+
+class ActiveNodesDelta(NamedTuple):
+    """
+    Changes to the set of active nodes since a given index version.
+
+    When ``full`` is True, ``nodes`` is the complete active set and replaces whatever
+    the caller had; otherwise ``nodes`` holds active nodes that changed and ``removed``
+    the ids of nodes that are no longer active.
+    """
+    version: int
+    full: bool
+    nodes: List[WaveNode]
+    removed: List[str]
+
+
+class ActiveNodeIndex:
+    """Incrementally maintained set of active nodes, grouped by NodeType, with a bounded change log."""
+
+    def __init__(self, history: int = 10_000):
+        """
+        Args:
+            history: Number of changes kept for delta queries; older callers get a full snapshot
+        """
+        self._by_type: Dict[NodeType, Dict[str, WaveNode]] = {node_type: {} for node_type in NodeType}
+        self._version = 0
+        self._changes: Deque[Tuple[int, str]] = deque(maxlen=history)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def rebuild(self, nodes: Iterable[WaveNode]):
+        for active in self._by_type.values():
+            active.clear()
+        for node in nodes:
+            if node.status == NodeStatus.ON:
+                self._by_type[node.node_type][node.id] = node
+        # Bump the version without logging it, so every outstanding delta becomes a full snapshot
+        self._version += 1
+        self._changes.clear()
+
+    def update(self, node: WaveNode):
+        """Record that ``node`` changed (status or any other field)."""
+        active = self._by_type[node.node_type]
+        if node.status == NodeStatus.ON:
+            active[node.id] = node
+        else:
+            active.pop(node.id, None)
+
+        self._version += 1
+        self._changes.append((self._version, node.id))
+
+    def nodes(self) -> List[WaveNode]:
+        return [node for active in self._by_type.values() for node in active.values()]
+
+    def delta(self, since: Optional[int]) -> ActiveNodesDelta:
+        """
+        Changes since version ``since``, or a full snapshot when the change log no longer covers it.
+
+        Indexed nodes are returned as they are; the stores that own them replace changed
+        nodes instead of mutating them.
+
+        Args:
+            since: Version returned by a previous call, or None for a full snapshot
+        """
+        oldest = self._changes[0][0] - 1 if self._changes else self._version
+        if since is None or since < oldest or since > self._version:
+            return ActiveNodesDelta(self._version, True, self.nodes(), [])
+
+        changed = set()
+        for version, node_id in reversed(self._changes):
+            if version <= since:
+                break
+            changed.add(node_id)
+
+        nodes, removed = [], []
+        for node_id in changed:
+            node = next((active[node_id] for active in self._by_type.values() if node_id in active), None)
+            if node is None:
+                removed.append(node_id)
+            else:
+                nodes.append(node)
+        return ActiveNodesDelta(self._version, False, nodes, removed)
+
+
+class ActiveNodeView:
+    """Consumer-side mirror of a repository's active nodes, refreshed from deltas."""
+
+    def __init__(self, repository):
+        self._repository = repository
+        self._version: Optional[int] = None
+        self._nodes: Dict[str, WaveNode] = {}
+
+    def refresh(self) -> List[WaveNode]:
+        """Apply the changes since the last refresh and return the current active nodes."""
+        delta = self._repository.get_active_delta(self._version)
+        if delta.full:
+            self._nodes = {node.id: node for node in delta.nodes}
+        else:
+            for node_id in delta.removed:
+                self._nodes.pop(node_id, None)
+            for node in delta.nodes:
+                self._nodes[node.id] = node
+        self._version = delta.version
+        return list(self._nodes.values())
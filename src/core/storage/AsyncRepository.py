@@ -0,0 +1,53 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+from core.model.NodeStatus import NodeStatus
+from core.model.VirtualUser import VirtualUser
+from core.model.WaveNode import WaveNode
+from core.storage.BulkResult import BulkResult
+
+
+class AsyncRepository:
+    """
+    Awaitable facade over any repository backend, for use from an event loop.
+
+    Repository calls read and write files or SQLite and wait on the repository lock,
+    so each one runs in the default thread pool instead of blocking the loop. The
+    wrapped repository stays available as ``sync``.
+    """
+
+    def __init__(self, repository):
+        self.sync = repository
+
+    async def get_version(self) -> str:
+        return await asyncio.to_thread(self.sync.get_version)
+
+    async def get_all_nodes(self) -> List[WaveNode]:
+        return await asyncio.to_thread(self.sync.get_all_nodes)
+
+    async def get_node_by_id(self, node_id: str) -> Optional[WaveNode]:
+        return await asyncio.to_thread(self.sync.get_node_by_id, node_id)
+
+    async def get_active_nodes(self) -> List[WaveNode]:
+        return await asyncio.to_thread(self.sync.get_active_nodes)
+
+    async def update_node_endpoint(self, node_id: str, endpoint: str) -> Optional[WaveNode]:
+        return await asyncio.to_thread(self.sync.update_node_endpoint, node_id, endpoint)
+
+    async def switch_node(self, node_id: str) -> tuple[bool, str]:
+        return await asyncio.to_thread(self.sync.switch_node, node_id)
+
+    async def assign_user_to_node(self, node_id: str, user_name: str) -> tuple[bool, str]:
+        return await asyncio.to_thread(self.sync.assign_user_to_node, node_id, user_name)
+
+    async def switch_nodes(self, node_ids: Iterable[str], status: Optional[NodeStatus] = None) -> BulkResult:
+        return await asyncio.to_thread(self.sync.switch_nodes, list(node_ids), status)
+
+    async def update_nodes_endpoint(self, endpoints: Dict[str, str]) -> BulkResult:
+        return await asyncio.to_thread(self.sync.update_nodes_endpoint, endpoints)
+
+    async def assign_user_to_nodes(self, node_ids: Iterable[str], user_name: str) -> BulkResult:
+        return await asyncio.to_thread(self.sync.assign_user_to_nodes, list(node_ids), user_name)
+
+    async def get_all_users(self) -> List[VirtualUser]:
+        return await asyncio.to_thread(self.sync.get_all_users)
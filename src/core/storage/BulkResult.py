@@ -0,0 +1,16 @@
+from typing import List, NamedTuple, Optional
+
+from core.model.WaveNode import WaveNode
+
+
+class BulkResult(NamedTuple):
+    """
+    Outcome of a bulk node mutation.
+
+    ``nodes`` are the matched nodes as they are after the mutation, ``missing`` the
+    requested ids that do not exist. ``error`` is set when the whole batch was
+    rejected (e.g. an unknown user) and nothing was applied.
+    """
+    nodes: List[WaveNode]
+    missing: List[str]
+    error: Optional[str] = None
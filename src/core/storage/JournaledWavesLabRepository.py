@@ -0,0 +1,195 @@
+from typing import Dict, List, Optional, TextIO
+import json
+import logging
+import os
+import zlib
+from pathlib import Path
+from threading import Event, Thread
+
+from core.model.NodeStatus import NodeStatus
+from core.model.WaveNode import WaveNode
+from core.storage.WavesLabRepository import REPOSITORY_SECONDS, WavesLabRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JournaledWavesLabRepository(WavesLabRepository):
+    """
+    In-memory repository that persists mutations to an append-only journal.
+
+    Every mutation appends one small record (``<crc32> {"id": ..., "set": {...}}``) to
+    ``journal/journal.<generation>.log`` instead of rewriting ``nodes.json``. On startup
+    the state is rebuilt from ``nodes.json`` plus every journal generation on disk.
+    A background thread compacts the journal: it rotates to a new generation, writes
+    the current state to ``nodes.json`` and deletes the logs it covers.
+
+    Records set absolute field values, so replaying a record that is already part of
+    ``nodes.json`` is harmless; this is what makes a crash at any point of the compaction
+    safe. A torn or corrupt record at the end of a log is detected by its checksum and
+    ignored.
+    """
+
+    def __init__(self, data_dir: str = "core/storage/", compact_after: int = 10_000,
+                 compact_interval: float = 30.0, fsync: bool = False):
+        """
+        Args:
+            data_dir: Directory holding nodes.json and users.json
+            compact_after: Number of journal records that triggers a compaction
+            compact_interval: Seconds between checks for pending compaction
+            fsync: fsync every record (durable against power loss, not only process crashes)
+        """
+        self._journal_dir = Path(data_dir) / "journal"
+        self._compact_after = compact_after
+        self._fsync = fsync
+        self._generation = 0
+        self._log: Optional[TextIO] = None
+        self._records = 0
+        self._compact_requested = Event()
+        super().__init__(data_dir, in_memory=True, flush_interval=compact_interval)
+
+    # Journal files
+
+    def _log_path(self, generation: int) -> Path:
+        return self._journal_dir / f"journal.{generation}.log"
+
+    def _generations(self) -> List[int]:
+        generations = []
+        for path in self._journal_dir.glob("journal.*.log"):
+            try:
+                generations.append(int(path.name.split(".")[1]))
+            except ValueError:
+                logger.warning("Ignoring unexpected journal file %s", path)
+        return sorted(generations)
+
+    @staticmethod
+    def _encode(record: dict) -> str:
+        body = json.dumps(record, separators=(",", ":"))
+        return f"{zlib.crc32(body.encode('utf-8')):08x} {body}\n"
+
+    @staticmethod
+    def _decode(line: str) -> Optional[dict]:
+        checksum, _, body = line.rstrip("\n").partition(" ")
+        try:
+            if int(checksum, 16) != zlib.crc32(body.encode("utf-8")):
+                return None
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _apply(nodes: Dict[str, WaveNode], record: dict):
+        node = nodes.get(record["id"])
+        if node is None:
+            return
+        update = dict(record["set"])
+        if "status" in update:
+            update["status"] = NodeStatus(update["status"].lower())
+        nodes[node.id] = node.model_copy(update=update)
+
+    def _replay(self, generation: int) -> int:
+        applied = 0
+        with open(self._log_path(generation), "r", encoding="utf-8") as fp:
+            for line in fp:
+                record = self._decode(line)
+                if record is None:
+                    # Only a crash mid-append can leave a bad record, and nothing is ever appended after it
+                    logger.warning("Stopping replay of %s at a corrupt record", self._log_path(generation))
+                    break
+                self._apply(self._nodes_cache, record)
+                applied += 1
+        return applied
+
+    def _open_log(self, generation: int):
+        self._generation = generation
+        self._log = open(self._log_path(generation), "a", encoding="utf-8")
+
+    # Store lifecycle
+
+    def _open_store(self):
+        """Rebuild the state from nodes.json plus the journal and start the compactor."""
+        self._journal_dir.mkdir(parents=True, exist_ok=True)
+        self._nodes_cache = self._load_nodes()
+        self._users_cache = self._load_users()
+
+        generations = self._generations()
+        for generation in generations:
+            self._records += self._replay(generation)
+        logger.info("Replayed %d journal records from %d logs", self._records, len(generations))
+
+        # Never append after a possibly torn record: always start a fresh generation
+        self._open_log(generations[-1] + 1 if generations else 0)
+        if self._records:
+            self._compact_requested.set()
+
+        self._flusher = Thread(target=self._compact_worker, name="waveslab-journal-compactor", daemon=True)
+        self._flusher.start()
+
+    def _persist(self, nodes: Dict[str, WaveNode], changes: Dict[str, dict]):
+        # One write (and fsync) for the whole batch; records are checked one by one on replay
+        with REPOSITORY_SECONDS.labels("journal_append").time():
+            self._log.write("".join(self._encode({"id": node_id, "set": fields}) for node_id, fields in changes.items()))
+            self._log.flush()
+            if self._fsync:
+                os.fsync(self._log.fileno())
+
+        self._records += len(changes)
+        if self._records >= self._compact_after:
+            self._compact_requested.set()
+
+    def _compact_worker(self):
+        while not self._closed.is_set():
+            self._compact_requested.wait(self._flush_interval)
+            if self._compact_requested.is_set():
+                self._compact_requested.clear()
+                self.compact()
+
+    def compact(self):
+        """Fold the journal into nodes.json and drop the logs it covers."""
+        with self._io_lock:
+            with self._lock:
+                if not self._records:
+                    return
+                covered = self._generation
+                self._log.close()
+                self._open_log(covered + 1)
+                records = self._records
+                self._records = 0
+                nodes_data = self._serialize_nodes(self._nodes_cache.values())
+
+            try:
+                with REPOSITORY_SECONDS.labels("compact").time():
+                    self._write_json_atomic(self._nodes_file, nodes_data)
+            except Exception as e:
+                # The logs are still on disk, so nothing is lost; retry on the next compaction
+                logger.error("Error compacting journal: %s", e)
+                with self._lock:
+                    self._records += records
+                return
+
+            for generation in self._generations():
+                if generation <= covered:
+                    self._log_path(generation).unlink(missing_ok=True)
+            logger.debug("Compacted %d journal records into %s", records, self._nodes_file)
+
+    def flush(self):
+        """Force journal records to stable storage."""
+        with self._lock:
+            if self._log and not self._log.closed:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+
+    def close(self):
+        """Stop the compactor, compact what is left and close the journal."""
+        if self._closed.is_set():
+            return
+
+        self._closed.set()
+        self._compact_requested.set()
+        if self._flusher:
+            self._flusher.join()
+            self._flusher = None
+        self.compact()
+        with self._lock:
+            self._log.close()
+            if self._log_path(self._generation).stat().st_size == 0:
+                self._log_path(self._generation).unlink()
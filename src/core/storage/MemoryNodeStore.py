@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.model.NodeStatus import NodeStatus
+from core.model.VirtualUser import VirtualUser
+from core.model.WaveNode import WaveNode
+from core.storage.ActiveNodeIndex import ActiveNodeIndex, ActiveNodesDelta
+from core.storage.BulkResult import BulkResult
+
+
+class MemoryNodeStore:
+    """
+    Non-persistent store exposing the repository's node and user operations.
+
+    Used by offline simulations that own their household: nothing is read from or
+    written to disk, and there is no locking, so an instance belongs to one thread.
+    As in the repository, changed nodes are replaced rather than mutated, so reads
+    return the stored nodes without copying.
+    """
+
+    def __init__(self, nodes: Iterable[WaveNode], users: Iterable[VirtualUser] = ()):
+        self._nodes: Dict[str, WaveNode] = {node.id: node.model_copy() for node in nodes}
+        self._users: Dict[str, VirtualUser] = {user.username: user for user in users}
+        self._active_index = ActiveNodeIndex()
+        self._active_index.rebuild(self._nodes.values())
+        self._mutations = 0
+
+    @classmethod
+    def from_repository(cls, repository) -> "MemoryNodeStore":
+        """Snapshot the current nodes and users of a repository."""
+        return cls(repository.get_all_nodes(), repository.get_all_users())
+
+    # Node operations
+
+    def get_all_nodes(self) -> List[WaveNode]:
+        return list(self._nodes.values())
+
+    def get_node_by_id(self, node_id: str) -> Optional[WaveNode]:
+        return self._nodes.get(node_id)
+
+    def get_active_nodes(self) -> List[WaveNode]:
+        return self._active_index.nodes()
+
+    def get_active_delta(self, since: Optional[int] = None) -> ActiveNodesDelta:
+        return self._active_index.delta(since)
+
+    def get_version(self) -> str:
+        return f"m{self._mutations}"
+
+    def switch_node(self, node_id: str) -> Tuple[bool, str]:
+        node = self._nodes.get(node_id)
+        if not node:
+            return False, f"Node '{node_id}' not found"
+
+        self._switch(node, NodeStatus.OFF if node.status == NodeStatus.ON else NodeStatus.ON)
+        return True, f"Node '{node_id}' status switched successfully"
+
+    def switch_nodes(self, node_ids: Iterable[str], status: Optional[NodeStatus] = None) -> BulkResult:
+        switched, missing = [], []
+        for node_id in dict.fromkeys(node_ids):
+            node = self._nodes.get(node_id)
+            if not node:
+                missing.append(node_id)
+                continue
+            new_status = status
+            if new_status is None:
+                new_status = NodeStatus.OFF if node.status == NodeStatus.ON else NodeStatus.ON
+            if node.status != new_status:
+                node = self._switch(node, new_status)
+            switched.append(node)
+        return BulkResult(switched, missing)
+
+    def _switch(self, node: WaveNode, status: NodeStatus) -> WaveNode:
+        node = node.model_copy(update={'status': status})
+        self._nodes[node.id] = node
+        self._active_index.update(node)
+        self._mutations += 1
+        return node
+
+    # User operations
+
+    def get_all_users(self) -> List[VirtualUser]:
+        return list(self._users.values())
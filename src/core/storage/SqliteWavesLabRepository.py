@@ -0,0 +1,302 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from threading import Lock, local
+
+from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
+from core.model.VirtualUser import VirtualUser
+from core.model.WaveNode import WaveNode
+from core.storage.ActiveNodeIndex import ActiveNodesDelta
+from core.storage.BulkResult import BulkResult
+from core.storage.WavesLabRepository import REPOSITORY_SECONDS, WavesLabRepository, default_data_dir
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    node_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    real_time_consumption REAL NOT NULL,
+    endpoint TEXT NOT NULL DEFAULT '',
+    assigned_user TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_nodes_name ON nodes (name);
+CREATE INDEX IF NOT EXISTS idx_nodes_status ON nodes (status);
+CREATE INDEX IF NOT EXISTS idx_nodes_node_type ON nodes (node_type);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('nodes_version', 0);
+CREATE TRIGGER IF NOT EXISTS nodes_version_insert AFTER INSERT ON nodes
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'nodes_version'; END;
+CREATE TRIGGER IF NOT EXISTS nodes_version_update AFTER UPDATE ON nodes
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'nodes_version'; END;
+CREATE TRIGGER IF NOT EXISTS nodes_version_delete AFTER DELETE ON nodes
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'nodes_version'; END;
+"""
+
+_NODE_COLUMNS = "id, name, node_type, status, real_time_consumption, endpoint, assigned_user"
+
+
+class SqliteWavesLabRepository:
+    """
+    WavesLabRepository backed by a SQLite database in WAL mode.
+
+    Implements the same interface as the JSON repository, but lookups by id, name,
+    status and node type are index queries and mutations are single-row updates.
+    Several processes (API, simulation, CLI) can share the same database file.
+    An empty database is seeded from nodes.json/users.json on first use.
+    """
+
+    def __init__(self, data_dir: str = "core/storage/", db_path: Optional[str] = None):
+        """
+        Args:
+            data_dir: Directory holding nodes.json and users.json, used for the initial migration
+            db_path: Database file, defaults to ``waveslab.db`` inside data_dir
+        """
+        self._data_dir = Path(data_dir)
+        self._db_path = Path(db_path) if db_path else self._data_dir / "waveslab.db"
+        self._local = local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = Lock()
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        empty = conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 0
+        if empty and (self._data_dir / "nodes.json").exists():
+            nodes, users = migrate_json_to_sqlite(str(self._data_dir), str(self._db_path))
+            logger.info("Seeded %s with %d nodes and %d users", self._db_path, nodes, users)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads, keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self._db_path)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _to_node(row: tuple) -> WaveNode:
+        node_id, name, node_type, status, consumption, endpoint, assigned_user = row
+        return WaveNode(
+            id=node_id,
+            name=name,
+            node_type=node_type,
+            status=status.lower(),
+            real_time_consumption=consumption,
+            endpoint=endpoint or "",
+            assigned_user=assigned_user
+        )
+
+    def _query_nodes(self, where: str = "", params: tuple = ()) -> List[WaveNode]:
+        with REPOSITORY_SECONDS.labels("load_nodes").time():
+            rows = self._conn().execute(f"SELECT {_NODE_COLUMNS} FROM nodes {where} ORDER BY rowid", params)
+            return [self._to_node(row) for row in rows]
+
+    def flush(self):
+        """Every change is committed immediately; kept for interface compatibility."""
+
+    def close(self):
+        """Close every connection opened by this repository."""
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    # Connections made by other threads can only be closed there; they die with the thread
+                    pass
+            self._connections.clear()
+        self._local = local()
+
+    # Node operations
+
+    def get_all_nodes(self) -> List[WaveNode]:
+        return self._query_nodes()
+
+    def get_node_by_id(self, node_id: str) -> Optional[WaveNode]:
+        nodes = self._query_nodes("WHERE id = ?", (node_id,))
+        return nodes[0] if nodes else None
+
+    def get_node_by_name(self, node_name: str) -> Optional[WaveNode]:
+        nodes = self._query_nodes("WHERE name = ?", (node_name,))
+        return nodes[0] if nodes else None
+
+    def get_nodes_by_type(self, node_type: Union[NodeType, str], active_only: bool = False) -> List[WaveNode]:
+        node_type = getattr(node_type, "value", node_type)
+        if active_only:
+            return self._query_nodes("WHERE node_type = ? AND status = 'ON'", (node_type,))
+        return self._query_nodes("WHERE node_type = ?", (node_type,))
+
+    def get_active_nodes(self) -> List[WaveNode]:
+        return self._query_nodes("WHERE status = 'ON'")
+
+    def get_version(self) -> str:
+        """Token that changes whenever the nodes change, in any process (bumped by triggers on the nodes table)."""
+        version = self._conn().execute("SELECT value FROM meta WHERE key = 'nodes_version'").fetchone()[0]
+        return f"s{version}"
+
+    def get_active_delta(self, since: Optional[int] = None) -> ActiveNodesDelta:
+        # Other processes may write to the database, so there is no change log to diff against;
+        # the status index still keeps this O(active nodes)
+        return ActiveNodesDelta(0, True, self.get_active_nodes(), [])
+
+    def update_node_endpoint(self, node_id: str, endpoint: str) -> Optional[WaveNode]:
+        conn = self._conn()
+        with REPOSITORY_SECONDS.labels("save_nodes").time(), conn:
+            cursor = conn.execute("UPDATE nodes SET endpoint = ? WHERE id = ?", (endpoint, node_id))
+        if cursor.rowcount == 0:
+            return None
+        logger.info("Updated endpoint for node %s to %s", node_id, endpoint)
+        return self.get_node_by_id(node_id)
+
+    def switch_node(self, node_id: str) -> Tuple[bool, str]:
+        conn = self._conn()
+        with REPOSITORY_SECONDS.labels("save_nodes").time(), conn:
+            cursor = conn.execute(
+                "UPDATE nodes SET status = CASE status WHEN 'ON' THEN 'OFF' ELSE 'ON' END WHERE id = ?",
+                (node_id,)
+            )
+        if cursor.rowcount == 0:
+            return False, f"Node '{node_id}' not found"
+        return True, f"Node '{node_id}' status switched successfully"
+
+    def assign_user_to_node(self, node_id: str, user_name: str) -> Tuple[bool, str]:
+        conn = self._conn()
+        with REPOSITORY_SECONDS.labels("save_nodes").time(), conn:
+            if conn.execute("SELECT 1 FROM nodes WHERE id = ?", (node_id,)).fetchone() is None:
+                return False, f"Node '{node_id}' not found"
+            if conn.execute("SELECT 1 FROM users WHERE username = ?", (user_name,)).fetchone() is None:
+                return False, f"User '{user_name}' not found"
+            conn.execute("UPDATE nodes SET assigned_user = ? WHERE id = ?", (user_name, node_id))
+        return True, f"Node '{node_id}' started successfully"
+
+    # Bulk node operations: one transaction for the whole batch
+
+    def _update_nodes(self, node_ids: Iterable[str], sql: str, params: Callable[[str], tuple],
+                      precheck: Optional[Callable[[sqlite3.Connection], Optional[str]]] = None) -> BulkResult:
+        """
+        Run ``sql`` with ``params(node_id)`` for every existing node among ``node_ids``, in one transaction.
+
+        ``precheck`` runs first in the same transaction; an error message it returns rejects the batch.
+        """
+        node_ids = list(dict.fromkeys(node_ids))
+        conn = self._conn()
+        with REPOSITORY_SECONDS.labels("save_nodes").time(), conn:
+            if precheck:
+                error = precheck(conn)
+                if error:
+                    return BulkResult([], [], error)
+            existing = {
+                node_id for (node_id,) in
+                conn.execute("SELECT id FROM nodes WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(node_ids),))
+            }
+            matched = [node_id for node_id in node_ids if node_id in existing]
+            conn.executemany(sql, [params(node_id) for node_id in matched])
+
+        by_id = {node.id: node for node in self._query_nodes("WHERE id IN (SELECT value FROM json_each(?))",
+                                                             (json.dumps(matched),))}
+        return BulkResult([by_id[node_id] for node_id in matched if node_id in by_id],
+                          [node_id for node_id in node_ids if node_id not in existing])
+
+    def switch_nodes(self, node_ids: Iterable[str], status: Optional[NodeStatus] = None) -> BulkResult:
+        if status is None:
+            return self._update_nodes(
+                node_ids, "UPDATE nodes SET status = CASE status WHEN 'ON' THEN 'OFF' ELSE 'ON' END WHERE id = ?",
+                lambda node_id: (node_id,)
+            )
+        # Nodes already in that status are left alone, so the version only moves for real changes
+        return self._update_nodes(
+            node_ids, "UPDATE nodes SET status = ? WHERE id = ? AND status != ?",
+            lambda node_id: (status.name, node_id, status.name)
+        )
+
+    def update_nodes_endpoint(self, endpoints: Dict[str, str]) -> BulkResult:
+        result = self._update_nodes(
+            endpoints, "UPDATE nodes SET endpoint = ? WHERE id = ? AND endpoint != ?",
+            lambda node_id: (endpoints[node_id], node_id, endpoints[node_id])
+        )
+        logger.info("Updated the endpoint of %d nodes (%d not found)", len(result.nodes), len(result.missing))
+        return result
+
+    def assign_user_to_nodes(self, node_ids: Iterable[str], user_name: str) -> BulkResult:
+        def user_exists(conn: sqlite3.Connection) -> Optional[str]:
+            if conn.execute("SELECT 1 FROM users WHERE username = ?", (user_name,)).fetchone() is None:
+                return f"User '{user_name}' not found"
+            return None
+
+        return self._update_nodes(
+            node_ids, "UPDATE nodes SET assigned_user = ? WHERE id = ? AND assigned_user IS NOT ?",
+            lambda node_id: (user_name, node_id, user_name), precheck=user_exists
+        )
+
+    # User operations
+
+    def get_all_users(self) -> List[VirtualUser]:
+        """Get all VirtualUsers."""
+        rows = self._conn().execute("SELECT username FROM users ORDER BY rowid")
+        return [VirtualUser(username=username) for (username,) in rows]
+
+    def get_user_by_username(self, username: str) -> Optional[VirtualUser]:
+        """Get a VirtualUser by username."""
+        row = self._conn().execute("SELECT username FROM users WHERE username = ?", (username,)).fetchone()
+        return VirtualUser(username=row[0]) if row else None
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def migrate_json_to_sqlite(data_dir: Optional[str] = None, db_path: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Copy nodes.json and users.json into a SQLite database.
+
+    Existing rows with the same id/username are replaced, so the migration can be re-run.
+
+    Args:
+        data_dir: Directory holding nodes.json and users.json, resolved like ``create_repository``
+        db_path: Database file, defaults to ``WAVESLAB_SQLITE_PATH``, then ``waveslab.db`` inside data_dir
+
+    Returns:
+        The number of nodes and users written
+    """
+    data_dir = data_dir or default_data_dir()
+    db_path = db_path or os.getenv("WAVESLAB_SQLITE_PATH")
+    source = WavesLabRepository(data_dir)
+    nodes = source.get_all_nodes()
+    users = source.get_all_users()
+
+    conn = _connect(Path(db_path) if db_path else Path(data_dir) / "waveslab.db")
+    try:
+        conn.executescript(_SCHEMA)
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO nodes ({_NODE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (node.id, node.name, node.node_type.value, node.status.name,
+                     node.real_time_consumption, node.endpoint or "", node.assigned_user)
+                    for node in nodes
+                ]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO users (username) VALUES (?)",
+                [(user.username,) for user in users]
+            )
+    finally:
+        conn.close()
+
+    return len(nodes), len(users)
@@ -1,20 +1,42 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Union
+import atexit
 import logging
 import json
 from pathlib import Path
 
 from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
 from core.model.VirtualUser import VirtualUser
 from core.model.WaveNode import WaveNode
+from core.storage.ActiveNodeIndex import ActiveNodeIndex, ActiveNodesDelta
+from core.storage.BulkResult import BulkResult
+from metrics.MetricsRegistry import registry
 import os
-from threading import Lock
+from threading import Event, Lock, Thread
 
 logger = logging.getLogger(__name__)
 
-class WavesLabRepository:
-    """Repository for WaveNodes and VirtualUsers with JSON persistence."""
+REPOSITORY_SECONDS = registry.histogram("waveslab_repository_io_seconds",
+                                        "Time spent loading and saving the repository, by operation", ("operation",))
 
-    def __init__(self, data_dir: str = "core/storage/"):
+class WavesLabRepository:
+    """
+    Repository for WaveNodes and VirtualUsers with JSON persistence.
+
+    By default every call re-reads the JSON files and every mutation rewrites them.
+    With ``in_memory=True`` the repository keeps one authoritative copy of nodes and
+    users in memory and writes changes back in the background (write-behind), either
+    every ``flush_interval`` seconds or as soon as ``flush_after`` mutations are
+    pending. Pending changes are flushed on ``close()``, which also runs at exit.
+    The in-memory mode assumes a single process owns the data files.
+
+    In-memory mode also maintains an index of active nodes grouped by NodeType, so
+    active-node queries cost O(active nodes) and ``get_active_delta`` can report
+    only what changed since the previous call.
+    """
+
+    def __init__(self, data_dir: str = "core/storage/", in_memory: bool = False,
+                 flush_interval: float = 2.0, flush_after: int = 100):
         self._data_dir = Path(data_dir)
 
         # load data
@@ -28,6 +50,25 @@ class WavesLabRepository:
 
         self._lock = Lock()
 
+        # Write-behind state, only used in in-memory mode
+        self._in_memory = in_memory
+        self._flush_interval = flush_interval
+        self._flush_after = flush_after
+        self._nodes_cache: Optional[Dict[str, WaveNode]] = None
+        self._users_cache: Optional[Dict[str, VirtualUser]] = None
+        self._dirty = 0
+        self._io_lock = Lock()
+        self._flush_requested = Event()
+        self._closed = Event()
+        self._flusher: Optional[Thread] = None
+        self._active_index = ActiveNodeIndex()
+        self._mutations = 0
+
+        if self._in_memory:
+            self._open_store()
+            self._active_index.rebuild(self._nodes_cache.values())
+            atexit.register(self.close)
+
     # Low-level JSON I/O helpers
 
     def _read_json(self, path: Path):
@@ -45,7 +86,8 @@ class WavesLabRepository:
 
     def _load_users(self) -> Dict[str, VirtualUser]:
         try:
-            users_data = self._read_json(self._users_file)
+            with REPOSITORY_SECONDS.labels("load_users").time():
+                users_data = self._read_json(self._users_file)
             users: Dict[str, VirtualUser] = {}
             for user_dict in users_data:
                 user = VirtualUser(**user_dict)
@@ -58,19 +100,20 @@ class WavesLabRepository:
 
     def _load_nodes(self) -> Dict[str, WaveNode]:
         try:
-            nodes_data = self._read_json(self._nodes_file)
-            nodes: Dict[str, WaveNode] = {}
-            for node_dict in nodes_data:
-                if node_dict.get("endpoint") is None:
-                    node_dict["endpoint"] = ""
-
-                if isinstance(node_dict.get("status"), str):
-                    node_dict["status"] = node_dict["status"].lower()
-                if isinstance(node_dict.get("node_type"), str):
-                    node_dict["node_type"] = node_dict["node_type"]
-
-                node = WaveNode(**node_dict)
-                nodes[node.id] = node
+            with REPOSITORY_SECONDS.labels("load_nodes").time():
+                nodes_data = self._read_json(self._nodes_file)
+                nodes: Dict[str, WaveNode] = {}
+                for node_dict in nodes_data:
+                    if node_dict.get("endpoint") is None:
+                        node_dict["endpoint"] = ""
+
+                    if isinstance(node_dict.get("status"), str):
+                        node_dict["status"] = node_dict["status"].lower()
+                    if isinstance(node_dict.get("node_type"), str):
+                        node_dict["node_type"] = node_dict["node_type"]
+
+                    node = WaveNode(**node_dict)
+                    nodes[node.id] = node
             logger.debug("Loaded %d nodes from %s", len(nodes), self._nodes_file)
             return nodes
         except Exception as e:
@@ -80,46 +123,150 @@ class WavesLabRepository:
     def _save_users(self, users: Dict[str, VirtualUser]):
         try:
             users_data = [{"username": user.username} for user in users.values()]
-            self._write_json_atomic(self._users_file, users_data)
+            with REPOSITORY_SECONDS.labels("save_users").time():
+                self._write_json_atomic(self._users_file, users_data)
             logger.debug("Saved %d users to %s", len(users_data), self._users_file)
         except Exception as e:
             logger.error("Error saving users: %s", e)
 
-    def _save_nodes(self, nodes: Dict[str, WaveNode]):
+    @staticmethod
+    def _serialize_nodes(nodes: Iterable[WaveNode]) -> List[dict]:
+        return [
+            {
+                'name': node.name,
+                'id': node.id,
+                'node_type': node.node_type.name,
+                'status': node.status.name,
+                'real_time_consumption': node.real_time_consumption,
+                'endpoint': node.endpoint,
+                'assigned_user': node.assigned_user
+            }
+            for node in nodes
+        ]
+
+    def _save_nodes(self, nodes: Dict[str, WaveNode]) -> bool:
         try:
-            nodes_data = []
-            for node in nodes.values():
-                nodes_data.append(
-                    {
-                        'name': node.name,
-                        'id': node.id,
-                        'node_type': node.node_type.name,
-                        'status': node.status.name,
-                        'real_time_consumption': node.real_time_consumption,
-                        'endpoint': node.endpoint,
-                        'assigned_user': node.assigned_user
-                    }
-                )
-            self._write_json_atomic(self._nodes_file, nodes_data)
+            with REPOSITORY_SECONDS.labels("save_nodes").time():
+                nodes_data = self._serialize_nodes(nodes.values())
+                self._write_json_atomic(self._nodes_file, nodes_data)
             logger.debug("Saved %d nodes to %s", len(nodes_data), self._nodes_file)
+            return True
         except Exception as e:
             logger.error("Error saving nodes: %s", e)
+            return False
+
+    # Storage access, called with the lock held
+
+    def _nodes(self) -> Dict[str, WaveNode]:
+        if self._in_memory:
+            return self._nodes_cache
+        return self._load_nodes()
+
+    def _users(self) -> Dict[str, VirtualUser]:
+        if self._in_memory:
+            return self._users_cache
+        return self._load_users()
+
+    def _commit_nodes(self, nodes: Dict[str, WaveNode], changes: Dict[str, dict]):
+        """
+        Record node mutations in the active index and persist them, all at once.
+
+        Args:
+            nodes: The working node set, with the changed nodes already replaced
+            changes: Changed fields by node id, serialized as in nodes.json
+        """
+        if not changes:
+            return
+        if self._in_memory:
+            for node_id in changes:
+                self._active_index.update(nodes[node_id])
+        self._mutations += len(changes)
+        self._persist(nodes, changes)
+
+    def _persist(self, nodes: Dict[str, WaveNode], changes: Dict[str, dict]):
+        """Save node mutations, or schedule them for the write-behind flusher."""
+        if not self._in_memory:
+            self._save_nodes(nodes)
+            return
+
+        self._dirty += len(changes)
+        if self._dirty >= self._flush_after:
+            self._flush_requested.set()
+
+    def _replace(self, nodes: Dict[str, WaveNode], node: WaveNode, **update) -> WaveNode:
+        """
+        Store a changed copy of ``node``. Stored nodes are never mutated, so reads hand them
+        out without copying and a node a caller holds never changes under it; callers must
+        treat returned nodes as read-only too (use ``model_copy(update=...)``).
+        """
+        node = node.model_copy(update=update)
+        nodes[node.id] = node
+        return node
+
+    # Write-behind persistence
+
+    def _open_store(self):
+        """Load the in-memory copy and start the write-behind flusher."""
+        self._nodes_cache = self._load_nodes()
+        self._users_cache = self._load_users()
+        self._flusher = Thread(target=self._flush_worker, name="waveslab-write-behind", daemon=True)
+        self._flusher.start()
+
+    def _flush_worker(self):
+        while not self._closed.is_set():
+            self._flush_requested.wait(self._flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
+    def flush(self):
+        """Write pending in-memory changes to disk. No-op outside in-memory mode."""
+        if not self._in_memory:
+            return
+
+        with self._io_lock:
+            with self._lock:
+                pending = self._dirty
+                if not pending:
+                    return
+                nodes_data = self._serialize_nodes(self._nodes_cache.values())
+                self._dirty = 0
+
+            try:
+                with REPOSITORY_SECONDS.labels("flush").time():
+                    self._write_json_atomic(self._nodes_file, nodes_data)
+                logger.debug("Flushed %d pending changes (%d nodes) to %s", pending, len(nodes_data), self._nodes_file)
+            except Exception as e:
+                logger.error("Error flushing nodes: %s", e)
+                with self._lock:
+                    self._dirty += pending
+
+    def close(self):
+        """Stop the background flusher and persist any pending changes."""
+        if not self._in_memory or self._closed.is_set():
+            return
+
+        self._closed.set()
+        self._flush_requested.set()
+        if self._flusher:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
 
     # Node operations
 
     def get_all_nodes(self) -> List[WaveNode]:
         with self._lock:
-            nodes = self._load_nodes()
+            nodes = self._nodes()
             return list(nodes.values())
 
     def get_node_by_id(self, node_id: str) -> Optional[WaveNode]:
         with self._lock:
-            nodes = self._load_nodes()
+            nodes = self._nodes()
             return nodes.get(node_id)
 
     def get_node_by_name(self, node_name: str) -> Optional[WaveNode]:
         with self._lock:
-            nodes = self._load_nodes()
+            nodes = self._nodes()
             for node in nodes.values():
                 if node.name == node_name:
                     return node
@@ -127,55 +274,184 @@ class WavesLabRepository:
 
     def update_node_endpoint(self, node_id: str, endpoint: str) -> Optional[WaveNode]:
         with self._lock:
-            nodes = self._load_nodes()
+            nodes = self._nodes()
             node = nodes.get(node_id)
             if not node:
                 return None
-            node.endpoint = endpoint
-            nodes[node_id] = node
-            self._save_nodes(nodes)
+            node = self._replace(nodes, node, endpoint=endpoint)
+            self._commit_nodes(nodes, {node_id: {'endpoint': endpoint}})
             logger.info("Updated endpoint for node %s to %s", node_id, endpoint)
             return node
 
     def switch_node(self, node_id: str) -> tuple[bool, str]:
         with self._lock:
-            nodes = self._load_nodes()
+            nodes = self._nodes()
             node = nodes.get(node_id)
 
             if not node:
                 return False, f"Node '{node_id}' not found"
 
             if node.status == NodeStatus.ON:
-                node.status = NodeStatus.OFF
+                node = self._replace(nodes, node, status=NodeStatus.OFF)
             else:
-                node.status = NodeStatus.ON
+                node = self._replace(nodes, node, status=NodeStatus.ON)
 
-            nodes[node_id] = node
-            self._save_nodes(nodes)
+            self._commit_nodes(nodes, {node_id: {'status': node.status.name}})
             return True, f"Node '{node_id}' status switched successfully"
 
+    # Bulk node operations: one lock and one persist for the whole batch
+
+    def _update_nodes(self, node_ids: Iterable[str], mutate: Callable[[WaveNode], Optional[dict]]) -> BulkResult:
+        """
+        Apply ``mutate`` to every existing node among ``node_ids``, called with the lock held.
+
+        ``mutate`` returns the fields to change, or None when the node stays as it is; the
+        node is replaced by an updated copy.
+        """
+        nodes = self._nodes()
+        matched, missing, changes = [], [], {}
+        for node_id in dict.fromkeys(node_ids):
+            node = nodes.get(node_id)
+            if not node:
+                missing.append(node_id)
+                continue
+            update = mutate(node)
+            if update:
+                node = self._replace(nodes, node, **update)
+                changes[node_id] = {
+                    field: value.name if isinstance(value, NodeStatus) else value for field, value in update.items()
+                }
+            matched.append(node)
+
+        self._commit_nodes(nodes, changes)
+        return BulkResult(matched, missing)
+
+    def switch_nodes(self, node_ids: Iterable[str], status: Optional[NodeStatus] = None) -> BulkResult:
+        """
+        Switch many nodes at once.
+
+        Args:
+            node_ids: Ids of the nodes to switch; repeated ids are switched once
+            status: Status to set; None toggles every node
+
+        Returns:
+            A BulkResult with the nodes after the switch and the ids not found
+        """
+        def mutate(node: WaveNode) -> Optional[dict]:
+            new_status = status
+            if new_status is None:
+                new_status = NodeStatus.OFF if node.status == NodeStatus.ON else NodeStatus.ON
+            if node.status == new_status:
+                return None
+            return {'status': new_status}
+
+        with self._lock:
+            return self._update_nodes(node_ids, mutate)
+
+    def update_nodes_endpoint(self, endpoints: Dict[str, str]) -> BulkResult:
+        """
+        Set the endpoint of many nodes at once.
+
+        Args:
+            endpoints: New endpoint by node id
+
+        Returns:
+            A BulkResult with the updated nodes and the ids not found
+        """
+        def mutate(node: WaveNode) -> Optional[dict]:
+            if node.endpoint == endpoints[node.id]:
+                return None
+            return {'endpoint': endpoints[node.id]}
+
+        with self._lock:
+            result = self._update_nodes(endpoints, mutate)
+        logger.info("Updated the endpoint of %d nodes (%d not found)", len(result.nodes), len(result.missing))
+        return result
+
+    def assign_user_to_nodes(self, node_ids: Iterable[str], user_name: str) -> BulkResult:
+        """
+        Assign a user to many nodes at once; nothing is assigned if the user does not exist.
+
+        Args:
+            node_ids: Ids of the nodes to assign
+            user_name: Username of an existing VirtualUser
+
+        Returns:
+            A BulkResult with the assigned nodes and the ids not found
+        """
+        def mutate(node: WaveNode) -> Optional[dict]:
+            if node.assigned_user == user_name:
+                return None
+            return {'assigned_user': user_name}
+
+        with self._lock:
+            if user_name not in self._users():
+                return BulkResult([], [], f"User '{user_name}' not found")
+            return self._update_nodes(node_ids, mutate)
+
     def get_active_nodes(self) -> List[WaveNode]:
         with self._lock:
-            nodes = self._load_nodes()
+            if self._in_memory:
+                return self._active_index.nodes()
+            nodes = self._nodes()
             return [node for node in nodes.values() if node.status == NodeStatus.ON]
 
+    def get_active_delta(self, since: Optional[int] = None) -> ActiveNodesDelta:
+        """
+        Get the changes to the active node set since a previous call.
+
+        Args:
+            since: ``version`` of the previously returned delta, or None for a full snapshot
+
+        Returns:
+            An ActiveNodesDelta; outside in-memory mode it is always a full snapshot
+        """
+        with self._lock:
+            if self._in_memory:
+                return self._active_index.delta(since)
+            nodes = self._nodes()
+            return ActiveNodesDelta(0, True, [node for node in nodes.values() if node.status == NodeStatus.ON], [])
+
+    def get_version(self) -> str:
+        """
+        Opaque token that changes whenever the nodes change, cheap enough to check on every request.
+
+        In-memory mode counts its own mutations; otherwise the token follows nodes.json on disk,
+        so writes made by other processes are seen too.
+        """
+        if self._in_memory:
+            return f"m{self._mutations}"
+        try:
+            stat = self._nodes_file.stat()
+        except OSError:
+            return "missing"
+        return f"f{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+
+    def get_nodes_by_type(self, node_type: Union[NodeType, str], active_only: bool = False) -> List[WaveNode]:
+        with self._lock:
+            if self._in_memory and active_only:
+                return [node for node in self._active_index.nodes() if node.node_type == node_type]
+            nodes = self._nodes()
+            return [
+                node for node in nodes.values()
+                if node.node_type == node_type and (not active_only or node.status == NodeStatus.ON)
+            ]
+
     def assign_user_to_node(self, node_id: str, user_name: str) -> tuple[bool, str]:
         with self._lock:
-            nodes = self._load_nodes()
+            nodes = self._nodes()
             node = nodes.get(node_id)
 
             if not node:
                 return False, f"Node '{node_id}' not found"
 
-            users = self._load_users()
+            users = self._users()
             if user_name not in users:
                 return False, f"User '{user_name}' not found"
 
-            node.assigned_user = user_name
+            self._replace(nodes, node, assigned_user=user_name)
 
-            nodes[node_id] = node
-
-            self._save_nodes(nodes)
+            self._commit_nodes(nodes, {node_id: {'assigned_user': user_name}})
 
             return True, f"Node '{node_id}' started successfully"
 
@@ -184,13 +460,49 @@ class WavesLabRepository:
     def get_all_users(self) -> List[VirtualUser]:
         """Get all VirtualUsers."""
         with self._lock:
-            users = self._load_users()
+            users = self._users()
             return list(users.values())
 
     def get_user_by_username(self, username: str) -> Optional[VirtualUser]:
         """Get a VirtualUser by username."""
         with self._lock:
-            users = self._load_users()
+            users = self._users()
             return users.get(username)
 
-repository = WavesLabRepository()
\ No newline at end of file
+def default_data_dir() -> str:
+    """The ``WAVESLAB_DATA_DIR`` environment variable, then ``core/storage/``."""
+    return os.getenv("WAVESLAB_DATA_DIR") or "core/storage/"
+
+def create_repository(storage: Optional[str] = None, data_dir: Optional[str] = None):
+    """
+    Create a repository for the given storage mode.
+
+    Args:
+        storage: One of ``json``, ``memory``, ``journal`` or ``sqlite``. Defaults to the
+            ``WAVESLAB_STORAGE`` environment variable, then ``json``.
+        data_dir: Directory holding nodes.json and users.json. Defaults to the
+            ``WAVESLAB_DATA_DIR`` environment variable, then ``core/storage/``.
+
+    ``WAVESLAB_JOURNAL_FSYNC=1`` makes the journal backend fsync every append, and
+    ``WAVESLAB_SQLITE_PATH`` moves the SQLite database out of ``data_dir``.
+
+    Returns:
+        A repository exposing the WavesLabRepository interface
+    """
+    storage = (storage or os.getenv("WAVESLAB_STORAGE") or "json").lower()
+    data_dir = data_dir or default_data_dir()
+
+    if storage == "json":
+        return WavesLabRepository(data_dir)
+    if storage == "memory":
+        return WavesLabRepository(data_dir, in_memory=True)
+    if storage == "journal":
+        from core.storage.JournaledWavesLabRepository import JournaledWavesLabRepository
+        return JournaledWavesLabRepository(data_dir, fsync=os.getenv("WAVESLAB_JOURNAL_FSYNC") == "1")
+    if storage == "sqlite":
+        from core.storage.SqliteWavesLabRepository import SqliteWavesLabRepository
+        return SqliteWavesLabRepository(data_dir, db_path=os.getenv("WAVESLAB_SQLITE_PATH"))
+
+    raise ValueError(f"Unknown storage mode '{storage}'")
+
+repository = create_repository()
@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
+from core.model.WaveNode import WaveNode
+
+_EPOCH = datetime(1970, 1, 1)
+_MINUTES_PER_DAY = 24 * 60
+
+# Hourly multipliers (index = hour of day)
+FLAT = (1.0,) * 24
+RESIDENTIAL = (0.6, 0.55, 0.5, 0.5, 0.55, 0.7, 0.95, 1.2, 1.15, 1.0, 0.95, 0.95,
+               1.05, 1.0, 0.9, 0.9, 1.0, 1.15, 1.3, 1.35, 1.25, 1.05, 0.85, 0.7)
+COOLING = (0.7, 0.65, 0.6, 0.6, 0.6, 0.6, 0.65, 0.7, 0.8, 0.9, 1.0, 1.1,
+           1.2, 1.3, 1.35, 1.35, 1.3, 1.2, 1.1, 1.0, 0.9, 0.85, 0.8, 0.75)
+HEATING = (1.1, 1.05, 1.0, 1.0, 1.05, 1.2, 1.35, 1.3, 1.1, 0.95, 0.85, 0.8,
+           0.8, 0.8, 0.8, 0.85, 0.95, 1.1, 1.25, 1.3, 1.3, 1.25, 1.2, 1.15)
+
+
+def to_seconds(timestamp: datetime) -> float:
+    """Seconds since the epoch; naive timestamps are taken as they are, aware ones are converted to UTC."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH).total_seconds()
+
+
+@dataclass(frozen=True)
+class ConsumptionProfile:
+    """
+    Shape of a device's draw, as a fraction of its nominal ``real_time_consumption``.
+
+    The draw at a given time is ``ramp * duty * daily * noise``:
+
+    * ``ramp_up``: seconds to reach full draw after switching on (smoothstep curve)
+    * ``duty_on`` / ``duty_off``: seconds at full draw and at ``idle_level`` per cycle; no cycling when ``duty_off`` is 0
+    * ``daily_shape``: 24 hourly multipliers, interpolated per minute
+    * ``noise``: relative standard deviation of a multiplicative Gaussian noise
+    """
+    ramp_up: float = 0.0
+    duty_on: float = 0.0
+    duty_off: float = 0.0
+    idle_level: float = 0.0
+    daily_shape: Sequence[float] = FLAT
+    noise: float = 0.05
+
+    def ramp_table(self, length: int) -> np.ndarray:
+        t = np.arange(length, dtype=np.float64)
+        if self.ramp_up <= 0:
+            return np.ones(length)
+        x = np.clip(t / self.ramp_up, 0.0, 1.0)
+        return x * x * (3.0 - 2.0 * x)
+
+    @property
+    def period(self) -> int:
+        if self.duty_off <= 0:
+            return 1
+        return max(1, int(round(self.duty_on + self.duty_off)))
+
+    def duty_table(self, length: int) -> np.ndarray:
+        table = np.ones(length)
+        if self.duty_off > 0:
+            table[int(round(self.duty_on)):self.period] = self.idle_level
+        return table
+
+    def daily_table(self) -> np.ndarray:
+        hours = np.asarray(self.daily_shape, dtype=np.float64)
+        minutes = np.arange(_MINUTES_PER_DAY, dtype=np.float64)
+        # Hourly values are placed at the middle of each hour and wrapped around midnight
+        return np.interp(minutes, np.arange(24) * 60.0 + 30.0, hours, period=_MINUTES_PER_DAY)
+
+
+TYPE_PROFILES: Dict[NodeType, ConsumptionProfile] = {
+    NodeType.ELECTRICITY: ConsumptionProfile(ramp_up=5, daily_shape=RESIDENTIAL, noise=0.03),
+    NodeType.GAS: ConsumptionProfile(ramp_up=60, duty_on=600, duty_off=300, idle_level=0.3,
+                                     daily_shape=HEATING, noise=0.05),
+    NodeType.WATER: ConsumptionProfile(ramp_up=3, daily_shape=RESIDENTIAL, noise=0.1),
+}
+
+# Matched in order against the lower-cased node name; the first keyword found wins
+APPLIANCE_PROFILES: List[Tuple[str, ConsumptionProfile]] = [
+    ("refrigerator", ConsumptionProfile(ramp_up=5, duty_on=900, duty_off=1500, idle_level=0.05, noise=0.03)),
+    ("fridge", ConsumptionProfile(ramp_up=5, duty_on=900, duty_off=1500, idle_level=0.05, noise=0.03)),
+    ("oven", ConsumptionProfile(ramp_up=600, duty_on=300, duty_off=120, idle_level=0.1, noise=0.02)),
+    ("washing machine", ConsumptionProfile(ramp_up=60, duty_on=1200, duty_off=600, idle_level=0.2, noise=0.08)),
+    ("dishwasher", ConsumptionProfile(ramp_up=30, duty_on=600, duty_off=300, idle_level=0.1, noise=0.05)),
+    ("dryer", ConsumptionProfile(ramp_up=60, duty_on=900, duty_off=300, idle_level=0.2, noise=0.05)),
+    ("water heater", ConsumptionProfile(ramp_up=30, duty_on=1800, duty_off=1200, idle_level=0.02,
+                                        daily_shape=HEATING, noise=0.03)),
+    ("air conditioner", ConsumptionProfile(ramp_up=180, duty_on=1200, duty_off=600, idle_level=0.3,
+                                           daily_shape=COOLING, noise=0.04)),
+    ("boiler", ConsumptionProfile(ramp_up=120, duty_on=900, duty_off=600, idle_level=0.1,
+                                  daily_shape=HEATING, noise=0.05)),
+    ("fireplace", ConsumptionProfile(ramp_up=300, daily_shape=HEATING, noise=0.08)),
+    ("stove", ConsumptionProfile(ramp_up=10, daily_shape=RESIDENTIAL, noise=0.1)),
+    ("shower", ConsumptionProfile(ramp_up=5, daily_shape=RESIDENTIAL, noise=0.08)),
+    ("faucet", ConsumptionProfile(ramp_up=1, daily_shape=RESIDENTIAL, noise=0.15)),
+    ("sprinkler", ConsumptionProfile(ramp_up=10, daily_shape=COOLING, noise=0.05)),
+]
+
+
+def profile_for(node: WaveNode) -> ConsumptionProfile:
+    """The appliance profile matching the node's name, or the default profile of its type."""
+    name = node.name.lower()
+    for keyword, profile in APPLIANCE_PROFILES:
+        if keyword in name:
+            return profile
+    return TYPE_PROFILES[node.node_type]
+
+
+class ConsumptionModel:
+    """
+    Vectorized evaluator of consumption profiles for a fixed set of nodes.
+
+    Every distinct profile is precomputed once into three lookup tables (ramp-up by
+    seconds since switch-on, duty cycle by second of the cycle, daily shape by minute
+    of the day), so evaluating any number of nodes at any number of timestamps is a
+    handful of NumPy gathers. Duty cycles get a random per-node phase so identical
+    appliances do not cycle in lockstep. The model tracks when each node was switched
+    on from the active sets it is shown via ``observe``; nodes already on when the
+    model is built are taken as fully ramped up.
+    """
+
+    def __init__(self, nodes: Iterable[WaveNode], rng: Optional[np.random.Generator] = None):
+        """
+        Args:
+            nodes: Nodes to model, in the order used by the index-based methods
+            rng: Random generator for duty-cycle phases and noise; defaults to an unseeded ``np.random.default_rng()``
+        """
+        nodes = list(nodes)
+        self.rng = rng or np.random.default_rng()
+        self.index: Dict[str, int] = {node.id: i for i, node in enumerate(nodes)}
+
+        profiles: List[ConsumptionProfile] = []
+        codes: Dict[ConsumptionProfile, int] = {}
+        profile_of = []
+        for node in nodes:
+            profile = profile_for(node)
+            if profile not in codes:
+                codes[profile] = len(profiles)
+                profiles.append(profile)
+            profile_of.append(codes[profile])
+
+        ramp_length = int(max((np.ceil(p.ramp_up) for p in profiles), default=0)) + 1
+        duty_length = max((p.period for p in profiles), default=1)
+        self._ramp = np.stack([p.ramp_table(ramp_length) for p in profiles]) if profiles else np.ones((0, 1))
+        self._duty = np.stack([p.duty_table(duty_length) for p in profiles]) if profiles else np.ones((0, 1))
+        self._daily = np.stack([p.daily_table() for p in profiles]) if profiles else np.ones((0, _MINUTES_PER_DAY))
+        periods = np.array([p.period for p in profiles], dtype=np.int64)
+        noises = np.array([p.noise for p in profiles], dtype=np.float64)
+
+        self.profile = np.array(profile_of, dtype=np.intp)
+        self.nominal = np.array([node.real_time_consumption for node in nodes], dtype=np.float64)
+        self.period = periods[self.profile] if len(nodes) else np.ones(0, dtype=np.int64)
+        self.noise = noises[self.profile] if len(nodes) else np.zeros(0)
+        self.phase = self.rng.integers(0, np.maximum(self.period, 1)) if len(nodes) else np.zeros(0, dtype=np.int64)
+
+        self.on = np.array([node.status == NodeStatus.ON for node in nodes], dtype=bool)
+        self.on_since = np.full(len(nodes), -np.inf)
+
+    def __len__(self) -> int:
+        return len(self.nominal)
+
+    def indices_of(self, nodes: Iterable[WaveNode]) -> np.ndarray:
+        """Positions of ``nodes`` in the model; -1 for nodes it does not know."""
+        return np.fromiter((self.index.get(node.id, -1) for node in nodes), dtype=np.intp)
+
+    def observe(self, seconds: float, status: np.ndarray):
+        """Record the switch-on time of every node that is on in ``status`` but was off before."""
+        switched_on = status & ~self.on
+        self.on_since[switched_on] = seconds
+        self.on = status.copy()
+
+    def evaluate(self, seconds: Union[float, np.ndarray], indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draw of the nodes at ``indices`` (all nodes by default) at ``seconds``, assuming they are on.
+
+        ``seconds`` is a scalar or an array; an array of shape ``(steps, 1)`` yields a
+        ``(steps, len(indices))`` matrix, one row per timestamp.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        seconds = np.asarray(seconds, dtype=np.float64)
+        profile = self.profile[indices]
+        whole = np.floor(seconds).astype(np.int64)
+
+        elapsed = np.clip(seconds - self.on_since[indices], 0, self._ramp.shape[1] - 1).astype(np.intp)
+        cycle = (whole + self.phase[indices]) % self.period[indices]
+        minute = (whole // 60) % _MINUTES_PER_DAY
+
+        values = self.nominal[indices] * self._ramp[profile, elapsed] * self._duty[profile, cycle] \
+            * self._daily[profile, minute]
+        noise = self.rng.standard_normal(values.shape) * self.noise[indices]
+        return np.maximum(values * (1.0 + noise), 0.0)
+
+    def evaluate_known(self, seconds: Union[float, np.ndarray], indices: np.ndarray,
+                       static: np.ndarray) -> np.ndarray:
+        """Like ``evaluate``, but positions of -1 (nodes unknown to the model) take their ``static`` value."""
+        known = indices >= 0
+        if known.all():
+            return self.evaluate(seconds, indices)
+        values = self.evaluate(seconds, np.where(known, indices, 0))
+        return np.where(known, values, static)
+
+    def observe_active(self, seconds: float, indices: np.ndarray):
+        """``observe`` with the active set given as model positions (-1 entries are ignored)."""
+        status = np.zeros(len(self), dtype=bool)
+        status[indices[indices >= 0]] = True
+        self.observe(seconds, status)
+
+    def consumption_for(self, active_nodes: Sequence[WaveNode], timestamp: datetime) -> Dict[str, float]:
+        """
+        Observe ``active_nodes`` as the current active set and return their draw at ``timestamp`` by node id.
+
+        Nodes unknown to the model keep their static ``real_time_consumption``.
+        """
+        seconds = to_seconds(timestamp)
+        indices = self.indices_of(active_nodes)
+        self.observe_active(seconds, indices)
+
+        static = np.array([node.real_time_consumption for node in active_nodes], dtype=np.float64)
+        values = self.evaluate_known(seconds, indices, static).tolist()
+        return dict(zip((node.id for node in active_nodes), values))
+
+    @classmethod
+    def from_repository(cls, repository, **kwargs) -> "ConsumptionModel":
+        return cls(repository.get_all_nodes(), **kwargs)
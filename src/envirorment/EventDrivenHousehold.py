@@ -0,0 +1,105 @@
+import heapq
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from envirorment.Household import Household
+from envirorment.SwitchSchedule import ScheduleRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class EventDrivenHousehold(Household):
+    """
+    Household where every node switches at its own time instead of in periodic batches.
+
+    Each node's next switch is drawn from a Poisson process whose rate follows the
+    day/night boundaries of Household: on average ``day_devices_to_switch`` (by day) or
+    ``night_devices_to_switch`` (by night) switches per ``switch_interval`` across the
+    household, as in the batch model. Pending switches live in a heap, so a tick only
+    pops the events that are due, O(events * log n), and reads the due nodes in one
+    repository call; ``next_switch_time`` lets offline engines jump straight to the next
+    event. Nodes are scheduled on the first tick; nodes added to the repository
+    afterwards are not switched.
+    """
+
+    def __init__(self, repository, switch_interval_minutes=5, rng: Optional[random.Random] = None,
+                 recorder: Optional[ScheduleRecorder] = None):
+        super().__init__(repository, switch_interval_minutes, rng=rng, recorder=recorder)
+        self._events: List[Tuple[datetime, int, str]] = []
+        self._sequence = 0
+        self._day_rate = 0.0
+        self._night_rate = 0.0
+        self._scheduled = False
+
+    def tick(self, current_timestamp: datetime):
+        self.start_recording(current_timestamp)
+        if not self._scheduled:
+            self._schedule_all(current_timestamp)
+
+        due = []
+        while self._events and self._events[0][0] <= current_timestamp:
+            _, _, node_id = heapq.heappop(self._events)
+            due.append(node_id)
+            # Drawn after this tick, so a node switches at most once per tick and is not popped again
+            self._push(self.draw_next_switch(current_timestamp), node_id)
+
+        if not due:
+            return
+
+        self.last_switch_time = current_timestamp
+        if self.recorder:
+            self.recorder.record(current_timestamp, due)
+
+        self.switch_nodes_by_id(due, current_timestamp)
+
+    def next_switch_time(self) -> Optional[datetime]:
+        return self._events[0][0] if self._events else None
+
+    def draw_next_switch(self, after: datetime) -> Optional[datetime]:
+        """
+        Next switch time of one node after ``after``, following the day and night rates;
+        None when both rates are 0 and the node never switches.
+        """
+        if self._day_rate <= 0 and self._night_rate <= 0:
+            return None
+
+        # Exponential "work" consumed at the day or night rate, segment by segment
+        remaining = self.rng.expovariate(1.0)
+        current = after
+        while True:
+            rate = self._day_rate if self.is_daytime(current) else self._night_rate
+            boundary = self._next_boundary(current)
+            span = (boundary - current).total_seconds()
+            if rate > 0 and remaining <= rate * span:
+                return max(current + timedelta(seconds=remaining / rate), after + timedelta(microseconds=1))
+            remaining -= rate * span
+            current = boundary
+
+    def _next_boundary(self, timestamp: datetime) -> datetime:
+        midnight = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        for hour in sorted((self.day_start_hour, self.night_start_hour)):
+            boundary = midnight + timedelta(hours=hour)
+            if boundary > timestamp:
+                return boundary
+        return midnight + timedelta(days=1, hours=min(self.day_start_hour, self.night_start_hour))
+
+    def _schedule_all(self, current_timestamp: datetime):
+        node_ids = sorted(node.id for node in self.repository.get_all_nodes())
+        self._scheduled = True
+        if not node_ids:
+            logger.warning(f"[{current_timestamp}] No devices found in repository")
+            return
+
+        interval = self.switch_interval.total_seconds()
+        self._day_rate = self.day_devices_to_switch / (len(node_ids) * interval)
+        self._night_rate = self.night_devices_to_switch / (len(node_ids) * interval)
+        for node_id in node_ids:
+            self._push(self.draw_next_switch(current_timestamp), node_id)
+
+    def _push(self, timestamp: Optional[datetime], node_id: str):
+        if timestamp is None:
+            return
+        self._sequence += 1
+        heapq.heappush(self._events, (timestamp, self._sequence, node_id))
@@ -1,19 +1,29 @@
+import logging
 import random
 from datetime import datetime, timedelta
+from typing import Optional
 
 from core.model.NodeStatus import NodeStatus
+from envirorment.SwitchSchedule import ScheduleRecorder
+
+logger = logging.getLogger(__name__)
 
 
 class Household:
-    def __init__(self, repository, switch_interval_minutes=5):
+    def __init__(self, repository, switch_interval_minutes=5, rng: Optional[random.Random] = None,
+                 recorder: Optional[ScheduleRecorder] = None):
         """
         Initialize the household simulator.
 
         Args:
             repository: WavesLabRepository instance
             switch_interval_minutes: How many simulated minutes between device switches
+            rng: Random generator picking the devices to switch; pass ``random.Random(seed)`` for reproducible runs
+            recorder: When given, every switch is appended to its schedule file
         """
         self.repository = repository
+        self.rng = rng or random.Random()
+        self.recorder = recorder
         self.switch_interval = timedelta(minutes=switch_interval_minutes)
         self.last_switch_time = None
         self.cycle = 0
@@ -55,41 +65,67 @@ class Household:
 
         return False
 
+    def next_switch_time(self) -> Optional[datetime]:
+        """Simulated time of the next device switch, once the first tick has happened."""
+        if self.last_switch_time is None:
+            return None
+        return self.last_switch_time + self.switch_interval
+
     def switch_random_devices(self, current_timestamp: datetime):
         """Switch a random selection of devices."""
-        # Get all nodes from the repository
-        all_nodes = self.repository.get_all_nodes()
+        # Get all nodes from the repository, in a backend-independent order so seeded runs pick the same devices
+        all_nodes = sorted(self.repository.get_all_nodes(), key=lambda node: node.id)
 
         if not all_nodes:
-            print(f"[{current_timestamp}] Warning: No devices found in repository")
+            logger.warning(f"[{current_timestamp}] No devices found in repository")
             return
 
         # Select random devices to switch
         num_to_switch = min(self.get_num_devices_to_switch(current_timestamp), len(all_nodes))
-        selected_nodes = random.sample(all_nodes, num_to_switch)
+        selected_nodes = self.rng.sample(all_nodes, num_to_switch)
+
+        if self.recorder:
+            self.recorder.record(current_timestamp, [node.id for node in selected_nodes])
 
+        self.switch_devices(selected_nodes, current_timestamp)
 
+    def switch_nodes_by_id(self, node_ids, current_timestamp: datetime):
+        """Switch the devices with the given ids, fetched in one repository read; unknown ids are skipped."""
+        wanted = set(node_ids)
+        selected_nodes = [node for node in self.repository.get_all_nodes() if node.id in wanted]
+        self.switch_devices(selected_nodes, current_timestamp)
+
+    def switch_devices(self, selected_nodes, current_timestamp: datetime):
+        """Switch the given devices; those that were on are queued as shutdown readings."""
         self.cycle += 1
-        print(f"\n[{current_timestamp}] === Cycle {self.cycle} ===")
-        print(f"[{current_timestamp}] Switching {num_to_switch} random devices:")
+        logger.debug(f"[{current_timestamp}] Cycle {self.cycle}: switching {len(selected_nodes)} devices")
 
         nodes_to_shutdown = []
 
         for node in selected_nodes:
             if node.status == NodeStatus.ON:
-                copia_nodo = node
-                copia_nodo.real_time_consumption = 0
-                nodes_to_shutdown.append(copia_nodo)
-            try:
-                self.repository.switch_node(node.id)
-            except Exception as e:
-                print(f"[{current_timestamp}] - Failed to switch {node.name}: {e}")
+                # A copy: repository nodes are shared and read-only
+                nodes_to_shutdown.append(node.model_copy(update={'real_time_consumption': 0}))
+
+        # One bulk call, so file-backed repositories persist the whole cycle once
+        try:
+            result = self.repository.switch_nodes(node.id for node in selected_nodes)
+            for node_id in result.missing:
+                logger.warning(f"[{current_timestamp}] Failed to switch {node_id}: not found")
+        except Exception as e:
+            logger.error(f"[{current_timestamp}] Failed to switch {len(selected_nodes)} devices: {e}")
+
+        self.nodes_to_shutdown.extend(nodes_to_shutdown)
 
-        self.nodes_to_shutdown = nodes_to_shutdown
 
+    def start_recording(self, current_timestamp: datetime):
+        """On the first tick, start the schedule from the household as it is before any switch."""
+        if self.recorder and not self.recorder.started:
+            self.recorder.begin(current_timestamp, sorted(self.repository.get_all_nodes(), key=lambda node: node.id))
 
     def tick(self, current_timestamp: datetime):
         """Called on each simulation tick to check if devices should be switched."""
+        self.start_recording(current_timestamp)
         if self.should_switch_devices(current_timestamp):
             self.switch_random_devices(current_timestamp)
 
@@ -0,0 +1,216 @@
+import json
+import os
+import random
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+
+from core.model.NodeType import NodeType
+from core.model.WaveNode import slugify
+
+DEFAULT_ENDPOINT = "http://127.0.0.1:3002/api/internal/measurements?smart_furniture_hookup_id={index}"
+
+RESIDENT_NAMES = ("alice", "bob", "charlie", "diana", "erin", "frank", "grace", "heidi", "ivan", "judy",
+                  "mallory", "niaj", "olivia", "peggy", "rupert", "sybil", "trent", "victor", "wendy", "zoe")
+
+
+@dataclass(frozen=True)
+class Appliance:
+    """A device a household may have, with the range of its nominal consumption."""
+    name: str
+    node_type: NodeType
+    low: float
+    high: float
+    probability: float = 1.0
+    max_count: int = 1
+
+
+# Names follow nodes.json, so ConsumptionProfiles recognizes the appliances. Probabilities and
+# counts give about 8 electricity, 8 water and 1.5 gas nodes per household.
+APPLIANCES: Tuple[Appliance, ...] = (
+    Appliance("Refrigerator", NodeType.ELECTRICITY, 0.1, 0.4),
+    Appliance("Electric Oven", NodeType.ELECTRICITY, 1.0, 2.5, 0.7),
+    Appliance("Washing Machine (Electric)", NodeType.ELECTRICITY, 0.5, 1.2, 0.85),
+    Appliance("Electric Water Heater", NodeType.ELECTRICITY, 1.2, 2.0, 0.35),
+    Appliance("Air Conditioner", NodeType.ELECTRICITY, 0.8, 1.8, 0.5, 3),
+    Appliance("Electric Dryer", NodeType.ELECTRICITY, 1.5, 3.0, 0.3),
+    Appliance("Television", NodeType.ELECTRICITY, 0.05, 0.2, 0.9, 2),
+    Appliance("Lights", NodeType.ELECTRICITY, 0.05, 0.3, 1.0, 4),
+    Appliance("Gas Boiler", NodeType.GAS, 0.4, 1.0, 0.55),
+    Appliance("Gas Stove", NodeType.GAS, 0.2, 0.5, 0.45),
+    Appliance("Gas Water Heater", NodeType.GAS, 0.8, 1.5, 0.25),
+    Appliance("Gas Fireplace", NodeType.GAS, 0.5, 1.0, 0.1),
+    Appliance("Gas Dryer", NodeType.GAS, 1.0, 2.0, 0.1),
+    Appliance("Shower", NodeType.WATER, 0.3, 0.8, 1.0, 3),
+    Appliance("Kitchen Faucet", NodeType.WATER, 0.5, 2.0),
+    Appliance("Bathroom Faucet", NodeType.WATER, 0.3, 1.2, 1.0, 3),
+    Appliance("Toilet", NodeType.WATER, 0.1, 0.3, 1.0, 3),
+    Appliance("Dishwasher", NodeType.WATER, 1.5, 3.0, 0.6),
+    Appliance("Washing Machine (Water)", NodeType.WATER, 0.3, 0.8, 0.85),
+    Appliance("Garden Sprinkler", NodeType.WATER, 1.0, 2.0, 0.35),
+)
+
+
+class HouseholdGenerator:
+    """
+    Generates synthetic households: residents (VirtualUsers) and their appliances (WaveNodes).
+
+    Each household ``n`` gets 1 to ``max_residents`` residents named ``<name>-<n>`` and an
+    appliance mix drawn from APPLIANCES. Nodes are named ``House <n> <Appliance> [<k>]``
+    and their id is the slug of that name, as WaveNode would derive it. Nodes are produced
+    as dicts in the nodes.json format, one household at a time, so datasets of millions of
+    nodes are written without holding them in memory. The same seed gives the same dataset.
+    """
+
+    def __init__(self, seed: Optional[int] = None, endpoint: str = DEFAULT_ENDPOINT, active_fraction: float = 0.3,
+                 assigned_fraction: float = 0.5, max_residents: int = 4):
+        """
+        Args:
+            seed: Seed of every random draw
+            endpoint: Endpoint template; ``{id}``, ``{index}`` (running node number), ``{house}`` and
+                ``{type}`` (lower-case node type) are substituted
+            active_fraction: Probability of a node starting switched on
+            assigned_fraction: Probability of a node being assigned to one of its household's residents
+            max_residents: Largest number of residents in a household
+        """
+        # Fails here rather than on the first node if the template has an unknown placeholder
+        endpoint.format(id="", index=0, house=0, type="")
+        self.rng = random.Random(seed)
+        self.endpoint = endpoint
+        self.active_fraction = active_fraction
+        self.assigned_fraction = assigned_fraction
+        self.max_residents = max_residents
+        self.index = 0
+
+    def household(self, house: int) -> Tuple[List[str], List[dict]]:
+        """Usernames and nodes of household number ``house``."""
+        rng = self.rng
+        residents = [f"{name}-{house}" for name in rng.sample(RESIDENT_NAMES, rng.randint(1, self.max_residents))]
+
+        nodes = []
+        for appliance in APPLIANCES:
+            if rng.random() >= appliance.probability:
+                continue
+            count = rng.randint(1, appliance.max_count)
+            for k in range(1, count + 1):
+                name = f"House {house} {appliance.name}" + (f" {k}" if count > 1 else "")
+                node_id = slugify(name)
+                self.index += 1
+                nodes.append({
+                    'name': name,
+                    'id': node_id,
+                    'node_type': appliance.node_type.name,
+                    'status': "ON" if rng.random() < self.active_fraction else "OFF",
+                    'real_time_consumption': round(rng.uniform(appliance.low, appliance.high), 2),
+                    'endpoint': self.endpoint.format(id=node_id, index=self.index, house=house,
+                                                     type=appliance.node_type.name.lower()),
+                    'assigned_user': rng.choice(residents) if rng.random() < self.assigned_fraction else None,
+                })
+        return residents, nodes
+
+    def generate(self, nodes: Optional[int] = None, households: Optional[int] = None
+                 ) -> Iterator[Tuple[List[str], List[dict]]]:
+        """
+        Households, one at a time, until ``households`` were generated or ``nodes`` nodes
+        (the last household is cut short to hit the count exactly).
+        """
+        if (nodes is None) == (households is None):
+            raise ValueError("Give either a node count or a household count")
+
+        remaining = nodes
+        house = 0
+        while (households is None or house < households) and (remaining is None or remaining > 0):
+            house += 1
+            users, house_nodes = self.household(house)
+            if remaining is not None:
+                house_nodes = house_nodes[:remaining]
+                remaining -= len(house_nodes)
+            yield users, house_nodes
+
+
+class _JsonArrayWriter:
+    """Writes a JSON array one item at a time."""
+
+    def __init__(self, fp: IO[str]):
+        self.fp = fp
+        self.count = 0
+        fp.write("[")
+
+    def write(self, item: dict):
+        self.fp.write(",\n  " if self.count else "\n  ")
+        self.fp.write(json.dumps(item))
+        self.count += 1
+
+    def close(self):
+        self.fp.write("\n]\n" if self.count else "]\n")
+
+
+def existing_dataset(data_dir: str) -> List[Path]:
+    """
+    Files in ``data_dir`` a new dataset would replace or leave stale: the JSON files, the
+    SQLite database (only seeded from JSON while empty) and the journal (replayed over
+    nodes.json on startup).
+    """
+    path = Path(data_dir)
+    candidates = [path / "nodes.json", path / "users.json", path / "journal"]
+    candidates += sorted(path.glob("waveslab.db*"))
+    return [candidate for candidate in candidates if candidate.exists()]
+
+
+def _remove_stale(data_dir: str):
+    path = Path(data_dir)
+    for db_file in path.glob("waveslab.db*"):
+        db_file.unlink()
+    if (path / "journal").is_dir():
+        shutil.rmtree(path / "journal")
+
+
+def write_dataset(data_dir: str, generator: HouseholdGenerator, nodes: Optional[int] = None,
+                  households: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Write nodes.json and users.json into ``data_dir``, streaming one household at a time.
+
+    Both files are written next to their destination and renamed into place at the end,
+    so an interrupted run leaves any existing dataset untouched. Once they are in place,
+    the SQLite database and journal of the previous dataset are removed, so every
+    storage backend loads the new one.
+
+    Returns:
+        The number of nodes and users written
+    """
+    path = Path(data_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    nodes_tmp, users_tmp = path / "nodes.json.tmp", path / "users.json.tmp"
+
+    try:
+        with open(nodes_tmp, "w", encoding="utf-8") as nodes_fp, open(users_tmp, "w", encoding="utf-8") as users_fp:
+            node_writer, user_writer = _JsonArrayWriter(nodes_fp), _JsonArrayWriter(users_fp)
+            for users, house_nodes in generator.generate(nodes, households):
+                for username in users:
+                    user_writer.write({"username": username})
+                for node in house_nodes:
+                    node_writer.write(node)
+            node_writer.close()
+            user_writer.close()
+    except BaseException:
+        for tmp in (nodes_tmp, users_tmp):
+            tmp.unlink(missing_ok=True)
+        raise
+
+    os.replace(nodes_tmp, path / "nodes.json")
+    os.replace(users_tmp, path / "users.json")
+    _remove_stale(data_dir)
+    return node_writer.count, user_writer.count
+
+
+def write_node_lines(fp: IO[str], generator: HouseholdGenerator, nodes: Optional[int] = None,
+                     households: Optional[int] = None) -> int:
+    """Write nodes as JSON Lines (one object per line) to ``fp``, e.g. for piping; returns the count."""
+    count = 0
+    for _, house_nodes in generator.generate(nodes, households):
+        for node in house_nodes:
+            fp.write(json.dumps(node))
+            fp.write("\n")
+        count += len(house_nodes)
+    return count
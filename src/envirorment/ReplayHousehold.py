@@ -0,0 +1,71 @@
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from core.model.NodeStatus import NodeStatus
+from envirorment.EventDrivenHousehold import EventDrivenHousehold
+from envirorment.Household import Household
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
+
+
+class ReplayHousehold(Household):
+    """
+    Household that re-drives a recorded switch schedule instead of switching at random.
+
+    The first tick restores the recorded initial active set and is mapped to the
+    schedule start; after that, a tick at ``t`` applies every switch recorded up to
+    ``(t - first tick) * speed`` into the schedule. ``speed`` only matters when ticks
+    follow the wall clock: 10 replays a recorded real-time run ten times faster.
+    """
+
+    def __init__(self, repository, schedule: SwitchSchedule, speed: float = 1.0):
+        super().__init__(repository)
+        self.schedule = schedule
+        self.speed = speed
+        self._origin: Optional[datetime] = None
+        self._next_event = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._next_event >= len(self.schedule.events)
+
+    def tick(self, current_timestamp: datetime):
+        if self._origin is None:
+            self._origin = current_timestamp
+            self._restore_initial_state()
+
+        elapsed = (current_timestamp - self._origin).total_seconds() * self.speed
+        events = self.schedule.events
+        while self._next_event < len(events) and events[self._next_event].offset <= elapsed:
+            event = events[self._next_event]
+            self._next_event += 1
+            self.last_switch_time = current_timestamp
+
+            self.switch_nodes_by_id(event.node_ids, current_timestamp)
+
+    def next_switch_time(self) -> Optional[datetime]:
+        if self._origin is None or self.finished:
+            return None
+        offset = self.schedule.events[self._next_event].offset
+        return self._origin + timedelta(seconds=offset / self.speed)
+
+    def _restore_initial_state(self):
+        recorded = set(self.schedule.node_ids)
+        active = set(self.schedule.initially_active)
+        self.repository.switch_nodes(
+            node.id for node in self.repository.get_all_nodes()
+            if node.id in recorded and (node.status == NodeStatus.ON) != (node.id in active)
+        )
+
+
+def create_household(repository, switch_interval_minutes: int = 5, seed: Optional[int] = None,
+                     recorder: Optional[ScheduleRecorder] = None, schedule: Optional[SwitchSchedule] = None,
+                     speed: float = 1.0, event_driven: bool = False) -> Household:
+    """
+    A ReplayHousehold when ``schedule`` is given, otherwise a Household (or an
+    EventDrivenHousehold when ``event_driven``) seeded with ``seed``.
+    """
+    if schedule is not None:
+        return ReplayHousehold(repository, schedule, speed)
+    household_class = EventDrivenHousehold if event_driven else Household
+    return household_class(repository, switch_interval_minutes, rng=random.Random(seed), recorder=recorder)
@@ -0,0 +1,115 @@
+import gzip
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import IO, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.model.NodeStatus import NodeStatus
+from core.model.WaveNode import WaveNode
+
+SCHEDULE_FORMAT = "waveslab-schedule"
+SCHEDULE_VERSION = 1
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class SwitchEvent(NamedTuple):
+    """Devices switched together, ``offset`` simulated seconds after the schedule start."""
+    offset: float
+    node_ids: Tuple[str, ...]
+
+
+@dataclass
+class SwitchSchedule:
+    """
+    A recorded household run: the initial active set and every device switch.
+
+    On disk (gzip'd when the path ends in ``.gz``) the first line is a JSON header with
+    the seed, the start time, the node ids and the positions of the nodes initially on;
+    every following line is a compact JSON array ``[offset, position, position, ...]``.
+    """
+    start: datetime
+    node_ids: List[str]
+    initially_active: List[str]
+    seed: Optional[int] = None
+    events: List[SwitchEvent] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> "SwitchSchedule":
+        with _open(path, "r") as handle:
+            header = json.loads(handle.readline())
+            if header.get("format") != SCHEDULE_FORMAT:
+                raise ValueError(f"{path} is not a switch schedule")
+            if header.get("version") != SCHEDULE_VERSION:
+                raise ValueError(f"Unsupported switch schedule version {header.get('version')} in {path}")
+
+            node_ids = header["nodes"]
+            schedule = cls(
+                start=datetime.fromisoformat(header["start"]),
+                node_ids=node_ids,
+                initially_active=[node_ids[i] for i in header["active"]],
+                seed=header.get("seed"),
+            )
+            for line in handle:
+                if not line.strip():
+                    continue
+                offset, *positions = json.loads(line)
+                schedule.events.append(SwitchEvent(offset, tuple(node_ids[i] for i in positions)))
+        return schedule
+
+
+class ScheduleRecorder:
+    """
+    Appends the switches of a household run to a schedule file, one line per switch.
+
+    The household calls ``begin`` on its first tick with every node, so the header holds
+    the active set at the start of the run and offsets count from that tick, which is
+    where ReplayHousehold anchors the replay. Lines are flushed as they are written so an
+    interrupted run still leaves a usable schedule.
+    """
+
+    def __init__(self, path: str, seed: Optional[int] = None):
+        self.path = path
+        self.seed = seed
+        self._handle: Optional[IO[str]] = None
+        self._start: Optional[datetime] = None
+        self._positions = {}
+
+    @property
+    def started(self) -> bool:
+        """Whether ``begin`` has written the header."""
+        return self._handle is not None
+
+    def record(self, timestamp: datetime, switched_ids: Sequence[str]):
+        """Append the devices switched at ``timestamp``."""
+        if self._handle is None:
+            raise RuntimeError("ScheduleRecorder.begin() must be called before recording switches")
+
+        offset = round((timestamp - self._start).total_seconds(), 3)
+        positions = [self._positions[node_id] for node_id in switched_ids if node_id in self._positions]
+        self._handle.write(json.dumps([offset, *positions], separators=(",", ":")) + "\n")
+        self._handle.flush()
+
+    def begin(self, timestamp: datetime, nodes: Sequence[WaveNode]):
+        """Write the header: the run starts at ``timestamp`` with ``nodes`` in their current state."""
+        self._start = timestamp
+        self._positions = {node.id: i for i, node in enumerate(nodes)}
+        header = {
+            "format": SCHEDULE_FORMAT,
+            "version": SCHEDULE_VERSION,
+            "seed": self.seed,
+            "start": timestamp.isoformat(),
+            "nodes": [node.id for node in nodes],
+            "active": [i for i, node in enumerate(nodes) if node.status == NodeStatus.ON],
+        }
+        self._handle = _open(self.path, "w")
+        self._handle.write(json.dumps(header, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if self._handle:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.model.NodeReading import NodeReading
+from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
+from core.model.WaveNode import WaveNode
+from envirorment.ConsumptionProfiles import ConsumptionModel, to_seconds
+
+NODE_TYPES = list(NodeType)
+
+
+class VectorizedHousehold:
+    """
+    Household state engine holding node state in NumPy arrays.
+
+    Follows the same rules as Household (a random batch of devices is switched every
+    ``switch_interval_minutes``, more of them by day than by night), but status,
+    consumption, type and assigned user are columns indexed by node position, so
+    switching, consumption updates and active-mask extraction are single array
+    operations over the whole household instead of per-WaveNode Python calls.
+    State lives only in memory; ``to_nodes()`` converts it back to WaveNodes.
+    """
+
+    def __init__(self, nodes: Iterable[WaveNode], switch_interval_minutes: int = 5,
+                 rng: Optional[np.random.Generator] = None, consumption_model: Optional[ConsumptionModel] = None):
+        """
+        Args:
+            nodes: Initial nodes, copied into arrays
+            switch_interval_minutes: How many simulated minutes between device switches
+            rng: Random generator; defaults to an unseeded ``np.random.default_rng()``
+            consumption_model: Profiles evaluated every tick for the active nodes, built over the same nodes in
+                the same order; without it active nodes draw their static consumption
+        """
+        nodes = list(nodes)
+        self.rng = rng or np.random.default_rng()
+        self.consumption_model = consumption_model
+        self.switch_interval = timedelta(minutes=switch_interval_minutes)
+        self.last_switch_time = None
+        self.cycle = 0
+
+        # Day and night device counts
+        self.day_devices_to_switch = 5
+        self.night_devices_to_switch = 3
+
+        # Time boundaries
+        self.day_start_hour = 6
+        self.night_start_hour = 21
+
+        usernames = sorted({node.assigned_user for node in nodes if node.assigned_user})
+        user_codes: Dict[str, int] = {name: i for i, name in enumerate(usernames)}
+
+        self.ids = np.array([node.id for node in nodes], dtype=object)
+        self.names = np.array([node.name for node in nodes], dtype=object)
+        self.endpoints = np.array([node.endpoint or "" for node in nodes], dtype=object)
+        self.hookup_ids = np.array(
+            [(node.endpoint or "").split('smart_furniture_hookup_id=')[-1] for node in nodes], dtype=object
+        )
+        self.usernames = np.array(usernames + [None], dtype=object)
+        self.user = np.array([user_codes.get(node.assigned_user, -1) for node in nodes], dtype=np.int32)
+        self.node_type = np.array([NODE_TYPES.index(node.node_type) for node in nodes], dtype=np.int8)
+        self.status = np.array([node.status == NodeStatus.ON for node in nodes], dtype=bool)
+        self.base_consumption = np.array([node.real_time_consumption for node in nodes], dtype=np.float64)
+        self.consumption = np.zeros(len(nodes), dtype=np.float64)
+        self.update_consumption()
+
+        self.shutdown_indices = np.empty(0, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_repository(cls, repository, **kwargs) -> "VectorizedHousehold":
+        return cls(repository.get_all_nodes(), **kwargs)
+
+    # Same time rules as Household
+
+    def is_daytime(self, current_timestamp: datetime) -> bool:
+        """Check if current time is during daytime (6 AM to 9 PM)."""
+        return self.day_start_hour <= current_timestamp.hour < self.night_start_hour
+
+    def get_num_devices_to_switch(self, current_timestamp: datetime) -> int:
+        if self.is_daytime(current_timestamp):
+            return self.day_devices_to_switch
+        return self.night_devices_to_switch
+
+    def should_switch_devices(self, current_timestamp: datetime) -> bool:
+        if self.last_switch_time is None or current_timestamp - self.last_switch_time >= self.switch_interval:
+            self.last_switch_time = current_timestamp
+            return True
+        return False
+
+    # Vectorized state updates
+
+    def switch(self, indices: np.ndarray):
+        """Flip the status of the nodes at ``indices``; nodes turned off are queued as shutdown readings."""
+        self.shutdown_indices = indices[self.status[indices]]
+        self.status[indices] = ~self.status[indices]
+        self.consumption[indices] = np.where(self.status[indices], self.base_consumption[indices], 0.0)
+
+    def switch_random_devices(self, current_timestamp: datetime):
+        num_to_switch = min(self.get_num_devices_to_switch(current_timestamp), len(self))
+        if num_to_switch == 0:
+            return
+        self.cycle += 1
+        self.switch(self.rng.choice(len(self), size=num_to_switch, replace=False))
+
+    def update_consumption(self, values: Optional[np.ndarray] = None):
+        """Set the consumption of every node: ``values`` (or the static base) where on, 0 where off."""
+        source = self.base_consumption if values is None else values
+        np.multiply(source, self.status, out=self.consumption)
+
+    def tick(self, current_timestamp: datetime):
+        if self.should_switch_devices(current_timestamp):
+            self.switch_random_devices(current_timestamp)
+        if self.consumption_model is not None:
+            self.apply_profiles(current_timestamp)
+
+    def apply_profiles(self, current_timestamp: datetime):
+        """Set the consumption of the active nodes from the consumption model at ``current_timestamp``."""
+        seconds = to_seconds(current_timestamp)
+        self.consumption_model.observe(seconds, self.status)
+        active = self.active_indices()
+        self.consumption.fill(0.0)
+        self.consumption[active] = self.consumption_model.evaluate(seconds, active)
+
+    def active_mask(self) -> np.ndarray:
+        return self.status
+
+    def active_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.status)
+
+    def take_shutdown_indices(self) -> np.ndarray:
+        indices, self.shutdown_indices = self.shutdown_indices, np.empty(0, dtype=np.intp)
+        return indices
+
+    # Conversions
+
+    def readings(self, timestamp: datetime, indices: np.ndarray) -> List[NodeReading]:
+        """Readings of the nodes at ``indices`` with their current consumption."""
+        types = [NODE_TYPES[code].value for code in self.node_type[indices]]
+        return [
+            NodeReading(node_type, hookup_id, value, timestamp, username)
+            for node_type, hookup_id, value, username in zip(
+                types, self.hookup_ids[indices], self.consumption[indices].tolist(),
+                self.usernames[self.user[indices]]
+            )
+        ]
+
+    def to_nodes(self) -> List[WaveNode]:
+        return [
+            WaveNode(
+                id=self.ids[i],
+                name=self.names[i],
+                node_type=NODE_TYPES[self.node_type[i]],
+                endpoint=self.endpoints[i],
+                status=NodeStatus.ON if self.status[i] else NodeStatus.OFF,
+                real_time_consumption=float(self.base_consumption[i]),
+                assigned_user=self.usernames[self.user[i]]
+            )
+            for i in range(len(self))
+        ]
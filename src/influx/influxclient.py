@@ -1,12 +1,31 @@
+import asyncio
 import json
+import logging
 import os
 from datetime import datetime
+from time import perf_counter, sleep
+from typing import Iterable, List, Optional
 
 from dotenv import load_dotenv
-from influxdb_client import InfluxDBClient, Point
+from influxdb_client import InfluxDBClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
 
+from core.model.NodeReading import NodeReading
 from core.model.NodeType import NodeType
+from influx.lineprotocol import to_line_protocol
+from logs.LogPipeline import trace
+from metrics.MetricsRegistry import SIZE_BUCKETS, registry
+from sinks.ReadingSink import ReadingSink
+
+logger = logging.getLogger(__name__)
+
+INFLUX_BATCH_SIZE = registry.histogram("waveslab_influx_batch_size", "Points per Influx write batch",
+                                       buckets=SIZE_BUCKETS)
+INFLUX_WRITE_SECONDS = registry.histogram("waveslab_influx_write_seconds", "Duration of one Influx write attempt")
+INFLUX_POINTS = registry.counter("waveslab_influx_points_total", "Points handed to Influx, by outcome",
+                                 ("outcome",))
+INFLUX_RETRIES = registry.counter("waveslab_influx_retries_total", "Influx write attempts that failed and were retried")
+INFLUX_PENDING = registry.gauge("waveslab_influx_pending_flushes", "Influx batches being written")
 
 
 class InfluxDB:
@@ -18,6 +37,11 @@ class InfluxDB:
         self.client = InfluxDBClient(url=self.url, token=self.token, org=self.org)
         self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
 
+    def write_readings(self, readings: List[NodeReading]):
+        """Synchronously write a batch of readings in one request. Raises on failure."""
+        records = [to_line_protocol(reading) for reading in readings]
+        self.write_api.write(bucket=self.bucket, org=self.org, record=records, write_precision=WritePrecision.NS)
+
     def write_node_request(self, json_payload: str):
         """
         Writes a node measurement to InfluxDB from a JSON payload.
@@ -40,24 +64,140 @@ class InfluxDB:
             )
 
             self.write_api.write(bucket=self.bucket, org=self.org, record=point)
-            print("✅ Wrote point:", point)
+            if trace.isEnabledFor(logging.DEBUG):
+                trace.debug(f"Wrote point: {point}")
 
         except json.JSONDecodeError:
-            print("❌ Failed to decode JSON payload")
+            logger.error("Failed to decode JSON payload")
         except KeyError as e:
-            print(f"❌ Missing key in payload: {e}")
+            logger.error(f"Missing key in payload: {e}")
         except Exception as e:
-            print(f"❌ Error writing point: {e}")
+            logger.error(f"Error writing point: {e}")
+
+
+class InfluxBatchWriter(ReadingSink):
+    """
+    Buffers readings and writes them to InfluxDB in batches, off the event loop.
+
+    A batch is flushed when it reaches ``batch_size`` readings or every ``flush_interval``
+    seconds. Flushes run in a worker thread and are retried with exponential backoff;
+    at most ``max_pending_flushes`` run at once, after which ``write`` waits
+    (backpressure). ``stop()`` flushes everything still buffered.
+    """
+
+    def __init__(self, influx: InfluxDB, batch_size: int = 5000, flush_interval: float = 1.0,
+                 max_retries: int = 5, retry_backoff: float = 0.5, max_pending_flushes: int = 4):
+        self.influx = influx
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._buffer: List[NodeReading] = []
+        self._flush_slots = asyncio.Semaphore(max_pending_flushes)
+        self._pending = set()
+        self._timer: Optional[asyncio.Task] = None
+
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self):
+        self._timer = asyncio.create_task(self._flush_periodically())
+
+    async def write(self, readings: Iterable[NodeReading]):
+        self._buffer.extend(readings)
+        while len(self._buffer) >= self.batch_size:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:self.batch_size]
+            await self._submit(batch)
+
+    async def flush(self):
+        """Submit whatever is buffered and wait until every pending batch is written."""
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            await self._submit(batch)
+        if self._pending:
+            await asyncio.wait(set(self._pending))
+
+    async def stop(self):
+        if self._timer:
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+            self._timer = None
+        await self.flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._buffer:
+                batch, self._buffer = self._buffer, []
+                await self._submit(batch)
+
+    async def _submit(self, batch: List[NodeReading]):
+        INFLUX_BATCH_SIZE.observe(len(batch))
+        await self._flush_slots.acquire()
+        task = asyncio.create_task(asyncio.to_thread(self._write_with_retry, batch))
+        self._pending.add(task)
+        INFLUX_PENDING.set(len(self._pending))
+
+        def _done(t: asyncio.Task):
+            self._pending.discard(t)
+            self._flush_slots.release()
+            INFLUX_PENDING.set(len(self._pending))
+            # Counted here, on the event loop: several flush threads finish concurrently
+            if not t.cancelled() and t.exception() is None and t.result():
+                self.written += len(batch)
+            else:
+                self.dropped += len(batch)
+
+        task.add_done_callback(_done)
+
+    def _write_with_retry(self, batch: List[NodeReading]) -> bool:
+        """Write ``batch``, retrying with backoff; returns whether it was written."""
+        for attempt in range(self.max_retries + 1):
+            started = perf_counter()
+            try:
+                self.influx.write_readings(batch)
+                INFLUX_WRITE_SECONDS.observe(perf_counter() - started)
+                INFLUX_POINTS.labels("written").inc(len(batch))
+                return True
+            except Exception as e:
+                INFLUX_WRITE_SECONDS.observe(perf_counter() - started)
+                if attempt == self.max_retries:
+                    INFLUX_POINTS.labels("dropped").inc(len(batch))
+                    logger.error(f"Dropping {len(batch)} points after {attempt + 1} attempts: {e}")
+                    return False
+                INFLUX_RETRIES.inc()
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Influx write of {len(batch)} points failed ({e}), retrying in {delay:.1f}s")
+                sleep(delay)
 
 
 load_dotenv()
 
-influxDB =  InfluxDB(
-    os.getenv("INFLUX_URL"),
-    os.getenv("INFLUX_TOKEN"),
-    os.getenv("INFLUX_ORG"),
-    os.getenv("INFLUX_BUCKET")
-)
+_influx: Optional[InfluxDB] = None
+
+
+def get_influx() -> InfluxDB:
+    """The shared InfluxDB client, configured from the environment on first use."""
+    global _influx
+    if _influx is None:
+        _influx = InfluxDB(
+            os.getenv("INFLUX_URL"),
+            os.getenv("INFLUX_TOKEN"),
+            os.getenv("INFLUX_ORG"),
+            os.getenv("INFLUX_BUCKET")
+        )
+    return _influx
+
+
+def __getattr__(name: str):
+    # Keeps `from influx.influxclient import influxDB` working without connecting at import time
+    if name == "influxDB":
+        return get_influx()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
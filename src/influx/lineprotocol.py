@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+
+from core.model.NodeReading import NodeReading
+
+
+def _escape_measurement(value: str) -> str:
+    return value.replace(",", "\\,").replace(" ", "\\ ")
+
+
+def _escape_key(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _epoch_ns(timestamp: datetime) -> int:
+    # Naive timestamps are simulated UTC, as in the ISO "Z" payloads
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    seconds = int(timestamp.timestamp())
+    return seconds * 1_000_000_000 + timestamp.microsecond * 1_000
+
+
+def to_line_protocol(reading: NodeReading) -> str:
+    """Encode a reading as an Influx line protocol record with nanosecond precision."""
+    return (
+        f"{_escape_measurement(reading.node_type)},smartFurnitureHookupID={_escape_key(reading.hookup_id)} "
+        f"value={float(reading.value)!r} {_epoch_ns(reading.timestamp)}"
+    )
@@ -0,0 +1,160 @@
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from metrics.MetricsRegistry import registry
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Per-node tracing (every reading sent, every point written). Silent unless enabled with
+# WAVESLAB_TRACE=1, so hot paths should guard it with ``trace.isEnabledFor(logging.DEBUG)``.
+trace = logging.getLogger("waveslab.trace")
+
+# Libraries that log one line per request at INFO
+_CHATTY_LOGGERS = ("httpx", "httpcore")
+
+LOG_RECORDS_DROPPED = registry.counter("waveslab_log_records_dropped_total",
+                                       "Log records dropped because the log queue was full")
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most ``burst`` warnings or errors per call site through every ``period`` seconds.
+
+    A receiver that is down fails every node on every tick, each with its own log call;
+    past the burst, records from that line are dropped before they are even formatted.
+    The first record let through in the next period says how many were suppressed (also
+    available as its ``suppressed`` attribute). Records below ``level`` are not limited.
+    """
+
+    def __init__(self, burst: int = 5, period: float = 10.0, level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.level = level
+        # (path, line) -> [window start, records let through, records suppressed]
+        self._sites: Dict[Tuple[str, int], List[float]] = {}
+        self._lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or record.created - site[0] >= self.period:
+                suppressed = int(site[2]) if site else 0
+                self._sites[key] = [record.created, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                return True
+            else:
+                site[2] += 1
+                return False
+
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, plus any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Never blocks the caller: when the writer falls behind, records are dropped and counted."""
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[_DroppingQueueHandler] = None
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None, trace_nodes: Optional[bool] = None,
+                  max_queued: int = 10_000):
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Log calls only enqueue the record, so a slow terminal or pipe never stalls the event
+    loop. Warnings and errors are rate-limited per call site by RateLimitFilter.
+
+    Args:
+        level: Root level; defaults to ``WAVESLAB_LOG_LEVEL``, then INFO
+        fmt: ``text`` or ``json`` (one object per line); defaults to ``WAVESLAB_LOG_FORMAT``, then text
+        trace_nodes: Enable per-node tracing (and per-request httpx logs); defaults to ``WAVESLAB_TRACE=1``
+        max_queued: Records waiting for the writer beyond which new ones are dropped
+    """
+    global _listener, _handler
+
+    level = (level or os.getenv("WAVESLAB_LOG_LEVEL") or "INFO").upper()
+    fmt = (fmt or os.getenv("WAVESLAB_LOG_FORMAT") or "text").lower()
+    if trace_nodes is None:
+        trace_nodes = os.getenv("WAVESLAB_TRACE") == "1"
+
+    shutdown_logging()
+
+    writer = logging.StreamHandler()
+    writer.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    _handler = _DroppingQueueHandler(queue.Queue(max_queued))
+    _handler.addFilter(RateLimitFilter())
+    _listener = QueueListener(_handler.queue, writer, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+    trace.setLevel(logging.DEBUG if trace_nodes else logging.INFO)
+    for name in _CHATTY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.DEBUG if trace_nodes else logging.WARNING)
+
+
+def shutdown_logging():
+    """Write out every queued record and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_in_child():
+    # A forked worker (multi-household runner) inherits the handler but not the writer thread
+    global _listener
+    if _handler is not None and _listener is not None:
+        _handler.queue = queue.Queue(_handler.queue.maxsize)
+        _listener = QueueListener(_handler.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_in_child)
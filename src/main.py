@@ -1,6 +1,7 @@
 import logging
 
 import uvicorn
+from logs.LogPipeline import setup_logging
 from server.api import api
 
 logger = logging.getLogger(__name__)
@@ -8,5 +9,5 @@ logger = logging.getLogger(__name__)
 app = api.app
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    setup_logging()
     uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
\ No newline at end of file
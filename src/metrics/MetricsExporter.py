@@ -0,0 +1,53 @@
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from metrics.MetricsRegistry import CONTENT_TYPE, MetricsRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsExporter:
+    """
+    Serves ``GET /metrics`` from a background thread, for processes without the API server.
+
+    Scrapes are answered by their own thread rather than the event loop, so they keep
+    working (and show the stall) while a tick blocks the loop.
+    """
+
+    def __init__(self, port: int = 9464, host: str = "0.0.0.0", metrics: MetricsRegistry = registry):
+        self.port = port
+        self.host = host
+        self.metrics = metrics
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, name="waveslab-metrics", daemon=True)
+        self._thread.start()
+        logger.info(f"Serving metrics on http://{self.host}:{self._server.server_address[1]}/metrics")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
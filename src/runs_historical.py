@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+import click
+import numpy as np
+
+from core.storage.WavesLabRepository import repository
+from envirorment.ConsumptionProfiles import ConsumptionModel
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
+from logs.LogPipeline import setup_logging
+from metrics.MetricsExporter import MetricsExporter
+from simulation.FastForwardSimulation import FastForwardSimulation
+from simulation.HistoricalSimulation import DEFAULT_START, HistoricalSimulation
+from simulation.SimulationClock import ClockMode, SimulationClock
+from sinks.ReadingSink import SINK_KINDS, create_sink
+
+
+@click.command()
+@click.option('--sink', 'sink_kind', type=click.Choice(SINK_KINDS), default="influx", show_default=True,
+              help='Where the generated readings go')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default=None,
+              help='Output file for the file sinks (e.g. backfill.lp.gz, backfill.csv.gz, backfill.parquet)')
+@click.option('--start', type=click.DateTime(), default=DEFAULT_START.isoformat(), show_default=True,
+              help='First simulated timestamp')
+@click.option('--end', type=click.DateTime(), default=None, help='Last simulated timestamp (defaults to now)')
+@click.option('--step', type=float, default=20.0, show_default=True, help='Simulated seconds between readings')
+@click.option('--engine', type=click.Choice(["fast-forward", "stepwise"]), default="fast-forward", show_default=True,
+              help='fast-forward keeps the household in memory and generates whole windows at once; '
+                   'stepwise ticks through the shared repository like the original loop')
+@click.option('--profiles/--static', default=False, show_default=True,
+              help='Shape active nodes\' draw with per-appliance consumption profiles instead of static values')
+@click.option('--seed', type=int, default=None, help='Seed of device switching and consumption noise')
+@click.option('--record', type=click.Path(dir_okay=False), default=None,
+              help='Write the device switch schedule to this file (gzip\'d for .gz paths)')
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='Replay a recorded switch schedule instead of switching devices at random')
+@click.option('--clock', type=click.Choice([mode.value for mode in ClockMode]), default=ClockMode.MAX.value,
+              show_default=True, help='Pacing of the stepwise engine: max speed, wall clock, or wall clock x --speed')
+@click.option('--speed', type=float, default=60.0, show_default=True,
+              help='Simulated seconds per second with --clock scaled')
+@click.option('--switching', type=click.Choice(["batch", "event"]), default="batch", show_default=True,
+              help='batch switches a random group of devices every interval; event gives every device its own '
+                   'switch times, letting fast-forward jump from one event to the next')
+@click.option('--metrics-port', type=int, default=None,
+              help='Serve Prometheus metrics (tick timings, Influx batches, ...) on this port while running')
+def backfill(sink_kind: str, output: str, start: datetime, end: datetime, step: float, engine: str, profiles: bool,
+             seed: Optional[int], record: Optional[str], replay: Optional[str], clock: str, speed: float,
+             switching: str, metrics_port: Optional[int]):
+    """
+    Generate historical readings.
+
+    Examples:
+        python runs_historical.py
+        python runs_historical.py --sink lineprotocol -o backfill.lp.gz --start 2025-01-01 --end 2026-01-01
+        python runs_historical.py --seed 42 --record schedule.jsonl.gz
+    """
+    if metrics_port:
+        MetricsExporter(metrics_port).start()
+
+    schedule = SwitchSchedule.load(replay) if replay else None
+    if schedule and seed is None:
+        seed = schedule.seed
+    recorder = ScheduleRecorder(record, seed) if record else None
+
+    sink = create_sink(sink_kind, output)
+    model = ConsumptionModel.from_repository(repository, rng=np.random.default_rng(seed)) if profiles else None
+    options = dict(consumption_model=model, seed=seed, recorder=recorder, schedule=schedule,
+                   event_driven=switching == "event")
+    if engine == "fast-forward":
+        asyncio.run(FastForwardSimulation(repository, sink, start, end, timedelta(seconds=step), **options).run())
+    else:
+        asyncio.run(HistoricalSimulation(sink, start, end, timedelta(seconds=step),
+                                         clock=SimulationClock(ClockMode(clock), speed, start), **options).start())
+
+
+if __name__ == "__main__":
+    setup_logging()
+    backfill()
@@ -0,0 +1,40 @@
+import os
+
+import click
+
+from core.storage.WavesLabRepository import repository
+from logs.LogPipeline import setup_logging
+from simulation.MultiHouseholdRunner import DEFAULT_ENDPOINT, MultiHouseholdRunner
+
+
+@click.command()
+@click.option('--households', '-n', type=int, default=10, show_default=True, help='Number of simulated households')
+@click.option('--workers', '-w', type=int, default=os.cpu_count() or 1, show_default=True,
+              help='Worker processes the households are sharded across')
+@click.option('--duration', type=float, default=60.0, show_default=True, help='Wall-clock seconds to run for')
+@click.option('--interval', type=float, default=5.0, show_default=True, help='Seconds between two household ticks')
+@click.option('--seed', type=int, default=0, show_default=True, help='Base RNG seed; household i uses seed + i')
+@click.option('--endpoint', default=DEFAULT_ENDPOINT, show_default=True,
+              help='Endpoint template, formatted with {household} and {node}')
+@click.option('--profiles/--static', default=False, show_default=True,
+              help='Shape active nodes\' draw with per-appliance consumption profiles instead of static values')
+def multi(households: int, workers: int, duration: float, interval: float, seed: int, endpoint: str,
+          profiles: bool):
+    """
+    Simulate many households at once, using the stored nodes as the template of each household.
+
+    Examples:
+        python runs_multi.py -n 100 -w 8 --duration 120
+    """
+    runner = MultiHouseholdRunner(
+        repository.get_all_nodes(), households, workers, interval=interval, endpoint=endpoint, seed=seed,
+        profiles=profiles,
+        max_in_flight=int(os.getenv("WAVESLAB_MAX_IN_FLIGHT", "200")),
+        max_per_host=int(os.getenv("WAVESLAB_MAX_PER_HOST", "20"))
+    )
+    runner.run(duration)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    multi()
@@ -1,8 +1,57 @@
 import asyncio
 import logging
+import os
+from datetime import datetime
 
+import numpy as np
+
+from core.storage.WavesLabRepository import repository
+from envirorment.ConsumptionProfiles import ConsumptionModel
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
+from logs.LogPipeline import setup_logging
+from metrics.MetricsExporter import MetricsExporter
+from simulation.DeltaFilter import DeltaFilter
+from simulation.HttpDispatcher import HttpDispatcher
 from simulation.RealTimeSimulation import RealTimeSimulation
+from simulation.SimulationClock import ClockMode, SimulationClock
+from simulation.TickScheduler import OverrunPolicy
 
 if __name__ == "__main__":
+    setup_logging()
     logger = logging.getLogger(__name__)
-    asyncio.run(RealTimeSimulation().start())
\ No newline at end of file
+    dispatcher = HttpDispatcher(
+        max_in_flight=int(os.getenv("WAVESLAB_MAX_IN_FLIGHT", "200")),
+        max_per_host=int(os.getenv("WAVESLAB_MAX_PER_HOST", "20"))
+    )
+    batch_size = int(os.getenv("WAVESLAB_BATCH_SIZE", "0"))
+    overrun_policy = OverrunPolicy(os.getenv("WAVESLAB_OVERRUN_POLICY", "skip"))
+
+    seed = int(os.environ["WAVESLAB_SEED"]) if os.getenv("WAVESLAB_SEED") else None
+    schedule = SwitchSchedule.load(os.environ["WAVESLAB_REPLAY"]) if os.getenv("WAVESLAB_REPLAY") else None
+    if schedule and seed is None:
+        seed = schedule.seed
+    recorder = ScheduleRecorder(os.environ["WAVESLAB_RECORD"], seed) if os.getenv("WAVESLAB_RECORD") else None
+
+    clock = SimulationClock(
+        ClockMode(os.getenv("WAVESLAB_CLOCK", "real")),
+        speed=float(os.getenv("WAVESLAB_CLOCK_SPEED", "60")),
+        start=datetime.fromisoformat(os.environ["WAVESLAB_CLOCK_START"]) if os.getenv("WAVESLAB_CLOCK_START") else None
+    )
+
+    delta = None
+    if os.getenv("WAVESLAB_DELTA") == "1":
+        delta = DeltaFilter(heartbeat_ticks=int(os.getenv("WAVESLAB_HEARTBEAT_TICKS", "12")),
+                            tolerance=float(os.getenv("WAVESLAB_DELTA_TOLERANCE", "0")))
+
+    if os.getenv("WAVESLAB_METRICS_PORT"):
+        MetricsExporter(int(os.environ["WAVESLAB_METRICS_PORT"])).start()
+
+    consumption_model = None
+    if os.getenv("WAVESLAB_PROFILES") == "1":
+        consumption_model = ConsumptionModel.from_repository(repository, rng=np.random.default_rng(seed))
+    asyncio.run(RealTimeSimulation(dispatcher, batch_size=batch_size, overrun_policy=overrun_policy,
+                                   consumption_model=consumption_model, seed=seed, recorder=recorder,
+                                   schedule=schedule,
+                                   replay_speed=float(os.getenv("WAVESLAB_REPLAY_SPEED", "1")),
+                                   clock=clock, event_driven=os.getenv("WAVESLAB_SWITCHING") == "event",
+                                   delta=delta).start())
\ No newline at end of file
@@ -0,0 +1,26 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from core.model.NodeStatus import NodeStatus
+from core.model.WaveNode import WaveNode
+
+
+class BulkNodeUpdate(BaseModel):
+    """Model for updating many WaveNodes in one API call."""
+    endpoints: Dict[str, str] = Field(default_factory=dict, description="New endpoint URL by node ID")
+    switch: List[str] = Field(default_factory=list, description="IDs of the nodes to switch")
+    status: Optional[NodeStatus] = Field(None, description="Status to set on the switched nodes; toggles them if omitted")
+    assign: List[str] = Field(default_factory=list, description="IDs of the nodes to assign to assigned_user")
+    assigned_user: Optional[str] = Field(None, description="Username assigned to the nodes in assign")
+
+    @model_validator(mode="after")
+    def check_assignment(self) -> "BulkNodeUpdate":
+        if self.assign and not self.assigned_user:
+            raise ValueError("assigned_user is required when assign is given")
+        return self
+
+
+class BulkNodeUpdateResult(BaseModel):
+    """Nodes changed by a bulk update and the requested IDs that do not exist."""
+    updated: List[WaveNode]
+    missing: List[str]
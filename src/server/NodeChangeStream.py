@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from core.model.WaveNode import WaveNode
+from core.storage.AsyncRepository import AsyncRepository
+
+logger = logging.getLogger(__name__)
+
+# Fields whose changes are streamed. Consumption readings go to the node endpoints and
+# are never written back to the repository, so real_time_consumption is not among them.
+TRACKED_FIELDS = ("status", "endpoint", "assigned_user")
+
+
+def diff_nodes(previous: Dict[str, WaveNode], current: Dict[str, WaveNode]) -> List[dict]:
+    """Change events turning ``previous`` into ``current``."""
+    events = []
+    for node_id, node in current.items():
+        old = previous.get(node_id)
+        if old is None:
+            events.append({"type": "added", "id": node_id, "node": node.model_dump(mode="json")})
+            continue
+        changed = [field for field in TRACKED_FIELDS if getattr(old, field) != getattr(node, field)]
+        if changed:
+            events.append({"type": "changed", "id": node_id, "fields": changed, "node": node.model_dump(mode="json")})
+    for node_id, old in previous.items():
+        if node_id not in current:
+            events.append({"type": "removed", "id": node_id, "node": old.model_dump(mode="json")})
+    return events
+
+
+class NodeSubscription:
+    """
+    One client's view of the change stream: its filters and a bounded queue of pending events.
+
+    A client that falls more than ``max_pending`` events behind loses them: the queue is
+    emptied and replaced by a single ``resync`` event, telling the client to re-fetch
+    the nodes it follows before reading on. A slow consumer therefore costs bounded
+    memory and never slows down the broadcaster or other clients.
+    """
+
+    def __init__(self, node_types: Iterable[str] = (), node_ids: Iterable[str] = (), max_pending: int = 1000):
+        self.node_types: Set[str] = set(node_types)
+        self.node_ids: Set[str] = set(node_ids)
+        self.queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self.dropped = 0
+
+    def matches(self, node: dict) -> bool:
+        if self.node_types and node["node_type"] not in self.node_types:
+            return False
+        return not self.node_ids or node["id"] in self.node_ids
+
+    def offer(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.dropped += 1
+            self.queue.put_nowait({"type": "resync"})
+
+    async def sse(self, keepalive: float = 15.0) -> AsyncIterator[str]:
+        """Pending events formatted as server-sent events, with a comment line every ``keepalive`` seconds."""
+        sequence = 0
+        while True:
+            try:
+                event = await asyncio.wait_for(self.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            sequence += 1
+            yield f"id: {sequence}\nevent: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class NodeChangeBroadcaster:
+    """
+    Watches the repository and fans node changes out to subscribers.
+
+    Nodes are also switched by other processes (the simulation, the CLI), so one
+    background task polls the repository's ``get_version()`` token every
+    ``poll_interval`` seconds and, only when it moved, reloads the nodes off the event
+    loop and diffs them against the previous snapshot. The task runs while at least one
+    client is subscribed.
+    """
+
+    def __init__(self, repository: AsyncRepository, poll_interval: float = 0.5, max_pending: int = 1000):
+        self._repository = repository
+        self.poll_interval = poll_interval
+        self.max_pending = max_pending
+        self._subscribers: Set[NodeSubscription] = set()
+        self._snapshot: Dict[str, WaveNode] = {}
+        self._version: Optional[str] = None
+        self._watcher: Optional[asyncio.Task] = None
+        # Held while the watcher starts, so concurrent first subscribers start only one
+        self._starting = asyncio.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self, node_types: Iterable[str] = (), node_ids: Iterable[str] = ()) -> NodeSubscription:
+        """Register a client; its first event is a ``snapshot`` of the nodes matching its filters."""
+        async with self._starting:
+            if self._watcher is None or self._watcher.done():
+                await self._reload()
+                self._watcher = asyncio.create_task(self._watch())
+
+        subscription = NodeSubscription(node_types, node_ids, self.max_pending)
+        nodes = [node.model_dump(mode="json") for node in self._snapshot.values()]
+        subscription.offer({"type": "snapshot", "nodes": [node for node in nodes if subscription.matches(node)]})
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NodeSubscription):
+        self._subscribers.discard(subscription)
+        if not self._subscribers and self._watcher:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def publish(self, events: List[dict]):
+        for event in events:
+            for subscription in self._subscribers:
+                if subscription.matches(event["node"]):
+                    subscription.offer(event)
+
+    async def _reload(self) -> List[dict]:
+        self._version = await self._repository.get_version()
+        nodes = await self._repository.get_all_nodes()
+        current = {node.id: node for node in nodes}
+        events = diff_nodes(self._snapshot, current)
+        self._snapshot = current
+        return events
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                version = await self._repository.get_version()
+                if version != self._version:
+                    self.publish(await self._reload())
+            except Exception as e:
+                logger.error(f"Error watching node changes: {e}")
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from pydantic_core import to_json
+
+from core.model.WaveNode import WaveNode
+from core.storage.AsyncRepository import AsyncRepository
+from metrics.MetricsRegistry import registry
+
+CACHE_REQUESTS = registry.counter("waveslab_api_cache_requests_total",
+                                  "Read requests served from the response cache (hit) or rebuilt (miss)", ("result",))
+
+
+class CachedResponse(NamedTuple):
+    """A serialized JSON body and its strong ETag."""
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies of read endpoints, rebuilt only when the repository changes.
+
+    Every entry remembers the repository ``get_version()`` it was built at; a request
+    served from a different version rebuilds it, so mutations made by this process or,
+    for the JSON and SQLite backends, by other processes invalidate it. The ETag is a
+    hash of the body, so equal bodies keep their ETag across rebuilds.
+
+    All endpoints are derived from one shared snapshot of the nodes per version, and
+    concurrent requests needing the same snapshot or entry wait for a single build
+    instead of each reading the repository. Repository reads and serialization run in
+    worker threads, off the event loop.
+    """
+
+    def __init__(self, repository: AsyncRepository):
+        self._repository = repository
+        self._entries: Dict[str, Tuple[str, CachedResponse]] = {}
+        self._snapshot: Optional[Tuple[str, Dict[str, WaveNode]]] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def snapshot(self, version: Optional[str] = None) -> Dict[str, WaveNode]:
+        """Nodes by id at ``version`` (the current one by default), loaded once per version."""
+        if version is None:
+            version = await self._repository.get_version()
+        if self._snapshot and self._snapshot[0] == version:
+            return self._snapshot[1]
+
+        async def load():
+            nodes = await self._repository.get_all_nodes()
+            self._snapshot = (version, {node.id: node for node in nodes})
+            return self._snapshot[1]
+
+        return await self._single_flight(("snapshot", version), load)
+
+    async def get(self, key: str, select: Callable[[Dict[str, WaveNode]], Any]) -> Optional[CachedResponse]:
+        """
+        The cached response for ``key``, built from ``select(snapshot)`` if missing or stale.
+
+        Returns None, without caching anything, when ``select`` returns None.
+        """
+        version = await self._repository.get_version()
+        entry = self._entries.get(key)
+        if entry and entry[0] == version:
+            self.hits += 1
+            CACHE_REQUESTS.labels("hit").inc()
+            return entry[1]
+
+        async def build():
+            self.misses += 1
+            CACHE_REQUESTS.labels("miss").inc()
+            value = select(await self.snapshot(version))
+            if value is None:
+                return None
+            body = await asyncio.to_thread(to_json, value)
+            response = CachedResponse(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+            self._entries[key] = (version, response)
+            return response
+
+        return await self._single_flight((key, version), build)
+
+    async def _single_flight(self, key: Hashable, build: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(build())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a client disconnecting does not cancel the build other requests wait on
+        return await asyncio.shield(future)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
@@ -1,11 +1,19 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 import logging
 from fastapi.middleware.cors import CORSMiddleware
+from core.model.NodeStatus import NodeStatus
+from core.model.NodeType import NodeType
 from core.model.WaveNode import WaveNode
-from core.storage.WavesLabRepository import repository
+from core.storage.AsyncRepository import AsyncRepository
+from core.storage.WavesLabRepository import repository as default_repository
+from metrics.MetricsRegistry import CONTENT_TYPE, registry
+from server.BulkNodeUpdate import BulkNodeUpdate, BulkNodeUpdateResult
+from server.NodeChangeStream import NodeChangeBroadcaster
 from server.NodeUpdate import NodeUpdate
+from server.ResponseCache import CachedResponse, ResponseCache, etag_matches
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +21,17 @@ logger = logging.getLogger(__name__)
 class WaveLabAPI:
     """WavesLab API application wrapper."""
 
-    def __init__(self):
+    def __init__(self, repository=None):
         """
         Initialize the WavesLab API application.
+
+        Args:
+            repository: Repository serving the nodes; defaults to the shared repository
         """
-        self.repo = repository
+        # Repository calls block on file or database I/O, so handlers go through the thread-offloading facade
+        self.repo = AsyncRepository(repository or default_repository)
+        self.cache = ResponseCache(self.repo)
+        self.changes = NodeChangeBroadcaster(self.repo)
         self.app = FastAPI(
             title="WavesLab API",
             description="REST API for WavesLab household simulation environment",
@@ -36,6 +50,14 @@ class WaveLabAPI:
 
         self._setup_routes()
 
+    @staticmethod
+    def _cached_response(request: Request, cached: CachedResponse) -> Response:
+        """Serve a cached body, or 304 Not Modified when the client already has it."""
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
     def _setup_routes(self):
         """Set up all API routes."""
 
@@ -47,23 +69,25 @@ class WaveLabAPI:
                 "version": "1.0.0",
                 "endpoints": {
                     "nodes": "/api/wave-nodes",
-                    "specific_node": "/api/wave-nodes/{slug}"
+                    "specific_node": "/api/wave-nodes/{slug}",
+                    "node_changes": "/api/nodes/stream"
                 }
             }
 
         @self.app.get("/api/wave-nodes", response_model=List[WaveNode], summary="Get all WaveNodes")
-        async def get_all_wave_nodes():
+        async def get_all_wave_nodes(request: Request):
             """
             Retrieve all WaveNodes in the system.
 
             Returns a list of all WaveNodes with their current status and configuration.
+            The response carries an ETag; send it back in If-None-Match to get 304 while nothing changed.
             """
-            nodes = self.repo.get_all_nodes()
-            logger.info(f"Retrieved {len(nodes)} wave nodes")
-            return nodes
+            cached = await self.cache.get("nodes", lambda nodes: list(nodes.values()))
+            logger.info("Retrieved wave nodes")
+            return self._cached_response(request, cached)
 
         @self.app.get("/api/wave-nodes/{slug}", response_model=WaveNode, summary="Get specific WaveNode")
-        async def get_wave_node(slug: str):
+        async def get_wave_node(slug: str, request: Request):
             """
             Retrieve details of a specific WaveNode by its ID (slug).
 
@@ -76,14 +100,14 @@ class WaveLabAPI:
             Raises:
                 HTTPException: 404 if the node is not found
             """
-            node = self.repo.get_node_by_id(slug)
+            cached = await self.cache.get(f"node:{slug}", lambda nodes: nodes.get(slug))
 
-            if not node:
+            if not cached:
                 logger.warning(f"Node with ID '{slug}' not found")
                 raise HTTPException(status_code=404, detail=f"WaveNode with ID '{slug}' not found")
 
             logger.info(f"Retrieved node '{slug}' details")
-            return node
+            return self._cached_response(request, cached)
 
         @self.app.patch("/api/wave-nodes/{slug}", response_model=WaveNode, summary="Update WaveNode endpoint")
         async def update_wave_node(slug: str, update: NodeUpdate):
@@ -100,13 +124,13 @@ class WaveLabAPI:
             """
 
             # Validate the node exists
-            node = self.repo.get_node_by_id(slug)
+            node = await self.repo.get_node_by_id(slug)
             if not node:
                 logger.warning(f"Node with ID '{slug}' not found for update")
                 raise HTTPException(status_code=404, detail=f"WaveNode with ID '{slug}' not found")
 
             # Update the endpoint
-            updated_node = self.repo.update_node_endpoint(slug, update.endpoint_url)
+            updated_node = await self.repo.update_node_endpoint(slug, update.endpoint_url)
 
             if not updated_node:
                 logger.error(f"Failed to update node '{slug}'")
@@ -115,17 +139,94 @@ class WaveLabAPI:
             logger.info(f"Updated node '{slug}' endpoint to '{update.endpoint_url}'")
             return updated_node
 
+        @self.app.patch("/api/wave-nodes", response_model=BulkNodeUpdateResult, summary="Update many WaveNodes")
+        async def update_wave_nodes(update: BulkNodeUpdate):
+            """
+            Update many WaveNodes in one call: set endpoints, switch nodes and assign a user.
+
+            Each kind of change is applied to all its nodes at once and persisted once,
+            instead of once per node as with PATCH /api/wave-nodes/{slug}. Unknown IDs are
+            skipped and listed in ``missing``; the other nodes are still updated.
+
+            Args:
+                update: BulkNodeUpdate with endpoints by node ID, nodes to switch and nodes to assign
+
+            Returns:
+                The updated nodes and the IDs that were not found
+
+            Raises:
+                HTTPException: 404 if assigned_user does not exist; nothing is changed then
+            """
+            # Assignment first: it is the only change that can be rejected, and then nothing has been applied yet
+            steps = []
+            if update.assign:
+                steps.append(lambda: self.repo.assign_user_to_nodes(update.assign, update.assigned_user))
+            if update.endpoints:
+                steps.append(lambda: self.repo.update_nodes_endpoint(update.endpoints))
+            if update.switch:
+                steps.append(lambda: self.repo.switch_nodes(update.switch, update.status))
+
+            updated = {}
+            missing = {}
+            for step in steps:
+                result = await step()
+                if result.error:
+                    logger.warning(f"Bulk update rejected: {result.error}")
+                    raise HTTPException(status_code=404, detail=result.error)
+                updated.update((node.id, node) for node in result.nodes)
+                missing.update(dict.fromkeys(result.missing))
+
+            logger.info(f"Bulk updated {len(updated)} nodes ({len(missing)} not found)")
+            return BulkNodeUpdateResult(updated=list(updated.values()), missing=list(missing))
+
         @self.app.get("/api/nodes/active", response_model=List[WaveNode], summary="Get active WaveNodes")
-        async def get_active_wave_nodes():
+        async def get_active_wave_nodes(request: Request):
             """
             Retrieve all currently active (status='on') WaveNodes.
 
             This is a convenience endpoint to get only the nodes that are currently
-            sending HTTP requests to their endpoints.
+            sending HTTP requests to their endpoints. Supports ETag / If-None-Match like /api/wave-nodes.
+            """
+            cached = await self.cache.get(
+                "active", lambda nodes: [node for node in nodes.values() if node.status == NodeStatus.ON]
+            )
+            logger.info("Retrieved active nodes")
+            return self._cached_response(request, cached)
+
+        @self.app.get("/api/nodes/stream", summary="Stream WaveNode changes")
+        async def stream_node_changes(
+                node_type: Optional[List[NodeType]] = Query(None, alias="type", description="Only nodes of these types"),
+                node_id: Optional[List[str]] = Query(None, alias="id", description="Only these nodes")):
+            """
+            Stream node changes as server-sent events over one long-lived connection.
+
+            The first event is a ``snapshot`` of the matching nodes; after that, ``changed``
+            events carry the node and the fields that changed (status, endpoint, assigned_user),
+            plus ``added`` and ``removed``. A client that falls too far behind receives a
+            ``resync`` event and should re-fetch the nodes it follows.
+
+            Filter with ``?type=ELECTRICITY&type=GAS`` and/or ``?id=refrigerator``.
             """
-            active_nodes = self.repo.get_active_nodes()
-            logger.info(f"Retrieved {len(active_nodes)} active nodes")
-            return active_nodes
+            subscription = await self.changes.subscribe(
+                [t.value for t in node_type or ()], node_id or ()
+            )
+            logger.info(f"Node change stream opened ({self.changes.subscribers} subscribers)")
+
+            async def events():
+                try:
+                    async for event in subscription.sse():
+                        yield event
+                finally:
+                    self.changes.unsubscribe(subscription)
+                    logger.info(f"Node change stream closed ({self.changes.subscribers} subscribers)")
+
+            return StreamingResponse(events(), media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+        @self.app.get("/metrics", summary="Prometheus metrics")
+        async def metrics():
+            """Metrics of this process in the Prometheus text format (repository timings, cache hits, ...)."""
+            return Response(content=registry.render(), media_type=CONTENT_TYPE)
 
         @self.app.get("/health", summary="Health check endpoint")
         async def health_check():
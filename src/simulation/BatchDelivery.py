@@ -0,0 +1,112 @@
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core.model.WaveNode import WaveNode
+from server.NodeRequest import NodeRequest
+from simulation.HttpDispatcher import HttpDispatcher
+
+logger = logging.getLogger(__name__)
+
+HOOKUP_ID_PARAM = "smart_furniture_hookup_id"
+
+# Answers meaning "this endpoint does not take a JSON array"
+_BATCH_UNSUPPORTED = {400, 404, 405, 415, 422, 501}
+
+
+def split_endpoint(url: str) -> Tuple[str, Optional[str]]:
+    """Split an endpoint URL into its base (without the hookup id parameter) and the hookup id."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    hookup_id = next((value for key, value in query if key == HOOKUP_ID_PARAM), None)
+    rest = urlencode([(key, value) for key, value in query if key != HOOKUP_ID_PARAM])
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, rest, parts.fragment)), hookup_id
+
+
+class BatchDelivery:
+    """
+    Coalesces the readings of nodes sharing an endpoint base into one request per tick.
+
+    Nodes whose endpoints differ only in the ``smart_furniture_hookup_id`` query parameter
+    are grouped, and each group is POSTed to the base URL as a JSON array of at most
+    ``max_batch_size`` items; every item is the usual NodeRequest body plus its
+    ``smart_furniture_hookup_id``. When a receiver rejects an array (400, 404, 405, 415,
+    422 or 501) its base is remembered and its nodes fall back to one request each.
+    """
+
+    def __init__(self, dispatcher: HttpDispatcher, max_batch_size: int = 500):
+        self.dispatcher = dispatcher
+        self.max_batch_size = max_batch_size
+        self._unsupported: Set[str] = set()
+
+    async def deliver(self, nodes: List[WaveNode], build: Callable[[WaveNode], NodeRequest],
+                      send_single: Callable[[WaveNode], Awaitable[bool]],
+                      on_failed: Optional[Callable[[WaveNode], None]] = None) -> Tuple[int, int]:
+        """
+        Send the readings of ``nodes``, batched where possible.
+
+        Args:
+            nodes: Nodes to report
+            build: Builds the NodeRequest of a node
+            send_single: Per-node delivery used for unbatchable nodes and as fallback
+            on_failed: Called for every node of a failed batch (``send_single`` reports its own failures)
+
+        Returns:
+            The number of nodes delivered and failed
+        """
+        groups: Dict[str, List[Tuple[WaveNode, str]]] = defaultdict(list)
+        singles: List[WaveNode] = []
+
+        for node in nodes:
+            base, hookup_id = split_endpoint(node.endpoint)
+            if hookup_id is None or base in self._unsupported:
+                singles.append(node)
+            else:
+                groups[base].append((node, hookup_id))
+
+        chunks = [
+            (base, members[i:i + self.max_batch_size])
+            for base, members in groups.items()
+            for i in range(0, len(members), self.max_batch_size)
+        ]
+        counts = {"ok": 0, "failed": 0}
+
+        def batch_failed(members: List[Tuple[WaveNode, str]]):
+            counts["failed"] += len(members)
+            if on_failed:
+                for node, _ in members:
+                    on_failed(node)
+
+        async def send_chunk(chunk: Tuple[str, List[Tuple[WaveNode, str]]]) -> bool:
+            base, members = chunk
+            payload = [
+                {HOOKUP_ID_PARAM: hookup_id, **build(node).model_dump(mode='json')}
+                for node, hookup_id in members
+            ]
+            response = await self.dispatcher.post(base, json=payload, headers={"Content-Type": "application/json"})
+
+            if response.status_code in _BATCH_UNSUPPORTED:
+                logger.info(f"Endpoint {base} rejected a batch (HTTP {response.status_code}), sending per node")
+                self._unsupported.add(base)
+                # Sent after the batches: dispatching from here would wait on the slot this task holds
+                singles.extend(node for node, _ in members)
+            elif 200 <= response.status_code < 300:
+                counts["ok"] += len(members)
+            else:
+                logger.warning(f"Batch of {len(members)} readings to {base} failed: HTTP {response.status_code}")
+                batch_failed(members)
+            return True
+
+        async def send_chunk_safely(chunk) -> bool:
+            try:
+                return await send_chunk(chunk)
+            except Exception as e:
+                logger.warning(f"Error sending batch of {len(chunk[1])} readings to {chunk[0]}: {e}")
+                batch_failed(chunk[1])
+                return False
+
+        await self.dispatcher.dispatch(chunks, send_chunk_safely)
+        ok, failed = await self.dispatcher.dispatch(singles, send_single)
+
+        return counts["ok"] + ok, counts["failed"] + failed
@@ -0,0 +1,63 @@
+import zlib
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from core.model.WaveNode import WaveNode
+
+
+class DeltaFilter:
+    """
+    Decides which readings are worth sending: only those whose value changed.
+
+    The last value sent is tracked per node and endpoint, so re-pointing a node also
+    re-sends its reading. A value counts as changed when it moves by more than
+    ``tolerance``. Every ``heartbeat_ticks`` ticks each node is sent even if unchanged,
+    so consumers can tell a steady node from a silent one; heartbeats are staggered by
+    node id to spread them over the period instead of bursting on one tick (0 disables
+    them). A reading that fails to deliver is ``forget``-ed and sent again next tick:
+    the node is kept as pending and added to the next ``select``, so a shutdown reading
+    is retried even though the node is no longer active. A newer reading of the same
+    node passed to ``select`` replaces the pending one.
+    """
+
+    def __init__(self, heartbeat_ticks: int = 12, tolerance: float = 0.0):
+        self.heartbeat_ticks = heartbeat_ticks
+        self.tolerance = tolerance
+        self._last_sent: Dict[Tuple[str, str], float] = {}
+        # Nodes whose last selected reading was not delivered, by node id
+        self._pending: Dict[str, WaveNode] = {}
+        self._tick = 0
+        self.sent = 0
+        self.suppressed = 0
+
+    def select(self, nodes: Iterable[WaveNode], value_of: Callable[[WaveNode], float]) -> List[WaveNode]:
+        """Advance one tick and return the nodes among ``nodes`` whose reading must be sent."""
+        self._tick += 1
+        nodes = list(nodes)
+        if self._pending:
+            for node in nodes:
+                self._pending.pop(node.id, None)
+            nodes += self._pending.values()
+            self._pending = {}
+
+        selected = []
+        for node in nodes:
+            key = (node.id, node.endpoint)
+            value = value_of(node)
+            last = self._last_sent.get(key)
+            if last is None or abs(value - last) > self.tolerance or self._heartbeat_due(node.id):
+                self._last_sent[key] = value
+                selected.append(node)
+            else:
+                self.suppressed += 1
+        self.sent += len(selected)
+        return selected
+
+    def forget(self, node: WaveNode):
+        """Mark the reading of ``node`` as not delivered, so it is selected again next tick."""
+        self._last_sent.pop((node.id, node.endpoint), None)
+        self._pending[node.id] = node
+
+    def _heartbeat_due(self, node_id: str) -> bool:
+        if self.heartbeat_ticks <= 0:
+            return False
+        return (self._tick + zlib.crc32(node_id.encode())) % self.heartbeat_ticks == 0
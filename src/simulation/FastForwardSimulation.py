@@ -0,0 +1,158 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from core.model.NodeReading import NodeReading
+from core.model.WaveNode import WaveNode
+from core.storage.MemoryNodeStore import MemoryNodeStore
+from envirorment.ConsumptionProfiles import ConsumptionModel, to_seconds
+from envirorment.ReplayHousehold import create_household
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
+from sinks.ReadingSink import ReadingSink
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FastForwardStats:
+    """Progress of a fast-forward run."""
+    simulated_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    readings: int = 0
+    windows: int = 0
+
+    @property
+    def speed(self) -> float:
+        """Simulated seconds per wall-clock second."""
+        return self.simulated_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+class FastForwardSimulation:
+    """
+    Offline historical generator that runs as fast as the sink accepts readings.
+
+    Produces the same readings as HistoricalSimulation (one per active node every
+    ``step``, plus a zero reading for nodes switched off), but keeps the household
+    in a MemoryNodeStore and does not touch the repository. Between two household
+    switches the active set cannot change, so the readings of a whole window are
+    generated in one pass and emitted in batches of about ``batch_size``.
+    """
+
+    def __init__(self, repository, sink: ReadingSink, start: datetime, end: Optional[datetime] = None,
+                 step: timedelta = timedelta(seconds=20), switch_interval_minutes: int = 15,
+                 batch_size: int = 50_000, report_every: float = 5.0,
+                 consumption_model: Optional[ConsumptionModel] = None, seed: Optional[int] = None,
+                 recorder: Optional[ScheduleRecorder] = None, schedule: Optional[SwitchSchedule] = None,
+                 event_driven: bool = False):
+        """
+        Args:
+            repository: Source of the initial nodes and users (only read once)
+            sink: Destination of the readings
+            start: First simulated timestamp
+            end: Simulated timestamp to stop at (exclusive); defaults to now
+            step: Simulated time between two readings of a node
+            switch_interval_minutes: Simulated minutes between household device switches
+            batch_size: Approximate number of readings handed to the sink at once
+            report_every: Wall-clock seconds between progress log lines
+            consumption_model: Profiles giving the draw of active nodes at every step of a window; without it
+                each node repeats its static consumption
+            seed: Seed of the household's device selection
+            recorder: Records every device switch to a schedule file
+            schedule: Recorded schedule to replay instead of switching devices at random
+            event_driven: Switch each node at its own random time (EventDrivenHousehold) instead of in batches
+        """
+        self.store = MemoryNodeStore.from_repository(repository)
+        self.sink = sink
+        self.start = start
+        self.end = end or datetime.now()
+        self.step = step
+        self.batch_size = batch_size
+        self.report_every = report_every
+        self.household_simulator = create_household(self.store, switch_interval_minutes, seed=seed,
+                                                    recorder=recorder, schedule=schedule,
+                                                    event_driven=event_driven)
+        self.consumption_model = consumption_model
+        self.stats = FastForwardStats()
+
+    async def run(self) -> FastForwardStats:
+        await self.sink.start()
+        started = time.perf_counter()
+        last_report = started
+
+        try:
+            current = self.start
+            while current < self.end:
+                self.household_simulator.tick(current)
+
+                active_nodes = self.store.get_active_nodes()
+                shutdown_nodes = self.household_simulator.get_nodes_to_shutdown()
+
+                # Ticks until the household switches again, i.e. the window with a constant active set
+                next_switch = self.household_simulator.next_switch_time() or self.end
+                steps = max(1, math.ceil((min(next_switch, self.end) - current) / self.step))
+
+                if active_nodes:
+                    await self._emit(shutdown_nodes, current, 1)
+                    await self._emit(active_nodes, current, steps, self.consumption_model)
+
+                current += steps * self.step
+                self.stats.windows += 1
+                self.stats.simulated_seconds = (current - self.start).total_seconds()
+
+                now = time.perf_counter()
+                if now - last_report >= self.report_every:
+                    self.stats.wall_seconds = now - started
+                    last_report = now
+                    logger.info(f"Reached {current}: {self.stats.readings} readings, "
+                                f"{self.stats.speed:,.0f} simulated s/s")
+        finally:
+            if self.household_simulator.recorder:
+                self.household_simulator.recorder.close()
+            await self.sink.stop()
+            self.stats.wall_seconds = time.perf_counter() - started
+
+        logger.info(f"Generated {self.stats.readings} readings for {self.stats.simulated_seconds:,.0f} simulated "
+                    f"seconds in {self.stats.wall_seconds:.1f}s ({self.stats.speed:,.0f} simulated s/s)")
+        return self.stats
+
+    async def _emit(self, nodes: List[WaveNode], first: datetime, steps: int,
+                    model: Optional[ConsumptionModel] = None):
+        if not nodes:
+            return
+
+        templates = [
+            (node.node_type.value, node.endpoint.split('smart_furniture_hookup_id=')[-1],
+             node.real_time_consumption, node.assigned_user)
+            for node in nodes
+        ]
+        steps_per_batch = max(1, self.batch_size // len(templates))
+
+        if model:
+            indices = model.indices_of(nodes)
+            static = np.array([template[2] for template in templates], dtype=np.float64)
+            model.observe_active(to_seconds(first), indices)
+
+        for offset in range(0, steps, steps_per_batch):
+            timestamps = [first + (offset + i) * self.step for i in range(min(steps_per_batch, steps - offset))]
+            if model:
+                # One row of profile values per timestamp of the batch
+                seconds = to_seconds(timestamps[0]) + np.arange(len(timestamps))[:, None] * self.step.total_seconds()
+                rows = model.evaluate_known(seconds, indices, static).tolist()
+                batch = [
+                    NodeReading(node_type, hookup_id, value, timestamp, username)
+                    for timestamp, values in zip(timestamps, rows)
+                    for (node_type, hookup_id, _, username), value in zip(templates, values)
+                ]
+            else:
+                batch = [
+                    NodeReading(node_type, hookup_id, value, timestamp, username)
+                    for timestamp in timestamps
+                    for node_type, hookup_id, value, username in templates
+                ]
+            await self.sink.write(batch)
+            self.stats.readings += len(batch)
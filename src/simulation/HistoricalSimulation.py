@@ -1,38 +1,84 @@
 import asyncio
-import json
-from typing import List
+import time
+from typing import Dict, List, Optional
 
-import httpx
 import logging
 
+from core.model.NodeReading import NodeReading
 from core.model.WaveNode import WaveNode
-from core.storage.WavesLabRepository import repository
-from envirorment.Household import Household
+from core.storage.ActiveNodeIndex import ActiveNodeView
+from core.storage.WavesLabRepository import repository as default_repository
+from envirorment.ConsumptionProfiles import ConsumptionModel
+from envirorment.ReplayHousehold import create_household
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
 from datetime import datetime, timedelta
 
-from influx.influxclient import influxDB
+from simulation.SimulationClock import ClockMode, SimulationClock
+from sinks.ReadingSink import ReadingSink, create_sink
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_START = datetime(2025, 10, 1, 0, 0, 0)
+
+
 class HistoricalSimulation:
-    def __init__(self):
+    def __init__(self, sink: Optional[ReadingSink] = None, start: datetime = DEFAULT_START,
+                 end: Optional[datetime] = None, step: timedelta = timedelta(seconds=20),
+                 consumption_model: Optional[ConsumptionModel] = None, seed: Optional[int] = None,
+                 recorder: Optional[ScheduleRecorder] = None, schedule: Optional[SwitchSchedule] = None,
+                 clock: Optional[SimulationClock] = None,
+                 event_driven: bool = False, report_every: float = 10.0, repository=None):
+        """
+        Args:
+            sink: Where readings go; defaults to the batched InfluxDB writer
+            start: First simulated timestamp
+            end: Simulated timestamp to stop at; defaults to the current time
+            step: Simulated time between two ticks
+            consumption_model: Profiles giving the draw of active nodes; without it their static consumption is used
+            seed: Seed of the household's device selection
+            recorder: Records every device switch to a schedule file
+            schedule: Recorded schedule to replay instead of switching devices at random
+            clock: Paces the ticks; defaults to a max-speed clock, a scaled one writes readings as they would arrive
+            event_driven: Switch each node at its own random time (EventDrivenHousehold) instead of in batches
+            report_every: Wall-clock seconds between progress log records
+            repository: Nodes the household switches; defaults to the shared repository
+        """
         self.client = None
         self.running = None
         self.loop = None
-        # Start from June 1st, 2024 00:00:00
-        self.current_timestamp = datetime(2025, 10, 1, 0, 0, 0)
-        self._time_increment = timedelta(seconds=20)
+        self.current_timestamp = start
+        self.end = end
+        self._time_increment = step
+        self.clock = clock or SimulationClock(ClockMode.MAX)
+        if self.clock.origin is None:
+            self.clock.origin = start
+
+        repository = repository or default_repository
 
         # Initialize household simulator (switches devices every 15 simulated minutes)
-        self.household_simulator = Household(repository, switch_interval_minutes=15)
+        self.household_simulator = create_household(repository, switch_interval_minutes=15, seed=seed,
+                                                    recorder=recorder, schedule=schedule,
+                                                    event_driven=event_driven)
+        self._active_nodes = ActiveNodeView(repository)
+        self.sink = sink or create_sink("influx")
+        self.consumption_model = consumption_model
+        self._consumption: Dict[str, float] = {}
+        self.report_every = report_every
+        self.ticks = 0
+        self.readings = 0
 
     async def start(self):
+        await self.sink.start()
+        self.clock.start()
         self.running = True
         self.loop = asyncio.create_task(self._simulation_loop())
         logger.info(f"Simulation loop started at timestamp: {self.current_timestamp}")
 
-        await self.loop
+        try:
+            await self.loop
+        finally:
+            await self.stop()
 
     async def stop(self):
         """Stop the background task manager."""
@@ -41,7 +87,7 @@ class HistoricalSimulation:
 
         self.running = False
 
-        if self.loop:
+        if self.loop and not self.loop.done():
             self.loop.cancel()
             try:
                 await self.loop
@@ -52,93 +98,71 @@ class HistoricalSimulation:
             await self.client.aclose()
             self.client = None
 
-        logger.info("Simulation loop stopped")
+        if self.household_simulator.recorder:
+            self.household_simulator.recorder.close()
+
+        # Whatever is still buffered must reach Influx before we return
+        await self.sink.stop()
+        logger.info(f"Simulation loop stopped, {self.sink.written} points written, {self.sink.dropped} dropped")
 
     async def _simulation_loop(self):
+        started = last_report = time.perf_counter()
+        first_timestamp = self.current_timestamp
         while self.running:
             try:
-                now = datetime.now()
-                if self.current_timestamp >= now:
-                    logger.info(f"Simulation reached current timestamp: {now}. Stopping simulation.")
-                    await self.stop()
+                end = self.end or datetime.now()
+                if self.current_timestamp >= end:
+                    logger.info(f"Simulation reached end timestamp: {end}. Stopping simulation.")
                     break
 
+                await self.clock.sleep_until((self.current_timestamp - self.clock.origin).total_seconds())
                 self.household_simulator.tick(self.current_timestamp)
 
-                active_nodes = repository.get_active_nodes()
+                active_nodes = self._active_nodes.refresh()
                 shutdown_nodes = self.household_simulator.get_nodes_to_shutdown()
+                if self.consumption_model:
+                    self._consumption = self.consumption_model.consumption_for(active_nodes, self.current_timestamp)
 
                 if active_nodes:
-                    print(f"Processing {len(active_nodes)} active nodes at timestamp: {self.current_timestamp}")
                     await self._send_requests_for_nodes(active_nodes)
                     await self._send_requests_for_nodes(shutdown_nodes)
-                else:
-                    print(f"No active nodes to process at timestamp: {self.current_timestamp}")
 
                 # Update timestamp after processing
                 self.current_timestamp += self._time_increment
+                self.ticks += 1
+
+                # A progress record every few seconds instead of a line per simulated step
+                now = time.perf_counter()
+                if now - last_report >= self.report_every:
+                    last_report = now
+                    simulated = (self.current_timestamp - first_timestamp).total_seconds()
+                    logger.info(f"Reached {self.current_timestamp}: {self.ticks} ticks, {self.readings} readings, "
+                                f"{len(active_nodes)} active nodes, {simulated / (now - started):,.0f} simulated s/s",
+                                extra=dict(ticks=self.ticks, readings=self.readings, active=len(active_nodes)))
 
             except asyncio.CancelledError:
-                print("Request loop cancelled")
+                logger.info("Request loop cancelled")
                 break
             except Exception as e:
-                print(f"Error in request loop: {e}")
+                logger.error(f"Error in request loop at {self.current_timestamp}: {e}")
                 # Still increment timestamp even on error
                 self.current_timestamp += self._time_increment
 
     async def _send_requests_for_nodes(self, nodes: List[WaveNode]):
-        tasks = []
-
-        for node in nodes:
-            task = asyncio.create_task(self._send_node_request(node))
-            tasks.append(task)
-
-        print("hello")
-        if tasks:
-            try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Log results
-                success_count = sum(1 for result in results if result is True)
-                error_count = len(results) - success_count
-
-                if success_count > 0:
-                    print(f"Successfully sent {success_count} node requests")
-                if error_count > 0:
-                    print(f"Failed to send {error_count} node requests")
-            except Exception as e:
-                print(f"Error in request loop: {e}")
+        if not nodes:
+            return
 
-    async def _send_node_request(self, node: WaveNode) -> bool:
         try:
-            utility = node.node_type.value
-
-            url = node.endpoint  # your URL string
-
-            smart_furniture_hookup_id = url.split('smart_furniture_hookup_id=')[-1]
-
-            real_time_consumption = node.real_time_consumption
-            time = self.current_timestamp
-
-            payload = {
-                "type": utility,
-                "smart_furniture_hookup_id": smart_furniture_hookup_id,
-                "real_time_consumption": real_time_consumption,
-                "timestamp": time.isoformat() + "Z"
-            }
-
-            influxDB.write_node_request(json.dumps(payload))
-
-            print(f"Request sent successfully for node '{node.name}' to {node.endpoint} with {node.real_time_consumption}")
-            return True
-
-        except httpx.TimeoutException:
-            print(f"Request timeout for node '{node.name}' to {node.endpoint}")
-            return False
-        except httpx.RequestError as e:
-            print(f"Network error for node '{node.name}': {e}")
-            return False
+            await self.sink.write(self._reading_for(node) for node in nodes)
+            self.readings += len(nodes)
         except Exception as e:
-            print(f"Unexpected error sending request for node '{node.name}': {e}")
-            return False
-
+            logger.error(f"Error writing {len(nodes)} readings: {e}")
+
+    def _reading_for(self, node: WaveNode) -> NodeReading:
+        return NodeReading(
+            node_type=node.node_type.value,
+            hookup_id=node.endpoint.split('smart_furniture_hookup_id=')[-1],
+            value=self._consumption.get(node.id, node.real_time_consumption),
+            timestamp=self.current_timestamp,
+            username=node.assigned_user
+        )
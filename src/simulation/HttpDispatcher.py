@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from metrics.MetricsRegistry import registry
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUESTS = registry.counter("waveslab_http_requests_total",
+                                 "Readings POSTed to node endpoints, by endpoint host and outcome "
+                                 "(status class, timeout or error)", ("host", "outcome"))
+HTTP_SECONDS = registry.histogram("waveslab_http_request_duration_seconds",
+                                  "Latency of POSTs to node endpoints, by endpoint host, including the wait for "
+                                  "a free connection", ("host",))
+
+try:
+    import h2  # noqa: F401  (httpx only needs it to be importable)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+T = TypeVar("T")
+
+
+class HttpDispatcher:
+    """
+    Bounded-concurrency, connection-pooled HTTP sender for the simulation loops.
+
+    At most ``max_in_flight`` requests run at once overall and ``max_per_host`` per
+    endpoint host. ``dispatch`` only creates a task once a slot is free, so the producer
+    is throttled (backpressure) instead of spawning one task per node up front.
+    Each host gets its own keep-alive pool of ``max_per_host`` connections: httpcore
+    scans the whole pool for every queued request, so one large shared pool gets
+    slower as concurrency grows. HTTP/2 is negotiated with servers that support it
+    when the ``h2`` package is installed.
+    """
+
+    def __init__(self, max_in_flight: int = 200, max_per_host: int = 20,
+                 keepalive_expiry: float = 30.0, timeout: float = 10.0, http2: bool = True):
+        """
+        Args:
+            max_in_flight: Maximum number of concurrent requests
+            max_per_host: Maximum number of concurrent requests (and pooled connections) per host
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Request timeout in seconds
+            http2: Negotiate HTTP/2 when available
+        """
+        self._max_in_flight = max_in_flight
+        self._max_per_host = max_per_host
+        self._limits = httpx.Limits(
+            max_connections=max_per_host,
+            max_keepalive_connections=max_per_host,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._timeout = timeout
+        self._http2 = http2 and _HTTP2_AVAILABLE
+        if http2 and not _HTTP2_AVAILABLE:
+            logger.info("h2 is not installed, HTTP/2 disabled")
+
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, Tuple[httpx.AsyncClient, asyncio.Semaphore]] = {}
+
+        self.sent = 0
+        self.failed = 0
+
+    async def start(self):
+        self._in_flight = asyncio.Semaphore(self._max_in_flight)
+
+    async def close(self):
+        hosts, self._hosts = self._hosts, {}
+        for client, _ in hosts.values():
+            await client.aclose()
+
+    def _host(self, host: str) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            client = httpx.AsyncClient(timeout=self._timeout, limits=self._limits, http2=self._http2)
+            entry = (client, asyncio.Semaphore(self._max_per_host))
+            self._hosts[host] = entry
+        return entry
+
+    async def post(self, url: str, json=None, headers: Optional[dict] = None) -> httpx.Response:
+        """POST through the host's connection pool, waiting for a free slot on that host."""
+        host = urlsplit(url).netloc
+        client, slot = self._host(host)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async with slot:
+                response = await client.post(url, json=json, headers=headers)
+            outcome = f"{response.status_code // 100}xx"
+            return response
+        except httpx.TimeoutException:
+            outcome = "timeout"
+            raise
+        finally:
+            HTTP_SECONDS.labels(host).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(host, outcome).inc()
+
+    async def dispatch(self, items: Iterable[T], send: Callable[[T], Awaitable[bool]]) -> Tuple[int, int]:
+        """
+        Run ``send`` for every item with at most ``max_in_flight`` calls in flight.
+
+        Args:
+            items: Work items, consumed lazily
+            send: Coroutine returning True on success
+
+        Returns:
+            The number of successful and failed sends
+        """
+        results = {"ok": 0, "failed": 0}
+        pending = set()
+
+        def _done(task: asyncio.Task):
+            pending.discard(task)
+            self._in_flight.release()
+            ok = not task.cancelled() and task.exception() is None and task.result() is True
+            results["ok" if ok else "failed"] += 1
+
+        try:
+            for item in items:
+                await self._in_flight.acquire()
+                task = asyncio.create_task(send(item))
+                pending.add(task)
+                task.add_done_callback(_done)
+
+            if pending:
+                await asyncio.wait(set(pending))
+        except asyncio.CancelledError:
+            for task in list(pending):
+                task.cancel()
+            raise
+
+        self.sent += results["ok"]
+        self.failed += results["failed"]
+        return results["ok"], results["failed"]
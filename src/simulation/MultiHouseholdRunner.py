@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Tuple
+
+import numpy as np
+
+from core.model.WaveNode import WaveNode
+from envirorment.ConsumptionProfiles import ConsumptionModel
+from envirorment.VectorizedHousehold import VectorizedHousehold
+from server.NodeRequest import NodeRequest
+from simulation.HttpDispatcher import HttpDispatcher
+from simulation.TickScheduler import TickScheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENDPOINT = "http://127.0.0.1:3002/api/internal/measurements?smart_furniture_hookup_id={household}-{node}"
+
+
+@dataclass
+class WorkerStats:
+    """Throughput of one worker process."""
+    worker: int
+    households: int
+    ticks: int = 0
+    sent: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return (self.sent + self.failed) / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class RunStats:
+    """Aggregated throughput of a multi-household run."""
+    workers: List[WorkerStats] = field(default_factory=list)
+
+    @property
+    def sent(self) -> int:
+        return sum(worker.sent for worker in self.workers)
+
+    @property
+    def failed(self) -> int:
+        return sum(worker.failed for worker in self.workers)
+
+    @property
+    def requests_per_second(self) -> float:
+        return sum(worker.requests_per_second for worker in self.workers)
+
+
+def build_household_nodes(template: List[WaveNode], household: int, endpoint: str) -> List[WaveNode]:
+    """Copy the template nodes for one household, with household-scoped ids and endpoints."""
+    return [
+        node.model_copy(update={
+            "id": f"h{household}-{node.id}",
+            "endpoint": endpoint.format(household=household, node=node.id),
+        })
+        for node in template
+    ]
+
+
+class MultiHouseholdRunner:
+    """
+    Load generator simulating many independent households across a process pool.
+
+    Households are sharded over ``workers`` processes. Each worker runs one event loop
+    with one HttpDispatcher and drives its households as VectorizedHousehold instances,
+    each built from the template nodes with its own ids, endpoints and RNG seeded with
+    ``seed + household index`` (shared with its consumption profiles when ``profiles`` is
+    set). Every ``interval`` seconds each household ticks and reports its active nodes,
+    as RealTimeSimulation does for a single household.
+    """
+
+    def __init__(self, template: List[WaveNode], households: int, workers: int, interval: float = 5.0,
+                 endpoint: str = DEFAULT_ENDPOINT, seed: int = 0, switch_interval_minutes: int = 1,
+                 max_in_flight: int = 200, max_per_host: int = 20, profiles: bool = False):
+        self.template = template
+        self.households = households
+        self.workers = max(1, min(workers, households))
+        self.interval = interval
+        self.endpoint = endpoint
+        self.seed = seed
+        self.switch_interval_minutes = switch_interval_minutes
+        self.max_in_flight = max_in_flight
+        self.max_per_host = max_per_host
+        self.profiles = profiles
+
+    def _shards(self) -> List[List[int]]:
+        return [list(range(worker, self.households, self.workers)) for worker in range(self.workers)]
+
+    def run(self, duration: float) -> RunStats:
+        """Run every worker for ``duration`` seconds and gather their stats."""
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(_run_worker, worker, shard, self, duration)
+                for worker, shard in enumerate(self._shards())
+            ]
+            stats = RunStats([future.result() for future in futures])
+
+        for worker in stats.workers:
+            logger.info(f"Worker {worker.worker}: {worker.households} households, {worker.ticks} ticks, "
+                        f"{worker.sent} sent, {worker.failed} failed, {worker.requests_per_second:,.0f} req/s")
+        logger.info(f"Total: {stats.sent} sent, {stats.failed} failed, {stats.requests_per_second:,.0f} req/s")
+        return stats
+
+
+def _run_worker(worker: int, shard: List[int], runner: MultiHouseholdRunner, duration: float) -> WorkerStats:
+    return asyncio.run(_worker_loop(worker, shard, runner, duration))
+
+
+async def _worker_loop(worker: int, shard: List[int], runner: MultiHouseholdRunner, duration: float) -> WorkerStats:
+    households = []
+    for index in shard:
+        nodes = build_household_nodes(runner.template, index, runner.endpoint)
+        rng = np.random.default_rng(runner.seed + index)
+        household = VectorizedHousehold(
+            nodes,
+            switch_interval_minutes=runner.switch_interval_minutes,
+            rng=rng,
+            consumption_model=ConsumptionModel(nodes, rng=rng) if runner.profiles else None
+        )
+        households.append(household)
+
+    stats = WorkerStats(worker=worker, households=len(shard))
+    dispatcher = HttpDispatcher(max_in_flight=runner.max_in_flight, max_per_host=runner.max_per_host)
+    scheduler = TickScheduler(runner.interval)
+    await dispatcher.start()
+
+    async def send(item: Tuple[str, dict]) -> bool:
+        url, payload = item
+        try:
+            response = await dispatcher.post(url, json=payload)
+            return response.status_code == 204
+        except Exception:
+            return False
+
+    async def tick(now: datetime):
+        items = []
+        for household in households:
+            household.tick(now)
+            for indices in (household.active_indices(), household.take_shutdown_indices()):
+                for i in indices:
+                    request = NodeRequest(
+                        realTimeConsumption=float(household.consumption[i]),
+                        username=household.usernames[household.user[i]],
+                        timestamp=now
+                    )
+                    items.append((household.endpoints[i], request.model_dump(mode='json')))
+
+        sent, failed = await dispatcher.dispatch(items, send)
+        stats.ticks += 1
+        stats.sent += sent
+        stats.failed += failed
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(scheduler.run(tick), timeout=duration)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        stats.seconds = time.perf_counter() - started
+        await dispatcher.close()
+
+    return stats
@@ -1,30 +1,74 @@
 import asyncio
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 import logging
 
 from core.model.WaveNode import WaveNode
-from core.storage.WavesLabRepository import repository
-from envirorment.Household import Household
+from core.storage.ActiveNodeIndex import ActiveNodeView
+from core.storage.WavesLabRepository import repository as default_repository
+from envirorment.ConsumptionProfiles import ConsumptionModel
+from envirorment.ReplayHousehold import create_household
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
+from logs.LogPipeline import trace
+from metrics.MetricsRegistry import registry
 
 from datetime import datetime
 
 from server.NodeRequest import NodeRequest
+from simulation.BatchDelivery import BatchDelivery
+from simulation.DeltaFilter import DeltaFilter
+from simulation.HttpDispatcher import HttpDispatcher
+from simulation.SimulationClock import SimulationClock
+from simulation.TickScheduler import OverrunPolicy, TickScheduler
 
 logger = logging.getLogger(__name__)
 
+ACTIVE_NODES = registry.gauge("waveslab_active_nodes", "Nodes switched on at the last tick")
+SHUTDOWN_NODES = registry.counter("waveslab_shutdown_readings_total", "Zero readings queued for switched-off nodes")
+
 class RealTimeSimulation:
-    def __init__(self):
-        self.client = None
+    def __init__(self, dispatcher: Optional[HttpDispatcher] = None, batch_size: int = 0,
+                 overrun_policy: OverrunPolicy = OverrunPolicy.SKIP,
+                 consumption_model: Optional[ConsumptionModel] = None, seed: Optional[int] = None,
+                 recorder: Optional[ScheduleRecorder] = None, schedule: Optional[SwitchSchedule] = None,
+                 replay_speed: float = 1.0, clock: Optional[SimulationClock] = None,
+                 event_driven: bool = False, delta: Optional[DeltaFilter] = None, repository=None):
+        """
+        Args:
+            dispatcher: HTTP dispatcher used to deliver node readings; defaults to HttpDispatcher()
+            batch_size: When > 0, readings sharing an endpoint base are sent as JSON arrays of up to this many items
+            overrun_policy: What to do when a tick takes longer than the simulation interval
+            consumption_model: Profiles giving the draw of active nodes; without it their static consumption is sent
+            seed: Seed of the household's device selection
+            recorder: Records every device switch to a schedule file
+            schedule: Recorded schedule to replay instead of switching devices at random
+            replay_speed: How many seconds of the schedule are replayed per simulated second
+            clock: Simulated time driving the ticks (real, scaled or max speed); defaults to the wall clock
+            event_driven: Switch each node at its own random time (EventDrivenHousehold) instead of in batches
+            delta: When given, only readings that changed (plus periodic heartbeats) are sent, shutdowns included
+            repository: Nodes the household switches; defaults to the shared repository
+        """
+        self.dispatcher = dispatcher or HttpDispatcher()
+        self.batcher = BatchDelivery(self.dispatcher, batch_size) if batch_size > 0 else None
         self.running = None
         self.loop = None
         self._simulation_interval = 5
-
-        self.household_simulator = Household(repository, switch_interval_minutes=1)
+        self.clock = clock or SimulationClock()
+        self.scheduler = TickScheduler(self._simulation_interval, overrun_policy, clock=self.clock)
+        self._now: Optional[datetime] = None
+
+        repository = repository or default_repository
+        self.household_simulator = create_household(repository, switch_interval_minutes=1, seed=seed,
+                                                    recorder=recorder, schedule=schedule, speed=replay_speed,
+                                                    event_driven=event_driven)
+        self._active_nodes = ActiveNodeView(repository)
+        self.consumption_model = consumption_model
+        self._consumption: Dict[str, float] = {}
+        self.delta = delta
 
     async def start(self):
-        self.client = httpx.AsyncClient(timeout=10.0)
+        await self.dispatcher.start()
         self.running = True
         self.loop = asyncio.create_task(self._simulation_loop())
         logger.info("Simulation loop started")
@@ -36,6 +80,7 @@ class RealTimeSimulation:
             return
 
         self.running = False
+        self.scheduler.stop()
 
         if self.loop:
             self.loop.cancel()
@@ -44,91 +89,116 @@ class RealTimeSimulation:
             except asyncio.CancelledError:
                 pass
 
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        await self.dispatcher.close()
+        if self.household_simulator.recorder:
+            self.household_simulator.recorder.close()
 
         logger.info("Simulation loop stopped")
 
     async def _simulation_loop(self):
-        while self.running:
-            try:
-                now = datetime.now()
-
-                self.household_simulator.tick(now)
-
-                active_nodes = repository.get_active_nodes()
-                shutdown_nodes = self.household_simulator.get_nodes_to_shutdown()
-
-                if active_nodes:
-                    logger.info(f"Processing {len(active_nodes)} active nodes")
-                    await self._send_requests_for_nodes(active_nodes)
-                    logger.info(f"Processing {len(shutdown_nodes)} nodes to shutdown")
-                    await self._send_requests_for_nodes(shutdown_nodes)
-                else:
-                    logger.info("No active nodes to process")
-
-                await asyncio.sleep(self._simulation_interval)
-
-            except asyncio.CancelledError:
-                print("Request loop cancelled")
-                break
-            except Exception as e:
-                print(f"Error in request loop: {e}")
-                await asyncio.sleep(1)
-
-    async def _send_requests_for_nodes(self, nodes: List[WaveNode]):
-        tasks = []
+        try:
+            await self.scheduler.run(self._tick)
+        except asyncio.CancelledError:
+            logger.info("Request loop cancelled")
 
-        for node in nodes:
-            task = asyncio.create_task(self._send_node_request(node))
-            tasks.append(task)
+    async def _tick(self, now: datetime):
+        self._now = now
+        try:
+            self.household_simulator.tick(now)
+
+            active_nodes = self._active_nodes.refresh()
+            shutdown_nodes = self.household_simulator.get_nodes_to_shutdown()
+            ACTIVE_NODES.set(len(active_nodes))
+            SHUTDOWN_NODES.inc(len(shutdown_nodes))
+            if self.consumption_model:
+                self._consumption = self.consumption_model.consumption_for(active_nodes, now)
+
+            sent = failed = 0
+            if self.delta:
+                # Shutdowns are changes too: one pass over both sets, one batch per endpoint base
+                changed = self.delta.select(active_nodes + shutdown_nodes, self._value_of)
+                sent, failed = await self._send_requests_for_nodes(changed)
+            elif active_nodes:
+                for nodes in (active_nodes, shutdown_nodes):
+                    ok, ko = await self._send_requests_for_nodes(nodes)
+                    sent += ok
+                    failed += ko
+
+            # One summary record per tick; per-node lines only go to the trace logger
+            stats = self.scheduler.stats
+            summary = dict(active=len(active_nodes), shutdown=len(shutdown_nodes), sent=sent, failed=failed,
+                           suppressed=self.delta.suppressed if self.delta else 0,
+                           previous_latency=round(stats.last_latency, 3), lag=round(stats.last_lag, 3),
+                           overruns=stats.overruns, skipped=stats.skipped)
+            logger.info(f"Tick {now}: {len(active_nodes)} active, {len(shutdown_nodes)} shutdown, "
+                        f"{sent} sent, {failed} failed; previous tick took {stats.last_latency:.3f}s, "
+                        f"lag {stats.last_lag:.3f}s", extra=summary)
 
-        if tasks:
-            try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+        except Exception as e:
+            logger.exception(f"Error in request loop: {e}")
 
-                # Log results
-                success_count = sum(1 for result in results if result is True)
-                error_count = len(results) - success_count
+    async def _send_requests_for_nodes(self, nodes: List[WaveNode]) -> Tuple[int, int]:
+        """Deliver the readings of ``nodes``; returns the number sent and failed."""
+        if not nodes:
+            return 0, 0
 
-                if success_count > 0:
-                    print(f"Successfully sent {success_count} node requests")
-                if error_count > 0:
-                    print(f"Failed to send {error_count} node requests")
-            except Exception as e:
-                print(f"Error in request loop: {e}")
+        try:
+            if self.batcher:
+                return await self.batcher.deliver(
+                    nodes, self._build_request, self._deliver_node, on_failed=self._delivery_failed
+                )
+            return await self.dispatcher.dispatch(nodes, self._deliver_node)
+        except Exception as e:
+            logger.error(f"Error sending {len(nodes)} node requests: {e}")
+            for node in nodes:
+                self._delivery_failed(node)
+            return 0, len(nodes)
+
+    def _value_of(self, node: WaveNode) -> float:
+        return self._consumption.get(node.id, node.real_time_consumption)
+
+    def _delivery_failed(self, node: WaveNode):
+        if self.delta:
+            # Not delivered, so the consumer still has the previous value: send it again next tick
+            self.delta.forget(node)
+
+    async def _deliver_node(self, node: WaveNode) -> bool:
+        ok = await self._send_node_request(node)
+        if not ok:
+            self._delivery_failed(node)
+        return ok
+
+    def _build_request(self, node: WaveNode) -> NodeRequest:
+        return NodeRequest(
+            realTimeConsumption=self._value_of(node),
+            username=node.assigned_user,
+            timestamp=self._now
+        )
 
     async def _send_node_request(self, node: WaveNode) -> bool:
         try:
-            request_data = NodeRequest(
-                realTimeConsumption=node.real_time_consumption,
-                username=node.assigned_user
-            )
+            request_data = self._build_request(node)
 
-            print(node.endpoint)
-            response = await self.client.post(
+            response = await self.dispatcher.post(
                 node.endpoint,
                 json=request_data.model_dump(mode='json'),
                 headers={"Content-Type": "application/json"}
             )
 
             if response.status_code == 204:
-                logger.info(f"Request sent successfully for node '{node.name}' to {node.endpoint}")
+                if trace.isEnabledFor(logging.DEBUG):
+                    trace.debug(f"Request sent successfully for node '{node.name}' to {node.endpoint}")
                 return True
             else:
-                print("================")
-                print(response)
-                logger.info(f"Request failed for node '{node.name}': HTTP {response.status_code}")
+                logger.warning(f"Request failed for node '{node.name}' to {node.endpoint}: HTTP {response.status_code}")
                 return False
 
         except httpx.TimeoutException:
-            print(f"Request timeout for node '{node.name}' to {node.endpoint}")
+            logger.warning(f"Request timeout for node '{node.name}' to {node.endpoint}")
             return False
         except httpx.RequestError as e:
-            print(f"Network error for node '{node.name}': {e}")
+            logger.warning(f"Network error for node '{node.name}': {e}")
             return False
         except Exception as e:
-            print(f"Unexpected error sending request for node '{node.name}': {e}")
+            logger.error(f"Unexpected error sending request for node '{node.name}': {e}")
             return False
-
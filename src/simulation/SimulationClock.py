@@ -0,0 +1,76 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Optional
+
+
+class ClockMode(str, Enum):
+    """How simulated time advances."""
+    REAL = "real"
+    SCALED = "scaled"
+    MAX = "max"
+
+
+class SimulationClock:
+    """
+    Simulated time shared by the simulations and the tick scheduler.
+
+    Time is measured in simulated seconds since ``start()``:
+
+    * ``real`` follows the wall clock,
+    * ``scaled`` follows the wall clock ``speed`` times faster (60 runs an hour per minute),
+    * ``max`` only advances when someone sleeps, and sleeping returns at once, so the
+      simulation runs as fast as its ticks complete.
+    """
+
+    def __init__(self, mode: ClockMode = ClockMode.REAL, speed: float = 1.0, start: Optional[datetime] = None):
+        """
+        Args:
+            mode: Clock mode
+            speed: Simulated seconds per wall-clock second in ``scaled`` mode
+            start: Simulated time at ``start()``; defaults to the wall-clock time when the clock starts
+        """
+        self.mode = ClockMode(mode)
+        if self.mode == ClockMode.SCALED and speed <= 0:
+            raise ValueError("Scaled clock speed must be positive")
+        self.speed = speed if self.mode == ClockMode.SCALED else 1.0
+        self.origin = start
+        self._started_at: Optional[float] = None
+        self._virtual = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._started_at is not None
+
+    def start(self):
+        """Anchor simulated time zero to now; a no-op if the clock is already running."""
+        if self.started:
+            return
+        self._started_at = time.monotonic()
+        if self.origin is None:
+            self.origin = datetime.now()
+
+    def time(self) -> float:
+        """Simulated seconds since the clock started."""
+        if self.mode == ClockMode.MAX:
+            return self._virtual
+        return (time.monotonic() - self._started_at) * self.speed
+
+    def at(self, seconds: float) -> datetime:
+        """Simulated datetime ``seconds`` after the start."""
+        return self.origin + timedelta(seconds=seconds)
+
+    def now(self) -> datetime:
+        return self.at(self.time())
+
+    async def sleep_until(self, seconds: float):
+        """Wait until simulated time reaches ``seconds``; in ``max`` mode jump there after yielding once."""
+        if self.mode == ClockMode.MAX:
+            await asyncio.sleep(0)
+            self._virtual = max(self._virtual, seconds)
+            return
+
+        delay = (seconds - self.time()) / self.speed
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Awaitable, Callable, Optional, Set
+
+from metrics.MetricsRegistry import registry
+from simulation.SimulationClock import SimulationClock
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = registry.histogram("waveslab_tick_duration_seconds", "Wall-clock time spent in a tick")
+TICK_LAG_SECONDS = registry.histogram("waveslab_tick_lag_seconds",
+                                      "Simulated seconds a tick started after its deadline")
+TICK_OVERRUNS = registry.counter("waveslab_tick_overruns_total", "Ticks that ran past the next deadline")
+TICKS_SKIPPED = registry.counter("waveslab_ticks_skipped_total", "Deadlines dropped because of overruns")
+
+
+class OverrunPolicy(str, Enum):
+    """What the scheduler does when a tick runs past the next deadline."""
+    SKIP = "skip"
+    CATCH_UP = "catch-up"
+    OVERLAP = "overlap"
+
+
+@dataclass
+class TickStats:
+    """Timing of the ticks run so far, in seconds."""
+    ticks: int = 0
+    overruns: int = 0
+    skipped: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+
+
+class TickScheduler:
+    """
+    Fires ticks on a fixed cadence anchored to the start time, so the period does not drift.
+
+    Deadlines are ``n * interval`` simulated seconds on the SimulationClock (the wall
+    clock by default); the tick callback receives the matching simulated time. Lag is
+    how late, in simulated seconds, a tick started after its deadline; latency is how
+    long it ran on the wall clock. When a tick overruns the next deadline:
+
+    * ``skip`` drops the missed deadlines and waits for the next one in the future,
+    * ``catch-up`` runs the missed ticks back to back until it is on schedule again,
+    * ``overlap`` starts ticks on time in the background, at most ``max_overlap`` at once
+      (deadlines beyond that are skipped).
+    """
+
+    def __init__(self, interval: float, policy: OverrunPolicy = OverrunPolicy.SKIP, max_overlap: int = 2,
+                 clock: Optional[SimulationClock] = None):
+        self.interval = interval
+        self.clock = clock or SimulationClock()
+        self.policy = OverrunPolicy(policy)
+        self.max_overlap = max_overlap
+        self.stats = TickStats()
+        self._running = False
+        self._inflight: Set[asyncio.Task] = set()
+
+    def stop(self):
+        self._running = False
+
+    async def run(self, tick: Callable[[datetime], Awaitable[None]]):
+        """Run ``tick`` on schedule until ``stop()`` is called or the task is cancelled."""
+        self._running = True
+        clock = self.clock
+        clock.start()
+        n = int(clock.time() // self.interval)
+
+        try:
+            while self._running:
+                deadline = n * self.interval
+                await clock.sleep_until(deadline)
+
+                scheduled = clock.at(deadline)
+                lag = max(0.0, clock.time() - deadline)
+                self.stats.last_lag = lag
+                self.stats.max_lag = max(self.stats.max_lag, lag)
+                TICK_LAG_SECONDS.observe(lag)
+
+                if self.policy == OverrunPolicy.OVERLAP:
+                    if self._inflight:
+                        self.stats.overruns += 1
+                        TICK_OVERRUNS.inc()
+                    if len(self._inflight) >= self.max_overlap:
+                        self.stats.skipped += 1
+                        TICKS_SKIPPED.inc()
+                        logger.warning(f"Skipping tick, {len(self._inflight)} ticks still running")
+                    else:
+                        task = asyncio.create_task(self._timed(tick, scheduled))
+                        self._inflight.add(task)
+                        task.add_done_callback(self._inflight.discard)
+                    n += 1
+                    continue
+
+                await self._timed(tick, scheduled)
+                n += 1
+
+                behind = int(clock.time() // self.interval) - n + 1
+                if behind > 0:
+                    self.stats.overruns += 1
+                    TICK_OVERRUNS.inc()
+                    if self.policy == OverrunPolicy.SKIP:
+                        self.stats.skipped += behind
+                        TICKS_SKIPPED.inc(behind)
+                        logger.warning(f"Tick overran by {behind} period(s), skipping to the next deadline")
+                        n += behind
+                    else:
+                        logger.warning(f"Tick overran by {behind} period(s), catching up")
+        finally:
+            for task in list(self._inflight):
+                task.cancel()
+
+    async def _timed(self, tick: Callable[[datetime], Awaitable[None]], scheduled: datetime):
+        started = time.monotonic()
+        try:
+            await tick(scheduled)
+        finally:
+            latency = time.monotonic() - started
+            self.stats.ticks += 1
+            self.stats.last_latency = latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            TICK_SECONDS.observe(latency)
+            logger.debug(f"Tick for {scheduled} took {latency:.3f}s (lag {self.stats.last_lag:.3f}s)")
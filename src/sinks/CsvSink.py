@@ -0,0 +1,38 @@
+import csv
+import gzip
+from typing import List, Optional, TextIO
+
+from core.model.NodeReading import NodeReading
+from sinks.ReadingSink import FileSink
+
+CSV_COLUMNS = ("timestamp", "node_type", "smart_furniture_hookup_id", "value", "username")
+
+
+class CsvSink(FileSink):
+    """Streams readings as CSV with a header row, gzip'd when the path ends in ``.gz``. Timestamps are ISO 8601 UTC."""
+
+    def __init__(self, path: str, chunk_size: int = 50_000):
+        super().__init__(path, chunk_size)
+        self._fp: Optional[TextIO] = None
+        self._writer = None
+
+    def _open(self):
+        if self.path.endswith(".gz"):
+            self._fp = gzip.open(self.path, "wt", encoding="utf-8", newline="")
+        else:
+            self._fp = open(self.path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._fp)
+        self._writer.writerow(CSV_COLUMNS)
+
+    def _write_chunk(self, readings: List[NodeReading]):
+        self._writer.writerows(
+            (reading.timestamp.isoformat() + "Z", reading.node_type, reading.hookup_id, reading.value,
+             reading.username or "")
+            for reading in readings
+        )
+
+    def _close(self):
+        if self._fp:
+            self._fp.close()
+            self._fp = None
+            self._writer = None
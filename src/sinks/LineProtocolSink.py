@@ -0,0 +1,35 @@
+import gzip
+from typing import List, Optional, TextIO
+
+from core.model.NodeReading import NodeReading
+from influx.lineprotocol import to_line_protocol
+from sinks.ReadingSink import FileSink
+
+
+class LineProtocolSink(FileSink):
+    """
+    Streams readings as Influx line protocol (nanosecond precision), gzip'd when the path ends in ``.gz``.
+
+    The output can be bulk-loaded later with
+    ``influx write --bucket <bucket> --precision ns --format lp --compression gzip -f <path>``.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 50_000, compresslevel: int = 6):
+        super().__init__(path, chunk_size)
+        self.compresslevel = compresslevel
+        self._fp: Optional[TextIO] = None
+
+    def _open(self):
+        if self.path.endswith(".gz"):
+            self._fp = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=self.compresslevel)
+        else:
+            self._fp = open(self.path, "w", encoding="utf-8")
+
+    def _write_chunk(self, readings: List[NodeReading]):
+        self._fp.write("\n".join(to_line_protocol(reading) for reading in readings))
+        self._fp.write("\n")
+
+    def _close(self):
+        if self._fp:
+            self._fp.close()
+            self._fp = None
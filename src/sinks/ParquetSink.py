@@ -0,0 +1,57 @@
+from datetime import timezone
+from typing import List
+
+from core.model.NodeReading import NodeReading
+from sinks.ReadingSink import FileSink
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+
+class ParquetSink(FileSink):
+    """
+    Streams readings to a Parquet file, one row group per chunk. Requires ``pyarrow``.
+
+    Columns: node_type, smart_furniture_hookup_id, value, timestamp (UTC, ns), username.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 200_000, compression: str = "zstd"):
+        if pa is None:
+            raise ImportError("The parquet sink requires pyarrow (pip install pyarrow)")
+        super().__init__(path, chunk_size)
+        self.compression = compression
+        self._schema = pa.schema([
+            ("node_type", pa.dictionary(pa.int8(), pa.string())),
+            ("smart_furniture_hookup_id", pa.string()),
+            ("value", pa.float64()),
+            ("timestamp", pa.timestamp("ns", tz="UTC")),
+            ("username", pa.string()),
+        ])
+        self._writer = None
+
+    def _open(self):
+        self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+
+    def _write_chunk(self, readings: List[NodeReading]):
+        timestamps = [
+            reading.timestamp if reading.timestamp.tzinfo else reading.timestamp.replace(tzinfo=timezone.utc)
+            for reading in readings
+        ]
+        table = pa.table({
+            "node_type": pa.array([reading.node_type for reading in readings]).dictionary_encode().cast(
+                self._schema.field("node_type").type),
+            "smart_furniture_hookup_id": [reading.hookup_id for reading in readings],
+            "value": pa.array([reading.value for reading in readings], type=pa.float64()),
+            "timestamp": pa.array(timestamps, type=pa.timestamp("ns", tz="UTC")),
+            "username": [reading.username for reading in readings],
+        }, schema=self._schema)
+        self._writer.write_table(table)
+
+    def _close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
@@ -0,0 +1,114 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from core.model.NodeReading import NodeReading
+
+
+class ReadingSink(ABC):
+    """Destination for the readings produced by the historical generator."""
+
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def write(self, readings: Iterable[NodeReading]):
+        ...
+
+    async def stop(self):
+        """Flush everything still buffered and release resources."""
+        pass
+
+
+class NullSink(ReadingSink):
+    """Discards readings, only counting them. Useful to measure generation speed."""
+
+    def __init__(self):
+        self.written = 0
+        self.dropped = 0
+
+    async def write(self, readings: Iterable[NodeReading]):
+        for _ in readings:
+            self.written += 1
+
+
+class FileSink(ReadingSink):
+    """
+    Base for sinks that stream readings to a local file.
+
+    Readings are buffered and encoded/written ``chunk_size`` at a time in a worker
+    thread, so compression and disk I/O do not block the event loop.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 50_000):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._buffer: List[NodeReading] = []
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self):
+        await asyncio.to_thread(self._open)
+
+    async def write(self, readings: Iterable[NodeReading]):
+        self._buffer.extend(readings)
+        if len(self._buffer) >= self.chunk_size:
+            await self._flush()
+
+    async def stop(self):
+        await self._flush()
+        await asyncio.to_thread(self._close)
+
+    async def _flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        await asyncio.to_thread(self._write_chunk, batch)
+        self.written += len(batch)
+
+    @abstractmethod
+    def _open(self):
+        ...
+
+    @abstractmethod
+    def _write_chunk(self, readings: List[NodeReading]):
+        ...
+
+    @abstractmethod
+    def _close(self):
+        ...
+
+
+SINK_KINDS = ("influx", "lineprotocol", "csv", "parquet", "null")
+
+
+def create_sink(kind: str, path: Optional[str] = None) -> ReadingSink:
+    """
+    Create a reading sink.
+
+    Args:
+        kind: One of ``influx``, ``lineprotocol``, ``csv``, ``parquet`` or ``null``
+        path: Output file for the file sinks; a ``.gz`` suffix compresses line protocol and CSV
+
+    Returns:
+        The sink, not yet started
+    """
+    if kind == "influx":
+        from influx.influxclient import InfluxBatchWriter, get_influx
+        return InfluxBatchWriter(get_influx())
+    if kind == "null":
+        return NullSink()
+
+    if not path:
+        raise ValueError(f"The '{kind}' sink needs an output path")
+    if kind == "lineprotocol":
+        from sinks.LineProtocolSink import LineProtocolSink
+        return LineProtocolSink(path)
+    if kind == "csv":
+        from sinks.CsvSink import CsvSink
+        return CsvSink(path)
+    if kind == "parquet":
+        from sinks.ParquetSink import ParquetSink
+        return ParquetSink(path)
+
+    raise ValueError(f"Unknown sink '{kind}'")
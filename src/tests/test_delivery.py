@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime
+
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import make_nodes
+from server.NodeRequest import NodeRequest
+from simulation.BatchDelivery import BatchDelivery, split_endpoint
+from simulation.DeltaFilter import DeltaFilter
+from simulation.HttpDispatcher import HttpDispatcher
+
+
+def _consumption(node) -> float:
+    return node.real_time_consumption
+
+
+def _ids(nodes) -> list:
+    return sorted(node.id for node in nodes)
+
+
+# DeltaFilter
+
+def test_delta_sends_only_changes():
+    delta = DeltaFilter(heartbeat_ticks=0, tolerance=0.05)
+    nodes = make_nodes(5, active_fraction=1.0)
+
+    assert _ids(delta.select(nodes, _consumption)) == _ids(nodes)
+    assert delta.select(nodes, _consumption) == []
+
+    nodes[0] = nodes[0].model_copy(update={"real_time_consumption": nodes[0].real_time_consumption + 0.01})
+    nodes[1] = nodes[1].model_copy(update={"real_time_consumption": nodes[1].real_time_consumption + 1})
+    nodes[2] = nodes[2].model_copy(update={"endpoint": "http://example.test/2"})
+    # Within the tolerance, changed, and re-pointed
+    assert _ids(delta.select(nodes, _consumption)) == ["node-1", "node-2"]
+    assert delta.suppressed == 5 + 3
+
+
+def test_delta_heartbeat_sends_every_node_once_per_period():
+    delta = DeltaFilter(heartbeat_ticks=4)
+    nodes = make_nodes(20, active_fraction=1.0)
+    delta.select(nodes, _consumption)
+
+    heartbeats = [node.id for _ in range(4) for node in delta.select(nodes, _consumption)]
+    assert sorted(heartbeats) == _ids(nodes)
+
+
+def test_delta_resends_failed_readings():
+    delta = DeltaFilter(heartbeat_ticks=0)
+    nodes = make_nodes(3, active_fraction=1.0)
+    delta.select(nodes, _consumption)
+
+    # A shutdown reading that failed is retried although the node is no longer passed in
+    delta.forget(nodes[0])
+    assert delta.select(nodes[1:], _consumption) == [nodes[0]]
+    assert delta.select(nodes[1:], _consumption) == []
+
+    # A newer reading of a pending node replaces the failed one
+    delta.forget(nodes[1])
+    newer = nodes[1].model_copy(update={"real_time_consumption": 0})
+    assert delta.select([newer], _consumption) == [newer]
+
+
+# BatchDelivery
+
+class BatchRejectingServer(StubServer):
+    """Answers JSON arrays with ``batch_status`` and everything else with 204."""
+
+    def __init__(self, batch_status: int):
+        super().__init__()
+        self.batch_status = batch_status
+        self.batches = 0
+
+    async def respond(self, body: bytes, writer: asyncio.StreamWriter):
+        self.requests += 1
+        status = 204
+        if body.startswith(b"["):
+            self.batches += 1
+            status = self.batch_status
+        writer.write(f"HTTP/1.1 {status} Status\r\nContent-Length: 0\r\n\r\n".encode())
+
+
+def _build(node) -> NodeRequest:
+    return NodeRequest(realTimeConsumption=node.real_time_consumption, timestamp=datetime(2025, 10, 1, 12))
+
+
+async def _deliver_rounds(batch_status: int, count: int, rounds: int = 1):
+    server = BatchRejectingServer(batch_status)
+    await server.start()
+    dispatcher = HttpDispatcher()
+    await dispatcher.start()
+    batcher = BatchDelivery(dispatcher, max_batch_size=4)
+    nodes = make_nodes(count, endpoint=f"{server.url}/api/internal/measurements")
+    failed_nodes = []
+
+    async def send_single(node) -> bool:
+        response = await dispatcher.post(node.endpoint, json=_build(node).model_dump(mode="json"))
+        return response.status_code == 204
+
+    try:
+        results = [await batcher.deliver(nodes, _build, send_single, on_failed=failed_nodes.append)
+                   for _ in range(rounds)]
+    finally:
+        await dispatcher.close()
+        await server.close()
+    return results, server, failed_nodes
+
+
+def test_split_endpoint():
+    assert split_endpoint("http://host/path?a=1&smart_furniture_hookup_id=7") == ("http://host/path?a=1", "7")
+    assert split_endpoint("http://host/path") == ("http://host/path", None)
+
+
+def test_batches_share_a_request():
+    results, server, failed = asyncio.run(_deliver_rounds(204, 10))
+
+    assert results == [(10, 0)]
+    # 10 readings in batches of at most 4
+    assert server.batches == server.requests == 3
+    assert failed == []
+
+
+def test_rejected_batches_fall_back_to_single_requests():
+    results, server, failed = asyncio.run(_deliver_rounds(415, 10, rounds=2))
+
+    assert results == [(10, 0), (10, 0)]
+    # The base is remembered: the second round does not try batches again
+    assert server.batches == 3
+    assert server.requests == 3 + 2 * 10
+    assert failed == []
+
+
+def test_failed_batches_report_every_node():
+    results, server, failed = asyncio.run(_deliver_rounds(500, 10))
+
+    assert results == [(0, 10)]
+    assert _ids(failed) == _ids(make_nodes(10))
+    assert server.requests == 3
@@ -0,0 +1,82 @@
+import json
+import shutil
+
+from benchmarks.synthetic import make_nodes, write_data_dir
+from core.model.NodeStatus import NodeStatus
+from core.storage.JournaledWavesLabRepository import JournaledWavesLabRepository
+
+NODES = make_nodes(20, active_fraction=0.5)
+
+
+def _crash_copy(repository: JournaledWavesLabRepository, source, target):
+    """What a crash would leave on disk: nodes.json and the journal as they are now, never compacted."""
+    repository.flush()
+    shutil.copytree(source, target)
+
+
+def _states(repository) -> dict:
+    return {node.id: node for node in repository.get_all_nodes()}
+
+
+def test_journal_replays_after_crash(tmp_path):
+    source, crashed = tmp_path / "live", tmp_path / "crashed"
+    write_data_dir(source, NODES)
+    repository = JournaledWavesLabRepository(str(source))
+    try:
+        repository.switch_nodes(["node-0", "node-1"])
+        repository.switch_node("node-0")
+        repository.update_node_endpoint("node-2", "http://example.test/2")
+        repository.assign_user_to_nodes(["node-3"], "alice")
+        expected = _states(repository)
+        _crash_copy(repository, source, crashed)
+    finally:
+        repository.close()
+
+    # nodes.json was not rewritten: the changes are only in the journal
+    on_disk = {node["id"]: node for node in json.loads((crashed / "nodes.json").read_text())}
+    assert on_disk["node-2"]["endpoint"] == NODES[2].endpoint
+
+    recovered = JournaledWavesLabRepository(str(crashed))
+    try:
+        assert _states(recovered) == expected
+    finally:
+        recovered.close()
+
+
+def test_journal_ignores_torn_record(tmp_path):
+    source, crashed = tmp_path / "live", tmp_path / "crashed"
+    write_data_dir(source, NODES)
+    repository = JournaledWavesLabRepository(str(source))
+    try:
+        repository.switch_node("node-0")
+        expected = _states(repository)
+        _crash_copy(repository, source, crashed)
+    finally:
+        repository.close()
+
+    # A crash in the middle of an append leaves half a record at the end of the log
+    log = sorted((crashed / "journal").glob("journal.*.log"))[-1]
+    with open(log, "a", encoding="utf-8") as fp:
+        fp.write('0badc0de {"id": "node-1", "set": {"sta')
+
+    recovered = JournaledWavesLabRepository(str(crashed))
+    try:
+        assert _states(recovered) == expected
+        assert recovered.get_node_by_id("node-1").status == NODES[1].status
+    finally:
+        recovered.close()
+
+
+def test_compaction_folds_journal_into_nodes_json(tmp_path):
+    write_data_dir(tmp_path, NODES)
+    repository = JournaledWavesLabRepository(str(tmp_path))
+    try:
+        repository.switch_nodes(["node-0"], NodeStatus.ON)
+        repository.compact()
+        on_disk = {node["id"]: node for node in json.loads((tmp_path / "nodes.json").read_text())}
+        assert on_disk["node-0"]["status"] == "ON"
+        # Only the fresh, empty generation is left
+        logs = list((tmp_path / "journal").glob("journal.*.log"))
+        assert len(logs) == 1 and logs[0].stat().st_size == 0
+    finally:
+        repository.close()
@@ -0,0 +1,126 @@
+import pytest
+
+from benchmarks.bench_repository import BACKENDS, open_repository
+from benchmarks.synthetic import make_nodes, write_data_dir
+from core.model.NodeStatus import NodeStatus
+from core.model.VirtualUser import VirtualUser
+from core.storage.MemoryNodeStore import MemoryNodeStore
+
+NODES = make_nodes(20, active_fraction=0.5)
+USERS = ("alice", "bob")
+
+
+def _flip(status: NodeStatus) -> NodeStatus:
+    return NodeStatus.OFF if status == NodeStatus.ON else NodeStatus.ON
+
+
+def _open(backend: str, data_dir: str):
+    if backend == "store":
+        return MemoryNodeStore(NODES, [VirtualUser(username=username) for username in USERS])
+    return open_repository(backend, data_dir)
+
+
+@pytest.fixture(params=BACKENDS)
+def repository(request, tmp_path):
+    write_data_dir(tmp_path, NODES, USERS)
+    repository = _open(request.param, str(tmp_path))
+    yield repository
+    if hasattr(repository, "close"):
+        repository.close()
+
+
+# MemoryNodeStore only implements the switching side of the interface
+SWITCHING = BACKENDS + ("store",)
+
+
+@pytest.mark.parametrize("repository", SWITCHING, indirect=True)
+def test_switch_node(repository):
+    before = repository.get_node_by_id("node-0")
+    version = repository.get_version()
+
+    assert repository.switch_node("node-0")[0]
+    assert repository.get_node_by_id("node-0").status == _flip(before.status)
+    # A node handed out earlier is a snapshot, not a live view
+    assert before.status == NODES[0].status
+    assert repository.get_version() != version
+
+    ok, message = repository.switch_node("missing")
+    assert not ok and "not found" in message
+
+
+@pytest.mark.parametrize("repository", SWITCHING, indirect=True)
+def test_switch_nodes(repository):
+    result = repository.switch_nodes(["node-1", "node-2", "node-1", "missing"])
+
+    assert [node.id for node in result.nodes] == ["node-1", "node-2"]
+    assert result.missing == ["missing"]
+    for node, original in zip(result.nodes, NODES[1:3]):
+        # Repeated ids are switched once
+        assert node.status == _flip(original.status)
+        assert repository.get_node_by_id(node.id).status == node.status
+
+
+@pytest.mark.parametrize("repository", SWITCHING, indirect=True)
+def test_switch_nodes_to_status(repository):
+    ids = [node.id for node in NODES[:6]]
+    repository.switch_nodes(ids, NodeStatus.ON)
+    version = repository.get_version()
+
+    result = repository.switch_nodes(ids, NodeStatus.ON)
+    assert all(node.status == NodeStatus.ON for node in result.nodes)
+    # Nothing changed, so neither did the version
+    assert repository.get_version() == version
+
+    active = {node.id for node in repository.get_active_nodes()}
+    assert active == {node.id for node in repository.get_all_nodes() if node.status == NodeStatus.ON}
+    assert set(ids) <= active
+
+
+def test_update_endpoint(repository):
+    version = repository.get_version()
+    node = repository.update_node_endpoint("node-3", "http://example.test/3")
+
+    assert node.endpoint == "http://example.test/3"
+    assert repository.get_node_by_id("node-3").endpoint == "http://example.test/3"
+    assert repository.get_version() != version
+    assert repository.update_node_endpoint("missing", "http://example.test/") is None
+
+    result = repository.update_nodes_endpoint({"node-4": "http://example.test/4", "missing": "http://example.test/"})
+    assert [node.endpoint for node in result.nodes] == ["http://example.test/4"]
+    assert result.missing == ["missing"]
+    assert repository.get_node_by_id("node-4").endpoint == "http://example.test/4"
+
+
+def test_assign_user(repository):
+    assert repository.assign_user_to_node("node-5", "alice")[0]
+    assert repository.get_node_by_id("node-5").assigned_user == "alice"
+    assert not repository.assign_user_to_node("missing", "alice")[0]
+    assert not repository.assign_user_to_node("node-5", "mallory")[0]
+
+    result = repository.assign_user_to_nodes(["node-6", "node-7", "missing"], "bob")
+    assert [node.assigned_user for node in result.nodes] == ["bob", "bob"]
+    assert result.missing == ["missing"]
+
+    version = repository.get_version()
+    result = repository.assign_user_to_nodes(["node-8"], "mallory")
+    assert result.error and not result.nodes
+    assert repository.get_node_by_id("node-8").assigned_user is None
+    assert repository.get_version() == version
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_changes_survive_reopen(tmp_path, backend):
+    write_data_dir(tmp_path, NODES, USERS)
+    repository = open_repository(backend, str(tmp_path))
+    repository.switch_nodes(["node-0", "node-1"])
+    repository.update_nodes_endpoint({"node-2": "http://example.test/2"})
+    repository.assign_user_to_nodes(["node-3"], "alice")
+    expected = {node.id: node for node in repository.get_all_nodes()}
+    repository.close()
+
+    reopened = open_repository(backend, str(tmp_path))
+    try:
+        assert {node.id: node for node in reopened.get_all_nodes()} == expected
+        assert [user.username for user in reopened.get_all_users()] == list(USERS)
+    finally:
+        reopened.close()
@@ -0,0 +1,52 @@
+from benchmarks.synthetic import make_nodes, write_data_dir
+from core.model.NodeStatus import NodeStatus
+from core.storage.SqliteWavesLabRepository import SqliteWavesLabRepository, migrate_json_to_sqlite
+
+NODES = make_nodes(1000, active_fraction=0.5)
+
+
+def test_bulk_update_of_many_ids(tmp_path):
+    write_data_dir(tmp_path, NODES)
+    repository = SqliteWavesLabRepository(str(tmp_path))
+    try:
+        # More ids than the 999 bound parameters older SQLite builds allow; json_each takes them as one
+        ids = [node.id for node in NODES] + [f"missing-{i}" for i in range(100)]
+        result = repository.switch_nodes(ids, NodeStatus.ON)
+
+        assert len(result.nodes) == len(NODES)
+        assert result.missing == [f"missing-{i}" for i in range(100)]
+        assert len(repository.get_active_nodes()) == len(NODES)
+
+        result = repository.switch_nodes([node.id for node in NODES[:10]])
+        assert [node.id for node in result.nodes] == [node.id for node in NODES[:10]]
+        assert all(node.status == NodeStatus.OFF for node in result.nodes)
+    finally:
+        repository.close()
+
+
+def test_changes_are_seen_by_other_connections(tmp_path):
+    write_data_dir(tmp_path, NODES)
+    writer, reader = SqliteWavesLabRepository(str(tmp_path)), SqliteWavesLabRepository(str(tmp_path))
+    try:
+        version = reader.get_version()
+        writer.assign_user_to_nodes(["node-0", "node-1"], "alice")
+
+        assert reader.get_version() != version
+        assert [reader.get_node_by_id(node_id).assigned_user for node_id in ("node-0", "node-1")] == ["alice", "alice"]
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_migrate_is_repeatable(tmp_path):
+    write_data_dir(tmp_path, NODES)
+    db_path = str(tmp_path / "migrated.db")
+
+    assert migrate_json_to_sqlite(str(tmp_path), db_path) == (len(NODES), 2)
+    assert migrate_json_to_sqlite(str(tmp_path), db_path) == (len(NODES), 2)
+
+    repository = SqliteWavesLabRepository(str(tmp_path), db_path=db_path)
+    try:
+        assert {node.id: node for node in repository.get_all_nodes()} == {node.id: node for node in NODES}
+    finally:
+        repository.close()
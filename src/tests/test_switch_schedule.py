@@ -0,0 +1,55 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.synthetic import make_nodes
+from core.model.NodeStatus import NodeStatus
+from core.storage.MemoryNodeStore import MemoryNodeStore
+from envirorment.EventDrivenHousehold import EventDrivenHousehold
+from envirorment.Household import Household
+from envirorment.ReplayHousehold import ReplayHousehold
+from envirorment.SwitchSchedule import ScheduleRecorder, SwitchSchedule
+
+START = datetime(2025, 10, 1, 12)
+TICK = timedelta(seconds=5)
+
+
+def _active(store) -> frozenset:
+    return frozenset(node.id for node in store.get_all_nodes() if node.status == NodeStatus.ON)
+
+
+def _run(household, store, ticks: int) -> list:
+    states = []
+    for i in range(ticks):
+        household.tick(START + i * TICK)
+        states.append(_active(store))
+    return states
+
+
+@pytest.mark.parametrize("household_class", [Household, EventDrivenHousehold])
+def test_replay_reproduces_recorded_run(tmp_path, household_class):
+    path = str(tmp_path / "schedule.jsonl.gz")
+
+    store = MemoryNodeStore(make_nodes(40, active_fraction=0.3))
+    recorder = ScheduleRecorder(path, seed=7)
+    household = household_class(store, switch_interval_minutes=1, rng=random.Random(7), recorder=recorder)
+    household.day_devices_to_switch = 4
+    recorded = _run(household, store, 120)
+    recorder.close()
+
+    schedule = SwitchSchedule.load(path)
+    assert schedule.start == START
+    assert schedule.events
+
+    # Replayed from a different initial state: the first tick restores the recorded one
+    replay_store = MemoryNodeStore(make_nodes(40, active_fraction=0.3, seed=1))
+    replayed = _run(ReplayHousehold(replay_store, schedule), replay_store, 120)
+
+    assert replayed == recorded
+
+
+def test_record_requires_begin(tmp_path):
+    recorder = ScheduleRecorder(str(tmp_path / "schedule.jsonl"))
+    with pytest.raises(RuntimeError):
+        recorder.record(START, ["node-1"])